@@ -0,0 +1,105 @@
+# ======================== benchmarks/bench_assunto.py ========================
+"""
+Compara, por assunto, a classificação anterior (normalização via NFD e
+laço sobre as variações de "VALIDAÇÃO" a cada chamada) com o
+ClassificadorAssunto atual, sem e com o cache por assunto. Antes de medir,
+confere que as duas versões classificam igual assuntos aleatórios.
+
+    python benchmarks/bench_assunto.py --assuntos 400 --repeticoes 50
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import texto
+
+# ============= VERSÃO ANTERIOR (referência) =============
+
+def normalizar_texto_anterior(valor: str) -> str:
+    nfd = unicodedata.normalize('NFD', valor)
+    sem_acentos = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+    return sem_acentos.upper()
+
+def contem_validacao_anterior(valor: str) -> bool:
+    texto_normalizado = normalizar_texto_anterior(valor)
+
+    for variacao in texto.ClassificadorAssunto.VARIACOES:
+        if normalizar_texto_anterior(variacao) in texto_normalizado:
+            return True
+
+    return re.search(r'VAL[DI]*[DA]*C[AÃ]*O', texto_normalizado) is not None
+
+def contem_kit_anterior(valor: str) -> bool:
+    return re.search(r'[_\-\s]*KIT[_\-\s]*', normalizar_texto_anterior(valor)) is not None
+
+# ============= DADOS =============
+
+def gerar_assuntos_aleatorios(quantidade: int, semente: int = 2) -> list:
+    aleatorio = random.Random(semente)
+    alfabeto = "VALIDAÇÃOCKIT _-áéíóúãõçÃÇÅÆœ̃ ñ ﬁ ẞßxyz0123Ωİı"
+    assuntos = []
+
+    for _ in range(quantidade):
+        assunto = "".join(aleatorio.choice(alfabeto) for _ in range(aleatorio.randint(0, 25)))
+        if aleatorio.random() < 0.3:
+            assunto += aleatorio.choice(["VALIDAÇÃO", "VALI DACAO", "VADAÇÃO", " kit"])
+        assuntos.append(assunto)
+
+    return assuntos
+
+def gerar_assuntos(quantidade: int) -> list:
+    """
+    Metade de VALIDAÇÃO, metade de outros assuntos, como numa caixa real.
+    """
+    metade = quantidade // 2
+    return ([f"RE: VALIDAÇÃO CORREIOS - CLIENTE-{i} - {i * 7}" for i in range(metade)]
+            + [f"Reunião semanal {i}" for i in range(quantidade - metade)])
+
+# ============= MEDIÇÃO =============
+
+def medir(funcao, assuntos: list, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for assunto in assuntos:
+            funcao(assunto)
+    return (time.perf_counter() - inicio) / (repeticoes * len(assuntos)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assuntos", type=int, default=400, help="Assuntos distintos medidos")
+    parser.add_argument("--repeticoes", type=int, default=50, help="Vezes que cada assunto é classificado")
+    parser.add_argument("--aleatorios", type=int, default=100000, help="Assuntos aleatórios na conferência")
+    args = parser.parse_args()
+
+    classificador = texto.ClassificadorAssunto()
+    divergentes = 0
+
+    for assunto in gerar_assuntos_aleatorios(args.aleatorios):
+        anterior = (normalizar_texto_anterior(assunto), contem_validacao_anterior(assunto), contem_kit_anterior(assunto))
+        atual = (texto.normalizar_texto(assunto), classificador._contem_validacao(assunto), classificador._contem_kit(assunto))
+        if anterior != atual:
+            divergentes += 1
+
+    print(f"Conferência: {args.aleatorios} assuntos aleatórios, {divergentes} divergente(s)")
+
+    assuntos = gerar_assuntos(args.assuntos)
+    print(f"{args.assuntos} assuntos x {args.repeticoes} repetições (µs por assunto):")
+
+    for nome, funcao in (
+        ("anterior", contem_validacao_anterior),
+        ("atual, sem cache", classificador._contem_validacao),
+        ("atual, com cache", texto.ClassificadorAssunto().contem_validacao),
+    ):
+        print(f"   {nome:<18} {medir(funcao, assuntos, args.repeticoes):6.2f}")
+
+    return 1 if divergentes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# ======================== benchmarks/bench_coleta.py ========================
+"""
+Mede a coleta dos e-mails do dia em uma pasta falsa com a interface do
+Outlook (Items com Restrict, Sort e iteração; GetTable na terceira
+medição), comparando a varredura completa da pasta (filtro_servidor=False),
+o filtro de data no servidor item a item e a leitura em lotes pela Table.
+
+A pasta falsa é a mesma dos testes (tests/outlook_falso.py): cada leitura
+de propriedade ou item conta como uma ida ao COM e pode custar
+`--latencia-us` microssegundos, para aproximar o custo real do Outlook.
+
+    python benchmarks/bench_coleta.py --itens 50000 --dias 30 --latencia-us 50
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emails import ColetorEmails
+from tests.outlook_falso import ContadorCOM, ItemFalso, PastaFalsa, PastaTabelaFalsa
+
+def gerar_pasta(contador: ContadorCOM, quantidade: int, dias: int, semente: int = 1) -> PastaFalsa:
+    """
+    Pasta com `quantidade` itens espalhados pelos últimos `dias` dias (em
+    ordem de chegada, como no Outlook); cerca de 1 em cada 5 é de VALIDAÇÃO.
+    """
+    aleatorio = random.Random(semente)
+    agora = datetime.now()
+    itens = []
+
+    for indice in range(quantidade):
+        recebido = agora - timedelta(seconds=aleatorio.uniform(0, dias * 86400))
+        if aleatorio.random() < 0.2:
+            cliente = f"CLI-{indice % 300}"
+            subject = f"VALIDAÇÃO CORREIOS - {cliente}"
+            corpo = f"Bom dia,\n\n12345678 CONTRATO {cliente} 5\n87654321 CONTRATO {cliente} 7\nTOTAL: 12"
+        else:
+            subject = f"Assunto qualquer {indice}"
+            corpo = "Texto"
+        itens.append(ItemFalso(contador, indice, subject, recebido, corpo))
+
+    itens.sort(key=lambda item: item._recebido())
+    return PastaFalsa(contador, itens)
+
+def medir_coleta(pasta: PastaFalsa, contador: ContadorCOM, filtro_servidor: bool):
+    coletor = ColetorEmails(pasta=pasta, filtro_servidor=filtro_servidor)
+    contador.chamadas = 0
+
+    inicio = time.perf_counter()
+    emails = coletor.buscar_emails_do_dia()
+    return emails, time.perf_counter() - inicio, contador.chamadas
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--itens", type=int, default=50000)
+    parser.add_argument("--dias", type=int, default=30, help="Dias de e-mails na pasta")
+    parser.add_argument("--latencia-us", type=float, default=0, help="Custo simulado de cada ida ao COM")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    contador = ContadorCOM(args.latencia_us)
+    pasta = gerar_pasta(contador, args.itens, args.dias)
+
+    pasta_tabela = PastaTabelaFalsa(contador, pasta._itens)
+
+    resultados = {}
+    for nome, pasta_medida, filtro_servidor in (
+        ("varredura completa", pasta, False),
+        ("filtro no servidor", pasta, True),
+        ("Table (GetTable)", pasta_tabela, True),
+    ):
+        emails, segundos, chamadas = medir_coleta(pasta_medida, contador, filtro_servidor)
+        resultados[nome] = sorted(map(str, emails))
+        print(f"{nome:<20} {len(emails):>6} e-mail(s) | {segundos:7.2f}s | {chamadas:>8} ida(s) ao COM")
+
+    iguais = len({tuple(emails) for emails in resultados.values()}) == 1
+    print(f"Mesmos e-mails nos três modos: {'sim' if iguais else 'NÃO'}")
+
+    return 0 if iguais else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
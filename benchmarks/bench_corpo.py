@@ -0,0 +1,106 @@
+# ======================== benchmarks/bench_corpo.py ========================
+"""
+Compara a leitura do corpo do e-mail em uma única passada (analisar_corpo)
+com as três passadas da versão anterior (_extrair_cliente,
+_extrair_total_somando_contratos e _extrair_total), conferindo antes que
+os resultados são iguais.
+
+    python benchmarks/bench_corpo.py --linhas 5000 --repeticoes 50
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emails import analisar_corpo
+
+# ============= VERSÃO ANTERIOR (referência) =============
+
+def _extrair_cliente(corpo: str) -> str:
+    for linha in corpo.split('\n'):
+        if re.match(r'^\d{8,}', linha):
+            match = re.search(r'\b([A-Z][A-Z0-9]*[-_][A-Z0-9_]+)\b', linha)
+            if match:
+                return match.group(1)
+    return ""
+
+def _extrair_total_somando_contratos(corpo: str) -> int:
+    total_somado = 0
+    padrao_contrato = r'^\d{8,}\s+.*?\s+([A-Z0-9_-]+)\s+(\d+)\s*$'
+
+    for linha in corpo.split('\n'):
+        linha_limpa = linha.strip()
+
+        if not linha_limpa or 'TOTAL' in linha_limpa.upper():
+            continue
+
+        match = re.search(padrao_contrato, linha_limpa)
+        if match:
+            total_somado += int(match.group(2))
+
+    return total_somado
+
+def _extrair_total(corpo: str) -> int:
+    match = re.search(r'TOTAL[\s:]+(\d+)', corpo, re.IGNORECASE)
+    return int(match.group(1)) if match else 0
+
+def analisar_corpo_anterior(corpo: str) -> tuple:
+    return _extrair_cliente(corpo), _extrair_total_somando_contratos(corpo), _extrair_total(corpo)
+
+# ============= DADOS =============
+
+def gerar_corpo(linhas: int) -> str:
+    contratos = [f"{10000000 + i} CONTRATO CLI-{i % 7} {i % 50}" for i in range(linhas)]
+    return "\n".join(["Bom dia,", ""] + contratos + ["TOTAL: 123"])
+
+def gerar_corpos_aleatorios(quantidade: int, semente: int = 1) -> list:
+    """
+    Corpos com pedaços soltos de linhas de contrato e TOTAL, para exercitar
+    os casos de borda (TOTAL sem valor, valor na linha seguinte, etc.).
+    """
+    aleatorio = random.Random(semente)
+    pedacos = ["12345678", "123456789012", " ", "  ", "\t", "ABC-1", "XYZ_2", "abc-3", "TOTAL", "total:",
+               "Total :", " : ", "\n", "\n\n", "\r\n", "5", "42", "999", "descricao", "x", "-", "_", "KIT"]
+
+    return ["".join(aleatorio.choice(pedacos) for _ in range(aleatorio.randint(0, 40))) for _ in range(quantidade)]
+
+# ============= MEDIÇÃO =============
+
+def medir(funcao, corpo: str, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(corpo)
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=5000, help="Linhas de contrato do corpo medido")
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--aleatorios", type=int, default=30000, help="Corpos aleatórios na conferência")
+    args = parser.parse_args()
+
+    divergentes = 0
+    for corpo in gerar_corpos_aleatorios(args.aleatorios):
+        novo = analisar_corpo(corpo)
+        if analisar_corpo_anterior(corpo) != (novo["Cliente"], novo["Total_Soma"], novo["Total_Informado"]):
+            divergentes += 1
+
+    print(f"Conferência: {args.aleatorios} corpos aleatórios, {divergentes} divergente(s)")
+
+    corpo = gerar_corpo(args.linhas)
+    anterior = medir(analisar_corpo_anterior, corpo, args.repeticoes)
+    atual = medir(analisar_corpo, corpo, args.repeticoes)
+
+    print(f"Corpo com {args.linhas} linhas de contrato:")
+    print(f"   três passadas (anterior): {anterior:.2f} ms")
+    print(f"   uma passada (atual):      {atual:.2f} ms")
+
+    return 1 if divergentes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
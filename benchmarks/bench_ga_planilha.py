@@ -0,0 +1,103 @@
+# ======================== benchmarks/bench_ga_planilha.py ========================
+"""
+Gera um relatório "Arquivos Processados" do GA com N linhas e compara a
+leitura completa com pandas (_calcular_totais) com a leitura em streaming
+das colunas C a G (somar_relatorio_streaming): tempo, totais e, com
+--memoria, o pico de memória (tracemalloc, que deixa a leitura bem mais lenta).
+
+    python benchmarks/bench_ga_planilha.py --linhas 500000
+    python benchmarks/bench_ga_planilha.py --linhas 500000 --memoria
+    python benchmarks/bench_ga_planilha.py --arquivo relatorio_real.xlsx
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from openpyxl import Workbook
+
+import ga
+
+def gerar_relatorio(caminho: str, linhas: int, semente: int = 1):
+    """
+    Planilha com as 7 colunas do relatório; as colunas C, D, E e G variam
+    entre os casos tratados no cálculo (_KIT, .SD1, vazios, ENTREGUE em
+    maiúsculas/minúsculas).
+    """
+    aleatorio = random.Random(semente)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["ID", "Data", "Arquivo", "Retorno", "Quantidade", "Usuário", "Status"])
+
+    for indice in range(linhas):
+        ws.append([
+            indice,
+            "2026-01-01",
+            aleatorio.choice(["ELO-RE_KIT_01.txt", "ELO-RE_02.txt", "CLI-A_kit.txt", "CLI-B.txt", None]),
+            aleatorio.choice(["a.SD1", "retorno.txt", "xsd1", None, "SD1"]),
+            aleatorio.choice([1, 2, 5, 10, None]),
+            "rpa",
+            aleatorio.choice(["ENTREGUE", "entregue", "PENDENTE", None]),
+        ])
+
+    wb.save(caminho)
+
+def medir(funcao, memoria: bool = False):
+    if memoria:
+        tracemalloc.start()
+
+    inicio = time.perf_counter()
+    resultado = funcao()
+    segundos = time.perf_counter() - inicio
+
+    pico = None
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return resultado, segundos, pico
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=500000)
+    parser.add_argument("--arquivo", help="Planilha a medir; gerada (e reaproveitada) se não existir")
+    parser.add_argument("--memoria", action="store_true", help="Mede também o pico de memória")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    caminho = args.arquivo or os.path.join(tempfile.gettempdir(), f"ga_bench_{args.linhas}.xlsx")
+
+    if not os.path.exists(caminho):
+        print(f"Gerando {caminho} com {args.linhas} linhas...")
+        inicio = time.perf_counter()
+        gerar_relatorio(caminho, args.linhas)
+        print(f"   {time.perf_counter() - inicio:.1f}s, {os.path.getsize(caminho) / 1e6:.1f} MB")
+
+    extrator = ga.ExtratorGA.__new__(ga.ExtratorGA)
+    resultados = {}
+
+    for nome, funcao in (
+        ("pandas", lambda: extrator._calcular_totais(pd.read_excel(caminho))),
+        ("streaming", lambda: ga.somar_relatorio_streaming(caminho)),
+    ):
+        totais, segundos, pico = medir(funcao, args.memoria)
+        resultados[nome] = totais
+        memoria = f" | pico {pico / 1e6:7.1f} MB" if pico is not None else ""
+        print(f"{nome:<10} {segundos:7.1f}s{memoria} | {totais}")
+
+    iguais = resultados["pandas"] == resultados["streaming"]
+    print(f"Mesmos totais: {'sim' if iguais else 'NÃO'}")
+
+    return 0 if iguais else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+# ======================== benchmarks/bench_modelos.py ========================
+"""
+Renderiza N respostas com os modelos padrão e compara o format_map do
+texto do modelo a cada resposta (antes) com o modelo compilado, que só
+junta trechos fixos e campos já formatados (depois). Confere também que
+os dois produzem exatamente o mesmo texto, em txt e em html.
+
+    python benchmarks/bench_modelos.py --respostas 100000
+"""
+
+import argparse
+import html
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelos import RenderizadorRespostas
+
+def gerar_validacoes(quantidade: int, semente: int = 1) -> list:
+    aleatorio = random.Random(semente)
+    validacoes = []
+
+    for indice in range(quantidade):
+        total = aleatorio.randint(0, 5000)
+        status = aleatorio.choice(["✓ OK", "✓ OK", "✗ DIVERGÊNCIA"])
+        validacoes.append({
+            "Cliente": f"CLI-{indice % 300} <&>",
+            "Total_Soma": total,
+            "Total_Informado": total,
+            "Total_Exibicao": total,
+            "Total_GA": total if status == "✓ OK" else total + 1,
+            "Metodo_Validacao": aleatorio.choice(["TOTAL", "SOMA"]),
+            "Status": status,
+            "Qtd_Emails": aleatorio.randint(1, 3),
+            "Origem": "E-mail e GA",
+        })
+
+    return validacoes
+
+def renderizar_format_map(renderizador: RenderizadorRespostas, validacao: dict):
+    """
+    Renderização anterior: format_map sobre o texto do modelo.
+    """
+    cliente = str(validacao["Cliente"])
+    tipo = renderizador.tipo(validacao)
+
+    texto = renderizador._modelo(cliente, tipo, "txt").texto.format_map(validacao)
+
+    if not renderizador.html:
+        return texto, None
+
+    valores = {campo: html.escape(str(valor)) for campo, valor in validacao.items()}
+    return texto, renderizador._modelo(cliente, tipo, "html").texto.format_map(valores)
+
+def medir(funcao, validacoes: list):
+    inicio = time.perf_counter()
+    corpos = [funcao(validacao) for validacao in validacoes]
+    return corpos, time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--respostas", type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    validacoes = gerar_validacoes(args.respostas)
+    iguais = True
+
+    for formato, com_html in (("txt", False), ("txt+html", True)):
+        renderizador = RenderizadorRespostas(html=com_html)
+
+        antes, segundos_antes = medir(lambda validacao: renderizar_format_map(renderizador, validacao), validacoes)
+        depois, segundos_depois = medir(renderizador.renderizar, validacoes)
+
+        iguais = iguais and antes == depois
+        print(
+            f"{formato:<9} format_map {segundos_antes:6.3f}s | compilado {segundos_depois:6.3f}s "
+            f"({segundos_depois / len(validacoes) * 1e6:.2f} µs/resposta)"
+        )
+
+    print(f"Mesmo texto nos dois modos: {'sim' if iguais else 'NÃO'}")
+
+    return 0 if iguais else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,526 @@
+# ======================== caixa.py ========================
+
+from abc import ABC, abstractmethod
+from datetime import datetime, date, time as dtime, timezone
+import json
+import logging
+import os
+from metricas import contar, medir
+
+logger = logging.getLogger(__name__)
+
+# Propriedades DASL dos campos de data usados nos filtros
+_CAMPOS_DASL = {
+    "ReceivedTime": "urn:schemas:httpmail:datereceived",
+    "SentOn": "urn:schemas:httpmail:date",
+}
+
+def filtro_desde(campo: str, inicio: datetime) -> str:
+    """
+    Monta o filtro DASL (@SQL) usado em Items.Restrict e Folder.GetTable
+    para limitar os itens cujo `campo` (ReceivedTime, SentOn) seja a partir
+    de `inicio` (hora local).
+
+    A data vai em UTC e no formato ISO, lido da mesma forma em qualquer
+    configuração regional. Num filtro Jet ([ReceivedTime] >= '...') o
+    Outlook usa o formato de data curto do Windows e, em pt-BR, dia e mês
+    se invertem nos dias 1 a 12.
+    """
+    inicio_utc = inicio.astimezone(timezone.utc)
+    return f"@SQL=\"{_CAMPOS_DASL[campo]}\" >= '{inicio_utc:%Y-%m-%d %H:%M}'"
+
+def filtro_recebidos_desde(inicio: datetime) -> str:
+    return filtro_desde("ReceivedTime", inicio)
+
+def sem_fuso(valor) -> datetime:
+    """
+    Converte datas vindas do COM (pywintypes, com fuso) em datetime ingênuo,
+    para que possam ser comparadas e serializadas sem erro de fuso.
+    """
+    return datetime(valor.year, valor.month, valor.day, valor.hour, valor.minute, valor.second)
+
+def ler_com(objeto, atributo: str, *padrao):
+    """
+    Lê uma propriedade (ou obtém um método para chamar) de um objeto COM,
+    contando a ida ao Outlook em "com.leitura.chamadas". Com `padrao`,
+    funciona como getattr(objeto, atributo, padrao).
+    """
+    contar("com.leitura.chamadas")
+    return getattr(objeto, atributo, *padrao)
+
+def iterar_com(colecao):
+    """
+    Itera uma coleção COM contando a abertura e cada avanço (inclusive o
+    último, que encerra a iteração) em "com.leitura.chamadas".
+    """
+    contar("com.leitura.chamadas")
+    iterador = iter(colecao)
+
+    while True:
+        contar("com.leitura.chamadas")
+        try:
+            item = next(iterador)
+        except StopIteration:
+            return
+        yield item
+
+def itens_do_dia(pasta, data: date = None):
+    """
+    Itera apenas os itens da pasta recebidos na data informada (padrão: hoje).
+
+    A pasta só precisa expor `Items` com a interface das coleções do Outlook
+    (Restrict, Sort e iteração), então qualquer backend que a imite pode ser
+    usado. O filtro de data é aplicado no servidor e, como os itens vêm
+    ordenados do mais recente para o mais antigo, a iteração para no primeiro
+    item de um dia anterior.
+    """
+    data = data or datetime.now().date()
+    inicio = datetime.combine(data, dtime.min)
+
+    itens = ler_com(pasta, "Items")
+
+    try:
+        itens = ler_com(itens, "Restrict")(filtro_recebidos_desde(inicio))
+    except Exception as e:
+        logger.warning(f"Restrict não suportado pela pasta, filtrando localmente: {e}")
+
+    ordenado = True
+    try:
+        ler_com(itens, "Sort")("[ReceivedTime]", True)
+    except Exception as e:
+        logger.warning(f"Sort não suportado pela pasta: {e}")
+        ordenado = False
+
+    for item in iterar_com(itens):
+        try:
+            recebido = ler_com(item, "ReceivedTime").date()
+        except Exception:
+            continue
+
+        if recebido < data:
+            if ordenado:
+                break
+            continue
+
+        if recebido > data:
+            continue
+
+        yield item
+
+# PR_LAST_VERB_EXECUTED: 102 = responder, 103 = responder a todos
+_PROP_ULTIMO_VERBO = "http://schemas.microsoft.com/mapi/proptag/0x10810003"
+_VERBOS_RESPOSTA = (102, 103)
+
+class RegistroEmail:
+    """
+    Linha leve de uma pasta de e-mail: só as colunas usadas nos filtros.
+    O corpo e o item completo são buscados apenas quando acessados.
+    """
+
+    __slots__ = ("entry_id", "subject", "received_time", "conversation_id", "respondido", "_leitor", "_item", "_corpo")
+
+    def __init__(self, leitor, entry_id, subject, received_time, conversation_id, respondido=False, item=None):
+        self.entry_id = entry_id
+        self.subject = subject or ""
+        self.received_time = received_time
+        self.conversation_id = conversation_id
+        self.respondido = bool(respondido)
+        self._leitor = leitor
+        self._item = item
+        self._corpo = None
+
+    @property
+    def body(self) -> str:
+        if self._corpo is None:
+            self._corpo = self._leitor.corpo(self)
+        return self._corpo
+
+    @property
+    def item(self):
+        if self._item is None:
+            self._item = self._leitor.item(self)
+        return self._item
+
+class LeitorCaixa(ABC):
+    """
+    Interface dos leitores de pasta usados na coleta e nas respostas.
+    Qualquer implementação (Outlook, pasta falsa...) precisa gerar
+    RegistroEmail do dia e saber buscar corpo e item sob demanda.
+    Cada ida ao COM passa por ler_com/iterar_com e é contada em
+    "com.leitura.chamadas".
+    """
+
+    @abstractmethod
+    def emails_do_dia(self, data: date = None):
+        ...
+
+    @abstractmethod
+    def corpo(self, registro: RegistroEmail) -> str:
+        ...
+
+    @abstractmethod
+    def item(self, registro: RegistroEmail):
+        ...
+
+class LeitorItens(LeitorCaixa):
+    """
+    Lê a pasta item a item pela coleção Items (uma chamada COM por
+    propriedade). Usado quando a pasta não oferece GetTable.
+    """
+
+    def __init__(self, pasta, filtro_servidor: bool = True):
+        self.pasta = pasta
+        self.filtro_servidor = filtro_servidor
+
+    def emails_do_dia(self, data: date = None):
+        data = data or datetime.now().date()
+        itens = itens_do_dia(self.pasta, data) if self.filtro_servidor else iterar_com(ler_com(self.pasta, "Items"))
+
+        for item in itens:
+            try:
+                subject = ler_com(item, "Subject")
+                received_time = sem_fuso(ler_com(item, "ReceivedTime"))
+                conversation_id = ler_com(item, "ConversationID", None)
+            except Exception:
+                continue
+
+            if not self.filtro_servidor and received_time.date() != data:
+                continue
+
+            yield RegistroEmail(
+                self,
+                ler_com(item, "EntryID", None),
+                subject,
+                received_time,
+                conversation_id,
+                respondido=ler_com(item, "Replied", False),
+                item=item,
+            )
+
+    def corpo(self, registro: RegistroEmail) -> str:
+        item = registro.item
+
+        for atributo in ("Body", "HTMLBody"):
+            try:
+                return ler_com(item, atributo) or ""
+            except AttributeError:
+                continue
+
+        return ""
+
+    def item(self, registro: RegistroEmail):
+        return registro._item
+
+class LeitorTabelaOutlook(LeitorCaixa):
+    """
+    Lê a pasta pela Table do Outlook (Folder.GetTable): o filtro de data é
+    aplicado no servidor e só as colunas necessárias vêm em lotes de
+    `tamanho_lote` linhas por chamada, sem abrir cada item. Corpo e item
+    são buscados depois, por EntryID, só para os e-mails que interessam.
+    """
+
+    COLUNAS = ("EntryID", "Subject", "ReceivedTime", "ConversationID", _PROP_ULTIMO_VERBO)
+
+    def __init__(self, pasta, namespace=None, tamanho_lote: int = 500):
+        self.pasta = pasta
+        self.namespace = namespace if namespace is not None else ler_com(pasta, "Session")
+        self.tamanho_lote = tamanho_lote
+        self.store_id = ler_com(pasta, "StoreID")
+
+    def emails_do_dia(self, data: date = None):
+        data = data or datetime.now().date()
+        inicio = datetime.combine(data, dtime.min)
+
+        try:
+            # 0 = olUserItems
+            tabela = ler_com(self.pasta, "GetTable")(filtro_recebidos_desde(inicio), 0)
+            colunas = ler_com(tabela, "Columns")
+            ler_com(colunas, "RemoveAll")()
+            for coluna in self.COLUNAS:
+                ler_com(colunas, "Add")(coluna)
+            ler_com(tabela, "Sort")("[ReceivedTime]", True)
+
+        except Exception as e:
+            logger.warning(f"GetTable não disponível, lendo item a item: {e}")
+            yield from LeitorItens(self.pasta).emails_do_dia(data)
+            return
+
+        while not ler_com(tabela, "EndOfTable"):
+            lote = ler_com(tabela, "GetArray")(self.tamanho_lote)
+
+            if not lote:
+                break
+
+            for entry_id, subject, received_time, conversation_id, ultimo_verbo in lote:
+                try:
+                    recebido = sem_fuso(received_time)
+                except Exception:
+                    continue
+
+                # Ordenado do mais recente para o mais antigo
+                if recebido.date() < data:
+                    return
+
+                if recebido.date() > data:
+                    continue
+
+                yield RegistroEmail(
+                    self,
+                    entry_id,
+                    subject,
+                    recebido,
+                    conversation_id,
+                    respondido=ultimo_verbo in _VERBOS_RESPOSTA,
+                )
+
+    def corpo(self, registro: RegistroEmail) -> str:
+        item = registro.item
+
+        try:
+            return ler_com(item, "Body") or ""
+        except Exception:
+            return ler_com(item, "HTMLBody", "") or ""
+
+    def item(self, registro: RegistroEmail):
+        return ler_com(self.namespace, "GetItemFromID")(registro.entry_id, self.store_id)
+
+def criar_leitor(pasta, namespace=None, filtro_servidor: bool = True) -> LeitorCaixa:
+    """
+    Escolhe o leitor da pasta: Table do Outlook quando disponível, senão item a item.
+    """
+    if filtro_servidor and ler_com(pasta, "GetTable", None) is not None:
+        try:
+            return LeitorTabelaOutlook(pasta, namespace)
+        except Exception as e:
+            logger.warning(f"Não foi possível usar a Table da pasta: {e}")
+
+    return LeitorItens(pasta, filtro_servidor)
+
+class CaixaCorreio(ABC):
+    """
+    Interface da caixa de e-mail usada na coleta e nas respostas: busca de
+    pastas, leitura dos e-mails do dia, responder a todos, mover e consulta
+    aos itens enviados. Implementações: CaixaOutlook (COM) e CaixaMaildir
+    (diretório local de .eml/Maildir, em caixa_local.py).
+    """
+
+    @property
+    @abstractmethod
+    def nome(self) -> str:
+        """
+        Nome exibido nos logs; as implementações definem como atributo de classe.
+        """
+
+    @abstractmethod
+    def conectar(self):
+        ...
+
+    @abstractmethod
+    def pasta_padrao(self):
+        ...
+
+    @abstractmethod
+    def obter_pasta(self, nome_pasta: str):
+        ...
+
+    @abstractmethod
+    def obter_ou_criar_pasta(self, nome_pasta: str):
+        ...
+
+    @abstractmethod
+    def leitor(self, pasta, filtro_servidor: bool = True) -> LeitorCaixa:
+        ...
+
+    @abstractmethod
+    def responder_todos(self, registro: RegistroEmail, corpo: str, corpo_html: str = None):
+        ...
+
+    @abstractmethod
+    def mover(self, registro: RegistroEmail, pasta_destino):
+        ...
+
+    @abstractmethod
+    def enviados_desde(self, inicio: datetime):
+        """
+        Gera (ConversationID, data de envio) dos itens enviados a partir de `inicio`.
+        """
+
+class CaixaOutlook(CaixaCorreio):
+    """
+    Caixa do Outlook via COM. Uma mesma instância pode ser compartilhada
+    pela coleta e pelas respostas (uma única sessão MAPI por thread).
+
+    As pastas encontradas ficam em memória e têm EntryID/StoreID gravados
+    em `arquivo_cache_pastas`; nas próximas execuções são abertas direto
+    com GetFolderFromID, e a busca pelas pastas das contas só é refeita se
+    o ID salvo não abrir mais a pasta (renomeada, apagada, outro perfil).
+    Com `somente_leitura` (--simular), o cache é lido mas não gravado.
+    """
+
+    nome = "Outlook"
+
+    def __init__(self, arquivo_cache_pastas: str = None, somente_leitura: bool = False):
+        self.outlook = None
+        self.namespace = None
+        self.arquivo_cache_pastas = arquivo_cache_pastas
+        self.somente_leitura = somente_leitura
+        self.pastas = {}
+        self.ids_pastas = {}
+
+    def conectar(self):
+        if self.namespace is not None:
+            return
+
+        import win32com.client
+
+        self.outlook = win32com.client.Dispatch("Outlook.Application")
+        self.namespace = self.outlook.GetNamespace("MAPI")
+
+        # Lido só aqui: pode ter sido atualizado por outra sessão (ex.: thread do pipeline)
+        self.ids_pastas = self._carregar_cache_pastas()
+
+    def pasta_padrao(self):
+        return self.namespace.GetDefaultFolder(6)
+
+    def obter_pasta(self, nome_pasta: str):
+        chave = nome_pasta.lower()
+
+        if chave in self.pastas:
+            return self.pastas[chave]
+
+        pasta = self._abrir_pasta_salva(chave)
+
+        if pasta is None:
+            with medir("outlook.busca_pastas"):
+                pasta = self._buscar_pasta(nome_pasta)
+
+            if pasta is not None:
+                self._guardar_pasta(chave, pasta)
+
+        if pasta is not None:
+            self.pastas[chave] = pasta
+
+        return pasta
+
+    def _abrir_pasta_salva(self, chave: str):
+        ids = self.ids_pastas.get(chave)
+
+        if not ids:
+            return None
+
+        try:
+            pasta = self.namespace.GetFolderFromID(ids["entry_id"], ids["store_id"])
+            contar("com.pastas.por_id")
+
+            if pasta.Name.lower() == chave:
+                return pasta
+
+        except Exception:
+            pass
+
+        logger.info(f"ID salvo da pasta '{chave}' não é mais válido. Buscando novamente.")
+        return None
+
+    def _buscar_pasta(self, nome_pasta: str):
+        try:
+            contar("com.pastas.buscas")
+            inbox_padrao = self.namespace.GetDefaultFolder(6)
+
+            for pasta in inbox_padrao.Folders:
+                if pasta.Name.lower() == nome_pasta.lower():
+                    logger.info(f"✓ Pasta '{nome_pasta}' encontrada!")
+                    return pasta
+
+            for conta in self.namespace.Folders:
+                for pasta in conta.Folders:
+                    if pasta.Name.lower() == nome_pasta.lower():
+                        logger.info(f"✓ Pasta '{nome_pasta}' encontrada na raiz!")
+                        return pasta
+
+            return None
+
+        except Exception as e:
+            logger.error(f"✗ Erro ao buscar pasta: {e}")
+            return None
+
+    def obter_ou_criar_pasta(self, nome_pasta: str):
+        try:
+            pasta = self.obter_pasta(nome_pasta)
+
+            if pasta:
+                return pasta
+
+            inbox_padrao = self.namespace.GetDefaultFolder(6)
+            nova_pasta = inbox_padrao.Folders.Add(nome_pasta)
+            logger.info(f"✓ Pasta '{nome_pasta}' criada com sucesso!")
+
+            self.pastas[nome_pasta.lower()] = nova_pasta
+            self._guardar_pasta(nome_pasta.lower(), nova_pasta)
+            return nova_pasta
+
+        except Exception as e:
+            logger.error(f"✗ Erro ao criar pasta: {e}")
+            return None
+
+    def _guardar_pasta(self, chave: str, pasta):
+        try:
+            self.ids_pastas[chave] = {"entry_id": pasta.EntryID, "store_id": pasta.StoreID}
+        except Exception as e:
+            logger.warning(f"Não foi possível obter o ID da pasta '{chave}': {e}")
+            return
+
+        self._salvar_cache_pastas()
+
+    def _carregar_cache_pastas(self) -> dict:
+        if not self.arquivo_cache_pastas or not os.path.exists(self.arquivo_cache_pastas):
+            return {}
+
+        try:
+            with open(self.arquivo_cache_pastas, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        except Exception as e:
+            logger.warning(f"Cache de pastas do Outlook inválido, ignorando: {e}")
+            return {}
+
+    def _salvar_cache_pastas(self):
+        if not self.arquivo_cache_pastas or self.somente_leitura:
+            return
+
+        try:
+            pasta_cache = os.path.dirname(self.arquivo_cache_pastas)
+            if pasta_cache:
+                os.makedirs(pasta_cache, exist_ok=True)
+
+            temporario = self.arquivo_cache_pastas + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self.ids_pastas, f, ensure_ascii=False)
+            os.replace(temporario, self.arquivo_cache_pastas)
+
+        except Exception as e:
+            logger.warning(f"Não foi possível salvar cache de pastas do Outlook: {e}")
+
+    def leitor(self, pasta, filtro_servidor: bool = True) -> LeitorCaixa:
+        return criar_leitor(pasta, self.namespace, filtro_servidor)
+
+    def responder_todos(self, registro: RegistroEmail, corpo: str, corpo_html: str = None):
+        reply = registro.item.ReplyAll()
+
+        if corpo_html:
+            reply.HTMLBody = corpo_html
+        else:
+            reply.Body = corpo
+
+        reply.Send()
+
+    def mover(self, registro: RegistroEmail, pasta_destino):
+        registro.item.Move(pasta_destino)
+
+    def enviados_desde(self, inicio: datetime):
+        sent_items = self.namespace.GetDefaultFolder(5)
+
+        for sent_item in sent_items.Items.Restrict(filtro_desde("SentOn", inicio)):
+            try:
+                yield sent_item.ConversationID, sem_fuso(sent_item.SentOn)
+            except Exception:
+                continue
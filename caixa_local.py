@@ -0,0 +1,249 @@
+# ======================== caixa_local.py ========================
+
+from datetime import datetime, date
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser, BytesHeaderParser
+from email.utils import parsedate_to_datetime, make_msgid, format_datetime
+import logging
+import os
+from caixa import CaixaCorreio, LeitorCaixa, RegistroEmail
+
+logger = logging.getLogger(__name__)
+
+class PastaLocal:
+    """
+    Pasta da caixa local: um diretório com arquivos .eml soltos e/ou no
+    formato Maildir (subpastas cur/ e new/).
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self.nome = os.path.basename(caminho)
+
+    def arquivos(self) -> list:
+        arquivos = []
+
+        for subpasta in ("", "cur", "new"):
+            diretorio = os.path.join(self.caminho, subpasta)
+            if not os.path.isdir(diretorio):
+                continue
+
+            for nome in os.listdir(diretorio):
+                caminho = os.path.join(diretorio, nome)
+                if os.path.isfile(caminho) and (subpasta or nome.lower().endswith(".eml")):
+                    arquivos.append(caminho)
+
+        return arquivos
+
+def _data_local(valor) -> datetime:
+    """
+    Converte o cabeçalho Date em datetime ingênuo no fuso local (como o Outlook exibe).
+    """
+    data = parsedate_to_datetime(str(valor))
+
+    if data.tzinfo is not None:
+        data = data.astimezone().replace(tzinfo=None)
+
+    return data
+
+def _conversa(mensagem) -> str:
+    """
+    Identifica a conversa pelo primeiro Message-ID da cadeia (References,
+    In-Reply-To ou o próprio Message-ID), o equivalente local ao ConversationID.
+    """
+    referencias = str(mensagem.get("References", "")).split()
+
+    if referencias:
+        return referencias[0]
+
+    return str(mensagem.get("In-Reply-To") or mensagem.get("Message-ID") or "").strip() or None
+
+def _flags_maildir(caminho: str) -> str:
+    nome = os.path.basename(caminho)
+    return nome.split(":2,", 1)[1] if ":2," in nome else ""
+
+class LeitorMaildir(LeitorCaixa):
+    """
+    Lê apenas os cabeçalhos dos arquivos da pasta; o corpo é lido do disco
+    só para os e-mails que passarem pelos filtros.
+    """
+
+    def __init__(self, pasta: PastaLocal):
+        self.pasta = pasta
+        self.parser_cabecalhos = BytesHeaderParser(policy=policy.default)
+        self.parser = BytesParser(policy=policy.default)
+
+    def emails_do_dia(self, data: date = None):
+        data = data or datetime.now().date()
+        registros = []
+
+        for caminho in self.pasta.arquivos():
+            try:
+                with open(caminho, "rb") as f:
+                    cabecalhos = self.parser_cabecalhos.parse(f)
+
+                recebido = _data_local(cabecalhos["Date"])
+            except Exception:
+                continue
+
+            if recebido.date() != data:
+                continue
+
+            registros.append(RegistroEmail(
+                self,
+                caminho,
+                str(cabecalhos.get("Subject", "")),
+                recebido,
+                _conversa(cabecalhos),
+                respondido="R" in _flags_maildir(caminho),
+            ))
+
+        # Mesma ordem do Outlook: do mais recente para o mais antigo
+        registros.sort(key=lambda registro: registro.received_time, reverse=True)
+        yield from registros
+
+    def corpo(self, registro: RegistroEmail) -> str:
+        parte = registro.item.get_body(preferencelist=("plain", "html"))
+        return parte.get_content() if parte is not None else ""
+
+    def item(self, registro: RegistroEmail):
+        with open(registro.entry_id, "rb") as f:
+            return self.parser.parse(f)
+
+class CaixaMaildir(CaixaCorreio):
+    """
+    Caixa de e-mail em um diretório local (uma subpasta por pasta do
+    Outlook), para rodar o processo sem Outlook: reprocessar a exportação
+    de um dia, medir desempenho ou rodar em uma máquina Linux.
+
+    As respostas são gravadas como .eml na pasta de enviados (não são
+    transmitidas) e o e-mail original recebe a flag de respondido.
+    """
+
+    nome = "Maildir"
+
+    def __init__(self, raiz: str, nome_entrada: str = "Caixa de Entrada", nome_enviados: str = "Itens Enviados",
+                 remetente: str = None):
+        self.raiz = os.path.abspath(raiz)
+        self.nome_entrada = nome_entrada
+        self.nome_enviados = nome_enviados
+        self.remetente = remetente
+        self._pasta_enviados = None
+
+    def conectar(self):
+        if not os.path.isdir(self.raiz):
+            raise FileNotFoundError(f"Pasta da caixa local não encontrada: {self.raiz}")
+
+    def pasta_padrao(self):
+        return self.obter_ou_criar_pasta(self.nome_entrada)
+
+    def obter_pasta(self, nome_pasta: str):
+        # Como no Outlook: primeiro as subpastas da entrada, depois a raiz
+        for base in (os.path.join(self.raiz, self.nome_entrada), self.raiz):
+            if not os.path.isdir(base):
+                continue
+
+            for nome in os.listdir(base):
+                caminho = os.path.join(base, nome)
+                if nome.lower() == nome_pasta.lower() and os.path.isdir(caminho):
+                    logger.info(f"✓ Pasta '{nome_pasta}' encontrada!")
+                    return PastaLocal(caminho)
+
+        return None
+
+    def obter_ou_criar_pasta(self, nome_pasta: str):
+        pasta = self.obter_pasta(nome_pasta)
+
+        if pasta:
+            return pasta
+
+        caminho = os.path.join(self.raiz, nome_pasta)
+        for subpasta in ("cur", "new", "tmp"):
+            os.makedirs(os.path.join(caminho, subpasta), exist_ok=True)
+
+        logger.info(f"✓ Pasta '{nome_pasta}' criada com sucesso!")
+        return PastaLocal(caminho)
+
+    def leitor(self, pasta, filtro_servidor: bool = True) -> LeitorCaixa:
+        return LeitorMaildir(pasta)
+
+    def responder_todos(self, registro: RegistroEmail, corpo: str, corpo_html: str = None):
+        original = registro.item
+        message_id = str(original.get("Message-ID", "")).strip()
+
+        resposta = EmailMessage()
+        resposta["Subject"] = f"RE: {original.get('Subject', '')}"
+        if self.remetente:
+            resposta["From"] = self.remetente
+        resposta["To"] = str(original.get("Reply-To") or original.get("From", ""))
+
+        copia = [str(original[campo]) for campo in ("To", "Cc") if original.get(campo)]
+        if copia:
+            resposta["Cc"] = ", ".join(copia)
+
+        if message_id:
+            resposta["In-Reply-To"] = message_id
+            resposta["References"] = " ".join(str(original.get("References", "")).split() + [message_id])
+
+        resposta["Date"] = format_datetime(datetime.now().astimezone())
+        resposta["Message-ID"] = make_msgid()
+        resposta.set_content(corpo)
+        if corpo_html:
+            resposta.add_alternative(corpo_html, subtype="html")
+
+        if self._pasta_enviados is None:
+            self._pasta_enviados = self.obter_ou_criar_pasta(self.nome_enviados)
+        enviados = self._pasta_enviados
+        destino = os.path.join(enviados.caminho, "cur", f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}.eml:2,S")
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        with open(destino, "wb") as f:
+            f.write(resposta.as_bytes())
+
+        self._marcar_respondido(registro)
+
+    def _marcar_respondido(self, registro: RegistroEmail):
+        caminho = registro.entry_id
+        diretorio, nome = os.path.split(caminho)
+
+        # Só arquivos Maildir (cur/new) guardam flags no nome
+        if os.path.basename(diretorio) not in ("cur", "new"):
+            return
+
+        base, _, flags = nome.partition(":2,")
+        novo = os.path.join(os.path.dirname(diretorio), "cur", f"{base}:2,{''.join(sorted(set(flags + 'R')))}")
+        os.replace(caminho, novo)
+        registro.entry_id = novo
+        registro.respondido = True
+
+    def mover(self, registro: RegistroEmail, pasta_destino):
+        nome = os.path.basename(registro.entry_id)
+
+        if os.path.basename(os.path.dirname(registro.entry_id)) in ("cur", "new"):
+            destino = os.path.join(pasta_destino.caminho, "cur", nome)
+        else:
+            destino = os.path.join(pasta_destino.caminho, nome)
+
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        os.replace(registro.entry_id, destino)
+        registro.entry_id = destino
+
+    def enviados_desde(self, inicio: datetime):
+        pasta = self.obter_pasta(self.nome_enviados)
+
+        if pasta is None:
+            return
+
+        parser = BytesHeaderParser(policy=policy.default)
+
+        for caminho in pasta.arquivos():
+            try:
+                with open(caminho, "rb") as f:
+                    cabecalhos = parser.parse(f)
+
+                enviado = _data_local(cabecalhos["Date"])
+            except Exception:
+                continue
+
+            if enviado >= inicio:
+                yield _conversa(cabecalhos), enviado
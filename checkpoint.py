@@ -0,0 +1,79 @@
+# ======================== checkpoint.py ========================
+
+from datetime import datetime
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class Checkpoint:
+    """
+    Guarda em resultados/checkpoint_AAAAMMDD.json a saída de cada etapa do
+    processo, para que uma execução interrompida possa ser retomada
+    (--resume) sem repetir as etapas já concluídas. Etapas podem ser
+    gravadas parcialmente (ex.: GA cliente a cliente).
+
+    Com `somente_leitura` (--simular), o checkpoint existente pode ser lido,
+    mas as etapas ficam só em memória.
+    """
+
+    def __init__(self, pasta: str = "resultados", retomar: bool = False, somente_leitura: bool = False):
+        if not somente_leitura:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.somente_leitura = somente_leitura
+        self.arquivo = os.path.join(pasta, f"checkpoint_{datetime.now().strftime('%Y%m%d')}.json")
+        self.trava = threading.Lock()
+        self.etapas = self._carregar() if retomar else {}
+
+        if retomar and self.etapas:
+            concluidas = [nome for nome, etapa in self.etapas.items() if etapa["concluida"]]
+            logger.info(f"↩️ Retomando execução. Etapas concluídas: {', '.join(concluidas) or 'nenhuma'}")
+
+    def concluida(self, etapa: str) -> bool:
+        return self.etapas.get(etapa, {}).get("concluida", False)
+
+    def obter(self, etapa: str, padrao=None):
+        return self.etapas.get(etapa, {}).get("dados", padrao)
+
+    def salvar(self, etapa: str, dados, concluida: bool = True):
+        with self.trava:
+            self.etapas[etapa] = {"concluida": concluida, "dados": dados}
+            self._gravar()
+
+    def atualizar(self, etapa: str, chave: str, valor):
+        """
+        Acrescenta um item a uma etapa ainda em andamento (dados em dicionário).
+        """
+        with self.trava:
+            etapa_atual = self.etapas.setdefault(etapa, {"concluida": False, "dados": {}})
+            etapa_atual["dados"][chave] = valor
+            self._gravar()
+
+    def _carregar(self) -> dict:
+        if not os.path.exists(self.arquivo):
+            logger.info("Nenhum checkpoint de hoje encontrado. Iniciando do zero.")
+            return {}
+
+        try:
+            with open(self.arquivo, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        except Exception as e:
+            logger.warning(f"Checkpoint inválido, iniciando do zero: {e}")
+            return {}
+
+    def _gravar(self):
+        if self.somente_leitura:
+            return
+
+        try:
+            temporario = self.arquivo + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self.etapas, f, ensure_ascii=False)
+            os.replace(temporario, self.arquivo)
+
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar checkpoint: {e}")
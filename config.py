@@ -3,6 +3,24 @@
 
 class ConfigEmail:
     ACCOUNT_NAME = None
+    
+    # Janela (em dias) de Itens Enviados consultada para saber se um e-mail já foi respondido
+    DIAS_ENVIADOS = 7
+    CACHE_ENVIADOS = "cache/enviados.json"
+    
+    # EntryID/StoreID das pastas do Outlook já encontradas (evita percorrer todas as contas)
+    CACHE_PASTAS = "cache/pastas_outlook.json"
+    
+    # Modelos de resposta (ok, soma, divergencia; .txt/.html, também por cliente: CLIENTE.ok.txt)
+    PASTA_MODELOS = "modelos"
+    RESPOSTA_HTML = False
+    
+    # True para também responder (sem mover) os e-mails com divergência
+    RESPONDER_DIVERGENCIAS = False
+    
+    # "outlook" ou "maildir" (pasta local com .eml/Maildir, uma subpasta por pasta do Outlook)
+    CAIXA = "outlook"
+    PASTA_CAIXA_LOCAL = "caixa_local"
 
 class ConfigGA:
     URL = "https://ga.flashcourier.com.br/logs"
@@ -13,8 +31,60 @@ class ConfigGA:
     BOTAO_EXCEL = "//button[contains(text(), 'EXCEL')]"
     
     DOWNLOAD_PATH = "./downloads"
+    
+    # "selenium" (navegador) ou "http" (exportação direta do DataTable, sem Chrome)
+    MODO_EXTRACAO = "selenium"
+    
+    # Leitura da planilha do GA linha a linha (openpyxl read-only) em vez de pd.read_excel
+    LEITURA_STREAMING = True
+    
+    # Baixa uma única exportação sem filtro e calcula todos os clientes de uma vez
+    EXPORTACAO_UNICA = False
+    
+    # Cache em disco dos totais do GA (reaproveitado em novas execuções no mesmo dia)
+    CACHE_PATH = "cache"
+    CACHE_TTL = 4 * 3600
+    
+    # Quantidade de sessões do GA (Chrome headless) extraindo em paralelo
+    TAMANHO_POOL = 2
+    
+    # Tempo máximo (em segundos) de cada espera
+    TIMEOUTS = {
+        "pagina_login": 20,
+        "pos_login": 30,
+        "tabela": 30,
+        "download": 60,
+    }
+
+class ConfigTeams:
+    # Envio em segundo plano: tamanho máximo da fila e repetições em 429/5xx
+    TAMANHO_FILA = 10
+    # Com a fila cheia (relatório em muitos cartões, pendentes reenviados), o envio espera por espaço
+    ESPERA_FILA = 120
+    TENTATIVAS = 5
+    ESPERA_INICIAL = 2
+    ESPERA_MAXIMA = 60
+    TIMEOUT = 15
+    
+    # Tamanho máximo (bytes do JSON) de cada cartão; o Teams recusa mensagens acima de ~28 KB
+    TAMANHO_MAXIMO_CARTAO = 24000
+    
+    # Acima desta quantidade, clientes OK aparecem só como contagem (divergências sempre listadas)
+    LIMITE_OK_DETALHADOS = 30
+    
+    # Tempo máximo (em segundos) aguardando o envio ao final da execução
+    TIMEOUT_ENCERRAMENTO = 120
+    
+    # Mensagens não entregues ao final, reenviadas na próxima execução
+    ARQUIVO_PENDENTES = "resultados/teams_pendentes.json"
 
 class ConfigArquivos:
+    # Arquivo único com uma aba para e-mails, GA e validação
+    OUTPUT_CONSOLIDADO = "relatorio_{data}.xlsx"
+    
+    # True para gerar também as planilhas separadas abaixo
+    PLANILHAS_SEPARADAS = False
     OUTPUT_EMAILS = "emails_{data}.xlsx"
     OUTPUT_GA = "ga_relatorios_{data}.xlsx"
+    OUTPUT_VALIDACAO = "validacao_{data}.xlsx"
     NOME_ARQUIVO_GA = "Arquivos Processados.xlsx"
\ No newline at end of file
@@ -0,0 +1,132 @@
+# ======================== downloads.py ========================
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Eventos do inotify que indicam arquivo novo ou concluído na pasta
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+def _carregar_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+_LIBC = _carregar_libc()
+
+class MonitorDownloads:
+    """
+    Observa apenas a pasta de download configurada no Chrome e devolve o
+    arquivo que surgiu depois de `iniciar()`, já concluído (sem .crdownload).
+    Usa inotify no Linux e, nos demais sistemas, consulta a pasta periodicamente.
+    """
+
+    EXTENSOES_PARCIAIS = ('.crdownload', '.part', '.tmp')
+
+    def __init__(self, pasta: str, extensao: str = '.xlsx', intervalo: float = 0.2):
+        self.pasta = os.path.abspath(pasta)
+        self.extensao = extensao
+        self.intervalo = intervalo
+        self.existentes = set()
+        self._fd = None
+
+    def iniciar(self):
+        """
+        Registra o estado atual da pasta. Chamar imediatamente antes de disparar o download.
+        """
+        os.makedirs(self.pasta, exist_ok=True)
+        self._fechar_inotify()
+        self._abrir_inotify()
+        self.existentes = set(os.listdir(self.pasta))
+
+    def aguardar(self, timeout: float):
+        """
+        Aguarda o novo arquivo ficar completo e retorna seu caminho (ou None no timeout).
+        """
+        limite = time.monotonic() + timeout
+
+        try:
+            while True:
+                arquivo = self._arquivo_concluido()
+
+                if arquivo:
+                    self.existentes.add(arquivo)
+                    return os.path.join(self.pasta, arquivo)
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return None
+
+                self._esperar_evento(min(restante, 1.0))
+
+        finally:
+            self._fechar_inotify()
+
+    def _arquivo_concluido(self):
+        novos = [n for n in os.listdir(self.pasta) if n not in self.existentes]
+
+        if any(n.endswith(self.EXTENSOES_PARCIAIS) for n in novos):
+            return None
+
+        prontos = [n for n in novos if n.endswith(self.extensao) and not n.startswith('~')]
+
+        if not prontos:
+            return None
+
+        if len(prontos) > 1:
+            logger.warning(f"Mais de um arquivo novo em {self.pasta}: {prontos}. Usando o mais recente.")
+            return max(prontos, key=lambda n: os.path.getmtime(os.path.join(self.pasta, n)))
+
+        return prontos[0]
+
+    def _abrir_inotify(self):
+        if _LIBC is None:
+            return
+
+        fd = _LIBC.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return
+
+        mascara = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if _LIBC.inotify_add_watch(fd, os.fsencode(self.pasta), mascara) < 0:
+            os.close(fd)
+            return
+
+        self._fd = fd
+
+    def _esperar_evento(self, timeout: float):
+        if self._fd is None:
+            time.sleep(min(timeout, self.intervalo))
+            return
+
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+
+        # O conteúdo dos eventos não importa: a pasta é relida a cada aviso
+        if prontos:
+            try:
+                while os.read(self._fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def _fechar_inotify(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -1,144 +1,140 @@
 # ======================== emails.py ========================
 
-import win32com.client
 from datetime import datetime, timedelta
 import re
 from typing import List, Dict
 import logging
-import unicodedata
+from caixa import CaixaCorreio, CaixaOutlook, criar_leitor
+from texto import normalizar_texto, contem_validacao, contem_kit
+from metricas import cronometrar, contar
 
 logger = logging.getLogger(__name__)
 
-def normalizar_texto(texto: str) -> str:
-    nfd = unicodedata.normalize('NFD', texto)
-    sem_acentos = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-    return sem_acentos.upper()
+# Padrões do corpo do e-mail, compilados uma única vez
+_PADRAO_LINHA_CONTRATO = re.compile(r'^\d{8,}')
+_PADRAO_CODIGO_CLIENTE = re.compile(r'\b([A-Z][A-Z0-9]*[-_][A-Z0-9_]+)\b')
+_PADRAO_CONTRATO = re.compile(r'^(\d{8,})\s+.*?\s+([A-Z0-9_-]+)\s+(\d+)\s*$')
+_PADRAO_TOTAL = re.compile(r'TOTAL[\s:]+(\d+)', re.IGNORECASE)
+_PADRAO_TOTAL_SEM_VALOR = re.compile(r'TOTAL[\s:]*$', re.IGNORECASE)
+_PADRAO_VALOR_CONTINUACAO = re.compile(r'^[\s:]*(\d+)')
+_PADRAO_SO_SEPARADORES = re.compile(r'^[\s:]*$')
 
-def contem_validacao(texto: str) -> bool:
+def analisar_corpo(corpo: str) -> Dict:
     """
-    Verifica se o texto contém variações de "VALIDAÇÃO" mesmo com erros de digitação.
-    Aceita: VALIDAÇÃO, VALIDACAO, VALDAÇÃO, VADAÇÃO, VALIDAÇAO, etc.
+    Percorre o corpo do e-mail uma única vez e extrai:
+    - Cliente: código da primeira linha de contrato que tiver um
+    - Total_Soma: soma dos valores das linhas de contrato
+    - Total_Informado: primeiro TOTAL informado pelo usuário
+    - Contratos: linhas de contrato (Contrato, Cliente, Valor)
     """
-    texto_normalizado = normalizar_texto(texto)
+    cliente = ""
+    total_soma = 0
+    total_informado = None
+    contratos = []
     
-    # Lista de variações comuns de erro
-    variacoes = [
-        "VALIDACAO",    # Correto sem acento
-        "VALIDAÇÃO",    # Correto com acento (normalizado vira VALIDACAO)
-        "VALDACAO",     # Faltando I
-        "VALDAÇÃO",     # Faltando I com acento
-        "VADACAO",      # Faltando LI
-        "VADAÇÃO",      # Faltando LI com acento
-        "VALIDACÃO",    # Ã no lugar errado
-        "VALIDAÇAO",    # Ç sem til
-        "VALI DACAO",   # Com espaço
-        "VALIDA CAO",   # Com espaço
-    ]
+    # TOTAL no fim de uma linha com o valor na(s) linha(s) seguinte(s)
+    total_pendente = False
     
-    # Verifica se alguma variação está no texto
-    for variacao in variacoes:
-        variacao_norm = normalizar_texto(variacao)
-        if variacao_norm in texto_normalizado:
-            return True
-    
-    # Busca mais genérica: palavras que começam com VAL e terminam com CAO
-    if re.search(r'VAL[DI]*[DA]*C[AÃ]*O', texto_normalizado):
-        return True
-    
-    return False
+    for linha in corpo.split('\n'):
+        tem_total = 'TOTAL' in linha.upper()
+        
+        if total_informado is None:
+            if total_pendente:
+                match = _PADRAO_VALOR_CONTINUACAO.match(linha)
+                if match:
+                    total_informado = int(match.group(1))
+                elif not _PADRAO_SO_SEPARADORES.match(linha):
+                    total_pendente = False
+            
+            if total_informado is None and not total_pendente and tem_total:
+                match = _PADRAO_TOTAL.search(linha)
+                if match:
+                    total_informado = int(match.group(1))
+                elif _PADRAO_TOTAL_SEM_VALOR.search(linha):
+                    total_pendente = True
+        
+        linha_limpa = linha.strip()
+        
+        # Linhas de contrato sempre começam com dígitos
+        if not linha_limpa[:1].isdigit():
+            continue
+        
+        if not cliente and _PADRAO_LINHA_CONTRATO.match(linha):
+            match = _PADRAO_CODIGO_CLIENTE.search(linha)
+            if match:
+                cliente = match.group(1)
+        
+        if tem_total:
+            continue
+        
+        match = _PADRAO_CONTRATO.match(linha_limpa)
+        
+        if match:
+            contrato, codigo, valor = match.groups()
+            valor = int(valor)
+            total_soma += valor
+            contratos.append({"Contrato": contrato, "Cliente": codigo, "Valor": valor})
+    
+    return {
+        "Cliente": cliente,
+        "Total_Soma": total_soma,
+        "Total_Informado": total_informado or 0,
+        "Contratos": contratos
+    }
 
-def contem_kit(texto: str) -> bool:
+def extrair_codigos_cliente(corpo: str) -> list:
     """
-    Verifica se o texto contém "KIT" com variações de separadores.
-    Aceita: KIT, _KIT, -KIT, KIT_, -KIT-, _KIT_, " KIT", "KIT ", etc.
+    Retorna os códigos de cliente (ex.: ABC-123) de todas as linhas de
+    contrato do corpo, com os mesmos padrões de analisar_corpo.
     """
-    texto_normalizado = normalizar_texto(texto)
-    
-    # Remove espaços e caracteres especiais ao redor de KIT
-    # Procura por KIT com qualquer separador antes/depois ou sozinho
-    padrao = r'[_\-\s]*KIT[_\-\s]*'
+    codigos = []
     
-    if re.search(padrao, texto_normalizado):
-        return True
+    for linha in corpo.split('\n'):
+        if _PADRAO_LINHA_CONTRATO.match(linha):
+            match = _PADRAO_CODIGO_CLIENTE.search(linha)
+            if match:
+                codigos.append(match.group(1).upper())
     
-    return False
+    return codigos
 
 class ColetorEmails:
     
-    def __init__(self, nome_pasta: str = "Processamento Correios"):
-        self.outlook = None
-        self.inbox = None
+    def __init__(self, nome_pasta: str = "Processamento Correios", pasta=None, filtro_servidor: bool = True,
+                 caixa: CaixaCorreio = None):
+        # Outlook (padrão) ou qualquer outra CaixaCorreio, como a caixa local em Maildir
+        self.caixa = caixa
+        # Permite injetar qualquer pasta com a interface do Outlook (ex.: pasta falsa em benchmarks)
+        self.inbox = pasta
         self.nome_pasta = nome_pasta
+        self.filtro_servidor = filtro_servidor
     
     def conectar(self) -> bool:
+        if self.inbox is not None:
+            logger.info(f"✓ Usando pasta fornecida: {self.nome_pasta}")
+            return True
+        
         try:
-            self.outlook = win32com.client.Dispatch("Outlook.Application")
-            namespace = self.outlook.GetNamespace("MAPI")
+            if self.caixa is None:
+                self.caixa = CaixaOutlook()
+            
+            self.caixa.conectar()
             
-            self.inbox = self._obter_pasta(namespace, self.nome_pasta)
+            self.inbox = self.caixa.obter_pasta(self.nome_pasta)
             
             if self.inbox is None:
                 logger.error(f"Pasta '{self.nome_pasta}' não encontrada. Usando Inbox padrão.")
-                self.inbox = namespace.GetDefaultFolder(6)
+                self.inbox = self.caixa.pasta_padrao()
             
-            logger.info(f"✓ Conectado ao Outlook na pasta: {self.nome_pasta}")
+            logger.info(f"✓ Conectado ao {self.caixa.nome} na pasta: {self.nome_pasta}")
             return True
         except Exception as e:
-            logger.error(f"✗ Erro ao conectar ao Outlook: {e}")
+            logger.error(f"✗ Erro ao conectar ao {self.caixa.nome}: {e}")
             return False
     
-    def _obter_pasta(self, namespace, nome_pasta: str):
-        try:
-            inbox_padrao = namespace.GetDefaultFolder(6)
-            
-            for pasta in inbox_padrao.Folders:
-                if pasta.Name.lower() == nome_pasta.lower():
-                    logger.info(f"✓ Pasta '{nome_pasta}' encontrada!")
-                    return pasta
-            
-            for conta in namespace.Folders:
-                for pasta in conta.Folders:
-                    if pasta.Name.lower() == nome_pasta.lower():
-                        logger.info(f"✓ Pasta '{nome_pasta}' encontrada na raiz!")
-                        return pasta
-            
-            return None
-        
-        except Exception as e:
-            logger.error(f"✗ Erro ao buscar pasta: {e}")
-            return None
-    
+    @cronometrar("outlook.buscar_emails_do_dia")
     def buscar_emails_do_dia(self) -> List[Dict]:
         try:
-            emails_dados = []
-            agora = datetime.now()
-            
-            for item in self.inbox.Items:
-                try:
-                    if not hasattr(item, 'Subject'):
-                        continue
-                    
-                    subject = item.Subject
-                    
-                    # Usa a nova função que aceita variações de VALIDAÇÃO
-                    if not contem_validacao(subject):
-                        continue
-                    
-                    try:
-                        received_time = item.ReceivedTime
-                        if received_time.date() != agora.date():
-                            continue
-                    except:
-                        continue
-                    
-                    email_info = self._extrair_dados_email(item, agora)
-                    
-                    if email_info:
-                        emails_dados.append(email_info)
-                
-                except Exception as e:
-                    logger.warning(f"Erro ao processar item: {e}")
-                    continue
+            emails_dados = list(self.iterar_emails_do_dia())
             
             logger.info(f"E-mails com VALIDAÇÃO encontrados: {len(emails_dados)}")
             return emails_dados
@@ -147,15 +143,45 @@ class ColetorEmails:
             logger.error(f"✗ Erro ao buscar e-mails: {e}")
             return []
     
-    def _extrair_dados_email(self, item, agora) -> Dict:
+    def iterar_emails_do_dia(self):
+        """
+        Gera os dados de cada e-mail de VALIDAÇÃO do dia assim que é lido,
+        para que as etapas seguintes possam começar antes do fim da varredura.
+        Assunto e data vêm em lote; o corpo só é lido para os e-mails de VALIDAÇÃO.
+        """
+        agora = datetime.now()
+        
+        if self.caixa is not None:
+            leitor = self.caixa.leitor(self.inbox, self.filtro_servidor)
+        else:
+            leitor = criar_leitor(self.inbox, filtro_servidor=self.filtro_servidor)
+        
+        for registro in leitor.emails_do_dia(agora.date()):
+            contar("com.coleta.itens")
+            
+            try:
+                # Usa a nova função que aceita variações de VALIDAÇÃO
+                if not contem_validacao(registro.subject):
+                    continue
+                
+                email_info = self._extrair_dados_email(registro, agora)
+                
+            except Exception as e:
+                logger.warning(f"Erro ao processar item: {e}")
+                continue
+            
+            if email_info:
+                yield email_info
+    
+    def _extrair_dados_email(self, registro, agora) -> Dict:
         try:
-            subject = item.Subject
+            subject = registro.subject
             
             # Usa a nova função que aceita variações de VALIDAÇÃO
             if not contem_validacao(subject):
                 return None
             
-            corpo = self._extrair_corpo_email(item)
+            corpo = self._extrair_corpo_email(registro)
             
             # NOVA LÓGICA: Detecta ALELO-KIT usando função flexível
             subject_norm = normalizar_texto(subject)
@@ -169,11 +195,13 @@ class ColetorEmails:
                 cliente = self._extrair_cliente_subject(subject)
                 logger.info(f"📧 Detectado ALELO normal no título: {subject}")
             else:
-                cliente = self._extrair_cliente(corpo)
+                cliente = None
             
-            # EXTRAI AMBOS: SOMA e TOTAL informado
-            total_soma = self._extrair_total_somando_contratos(corpo)
-            total_informado = self._extrair_total(corpo)
+            # EXTRAI AMBOS: SOMA e TOTAL informado (uma única passada pelo corpo)
+            dados_corpo = analisar_corpo(corpo)
+            cliente = cliente if cliente is not None else dados_corpo["Cliente"]
+            total_soma = dados_corpo["Total_Soma"]
+            total_informado = dados_corpo["Total_Informado"]
             
             if not cliente:
                 logger.warning(f"Cliente não encontrado. Subject: {subject}")
@@ -214,75 +242,11 @@ class ColetorEmails:
             logger.error(f"✗ Erro ao extrair cliente do subject: {e}")
             return ""
     
-    def _extrair_corpo_email(self, item) -> str:
+    def _extrair_corpo_email(self, registro) -> str:
         try:
-            if hasattr(item, 'Body'):
-                return item.Body
-            
-            if hasattr(item, 'HTMLBody'):
-                return item.HTMLBody
-            
-            return ""
+            contar("com.coleta.corpos")
+            return registro.body
         
         except Exception as e:
             logger.error(f"✗ Erro ao extrair corpo: {e}")
             return ""
-    
-    def _extrair_cliente(self, corpo: str) -> str:
-        try:
-            linhas = corpo.split('\n')
-            
-            for linha in linhas:
-                if re.match(r'^\d{8,}', linha):
-                    match = re.search(r'\b([A-Z][A-Z0-9]*[-_][A-Z0-9_]+)\b', linha)
-                    if match:
-                        return match.group(1)
-            
-            return ""
-        
-        except Exception as e:
-            logger.error(f"✗ Erro ao extrair cliente: {e}")
-            return ""
-    
-    def _extrair_total_somando_contratos(self, corpo: str) -> int:
-        """
-        Soma os valores individuais das linhas de contrato.
-        """
-        try:
-            total_somado = 0
-            linhas = corpo.split('\n')
-            
-            padrao_contrato = r'^\d{8,}\s+.*?\s+([A-Z0-9_-]+)\s+(\d+)\s*$'
-            
-            for linha in linhas:
-                linha_limpa = linha.strip()
-                
-                if not linha_limpa or 'TOTAL' in linha_limpa.upper():
-                    continue
-                
-                match = re.search(padrao_contrato, linha_limpa)
-                
-                if match:
-                    valor = int(match.group(2))
-                    total_somado += valor
-                    logger.debug(f"  ➕ Linha: {linha_limpa[:50]}... | Valor: {valor}")
-            
-            return total_somado
-        
-        except Exception as e:
-            logger.error(f"✗ Erro ao somar contratos: {e}")
-            return 0
-    
-    def _extrair_total(self, corpo: str) -> int:
-        """
-        Extrai o TOTAL informado pelo usuário no e-mail.
-        """
-        try:
-            match = re.search(r'TOTAL[\s:]+(\d+)', corpo, re.IGNORECASE)
-            if match:
-                return int(match.group(1))
-            return 0
-        
-        except Exception as e:
-            logger.error(f"✗ Erro ao extrair total: {e}")
-            return 0
\ No newline at end of file
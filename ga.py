@@ -5,30 +5,383 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
+import requests
+from requests.adapters import HTTPAdapter
+import io
+import json
+import re
 import time
+from datetime import datetime
 import logging
 import os
-from pathlib import Path
+import queue
+import threading
 from dotenv import load_dotenv
+from downloads import MonitorDownloads
+from metricas import cronometrar, medir, contar, registrar_tempo
 
 # Carrega variáveis de ambiente do arquivo .env
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+TIMEOUTS_PADRAO = {
+    "pagina_login": 20,
+    "pos_login": 30,
+    "tabela": 30,
+    "download": 60,
+}
+
+SELETOR_PESQUISA_TABELA = "input[aria-controls='dataTableBuilder']"
+ID_PROCESSANDO_TABELA = "dataTableBuilder_processing"
+SELETOR_LINHAS_TABELA = "#dataTableBuilder tbody tr"
+ID_INFO_TABELA = "dataTableBuilder_info"
+
+# Valor de busca aplicado pelo DataTable (None se a API não estiver na página)
+SCRIPT_BUSCA_TABELA = """
+var $ = window.jQuery;
+if (!$ || !$.fn || !$.fn.dataTable || !$.fn.dataTable.isDataTable('#dataTableBuilder')) { return null; }
+return $('#dataTableBuilder').DataTable().search();
+"""
+
+def esperar_ate(condicao, timeout: float, intervalo: float = 0.2):
+    """
+    Chama `condicao()` até que retorne um valor verdadeiro ou o tempo acabe.
+    Exceções durante a checagem contam como "ainda não". Retorna o valor
+    obtido (ou None em caso de timeout) e os segundos gastos.
+    """
+    inicio = time.monotonic()
+    
+    while True:
+        try:
+            valor = condicao()
+        except Exception:
+            valor = None
+        
+        decorrido = time.monotonic() - inicio
+        
+        if valor:
+            return valor, decorrido
+        
+        if decorrido >= timeout:
+            return None, decorrido
+        
+        time.sleep(intervalo)
+
+_PADRAO_SD1 = re.compile(r".SD1", re.IGNORECASE)
+_PADRAO_KIT = re.compile(r"_KIT", re.IGNORECASE)
+
+def somar_relatorio_streaming(origem) -> dict:
+    """
+    Calcula os totais entregues do relatório "Arquivos Processados" lendo
+    linha a linha (openpyxl em modo read-only) apenas as colunas C a G, em
+    memória constante. `origem` pode ser um caminho ou um arquivo em memória.
+    Mesmas regras de _calcular_totais: G == ENTREGUE, D sem .SD1, C com/sem _KIT.
+    """
+    wb = load_workbook(origem, read_only=True, data_only=True)
+    
+    try:
+        ws = wb.worksheets[0]
+        linhas = ws.iter_rows(min_col=3, max_col=7, values_only=True)
+        
+        cabecalho = next(ws.iter_rows(max_row=1, values_only=True), ())
+        if len(cabecalho) < 7:
+            logger.warning("Arquivo não possui coluna G")
+            return None
+        
+        next(linhas, None)
+        
+        quantidade = 0
+        total_kit = 0
+        total_sem_kit = 0
+        
+        for coluna_c, coluna_d, coluna_e, _, coluna_g in linhas:
+            quantidade += 1
+            
+            if coluna_g is None or str(coluna_g).upper() != "ENTREGUE":
+                continue
+            
+            if coluna_d is not None and _PADRAO_SD1.search(str(coluna_d)):
+                continue
+            
+            if not isinstance(coluna_e, (int, float)) or coluna_e != coluna_e:
+                continue
+            
+            if coluna_c is not None and _PADRAO_KIT.search(str(coluna_c)):
+                total_kit += coluna_e
+            else:
+                total_sem_kit += coluna_e
+        
+        contar("ga.linhas_lidas", quantidade)
+        logger.info(f"Arquivo lido em streaming: {quantidade} linhas")
+        
+        return {
+            'total': int(total_kit + total_sem_kit),
+            'total_kit': int(total_kit),
+            'total_sem_kit': int(total_sem_kit),
+        }
+    
+    finally:
+        wb.close()
+
+def _marcar_categorias(serie, condicao):
+    """
+    Converte a série em categorias, aplica `condicao` apenas aos valores
+    distintos (já como texto) e devolve a máscara por linha. Vazios (NaN) ficam False.
+    """
+    categorias = pd.Categorical(serie)
+    marcas = np.asarray(condicao(pd.Series(categorias.categories.astype(str))), dtype=bool)
+    return np.append(marcas, False)[categorias.codes], categorias
+
+def totais_por_termo(df, termos: list) -> dict:
+    """
+    Calcula os totais entregues de vários termos de busca em uma única
+    passada sobre um relatório do GA que cubra todos eles (ex.: exportação
+    sem filtro). As colunas de texto são normalizadas uma vez como
+    categorias, as máscaras ENTREGUE / .SD1 são montadas uma vez e os
+    valores da coluna E são agrupados pelo arquivo (coluna C). Cada termo
+    soma os grupos cujo arquivo o contém, separando com e sem _KIT, no mesmo
+    formato de _calcular_totais (e do cache). Retorna None sem a coluna G.
+    """
+    if df.shape[1] < 7:
+        logger.warning("Arquivo não possui coluna G")
+        return None
+    
+    entregue, _ = _marcar_categorias(df.iloc[:, 6], lambda v: v.str.upper() == "ENTREGUE")
+    sd1, _ = _marcar_categorias(df.iloc[:, 3], lambda v: v.str.contains(".SD1", case=False, na=False))
+    filtro_base = entregue & ~sd1
+    
+    categorias_c = pd.Categorical(df.iloc[:, 2])
+    codigos = categorias_c.codes[filtro_base]
+    valores = pd.to_numeric(df.iloc[:, 4], errors="coerce").to_numpy()[filtro_base]
+    
+    # Soma por arquivo (coluna C); linhas sem arquivo (código -1) ficam de fora
+    somas = pd.Series(valores).groupby(codigos).sum()
+    somas = somas[somas.index >= 0]
+    
+    arquivos = pd.Series(categorias_c.categories.astype(str)).str.upper()
+    kit = arquivos.str.contains("_KIT", regex=False).to_numpy()[somas.index]
+    
+    totais = {}
+    for termo_busca in dict.fromkeys(termos):
+        do_termo = arquivos.str.contains(termo_busca.upper(), regex=False).to_numpy()[somas.index]
+        total_kit = int(somas[do_termo & kit].sum())
+        total_sem_kit = int(somas[do_termo & ~kit].sum())
+        
+        totais[termo_busca] = {
+            'total': total_kit + total_sem_kit,
+            'total_kit': total_kit,
+            'total_sem_kit': total_sem_kit,
+        }
+    
+    return totais
+
+def agregar_totais(df, clientes: list) -> dict:
+    """
+    Total entregue de cada cliente a partir de um relatório que cubra todos
+    eles (ver totais_por_termo), respeitando o filtro _KIT de ALELO.
+    """
+    buscas = {cliente: definir_busca(cliente) for cliente in clientes}
+    totais = totais_por_termo(df, [termo_busca for termo_busca, _ in buscas.values()])
+    
+    if totais is None:
+        return {cliente: 0 for cliente in clientes}
+    
+    return {cliente: totais[termo_busca][chave_total] for cliente, (termo_busca, chave_total) in buscas.items()}
+
+class TabelaEstavel:
+    """
+    Condição satisfeita quando a busca por `termo` comprovadamente chegou ao
+    DataTable e a tabela parou de mudar.
+    
+    A busca só dispara depois do atraso de digitação do DataTable (~400ms),
+    então indicador oculto e contagem estável não bastam: é preciso uma
+    evidência positiva. Se a API do DataTable estiver acessível
+    (execute_script), o valor de busca da tabela deve ser igual ao termo;
+    senão, vale o indicador de processamento visto (e já oculto) ou o texto
+    de #dataTableBuilder_info diferente do inicial. Depois disso, a
+    quantidade de linhas não pode mudar por `leituras` checagens seguidas.
+    
+    Crie a condição antes de digitar o termo, para guardar o texto inicial.
+    """
+    
+    def __init__(self, driver, termo: str, leituras: int = 3):
+        self.driver = driver
+        self.termo = termo
+        self.leituras = leituras
+        self.info_inicial = self._info()
+        self.processamento_visto = False
+        self.busca_aplicada = False
+        self.ultima_contagem = None
+        self.repeticoes = 0
+    
+    def _info(self):
+        elementos = self.driver.find_elements(By.ID, ID_INFO_TABELA)
+        return elementos[0].text if elementos else None
+    
+    def _busca_da_tabela(self):
+        try:
+            return self.driver.execute_script(SCRIPT_BUSCA_TABELA)
+        except Exception:
+            return None
+    
+    def _verificar_busca(self) -> bool:
+        busca = self._busca_da_tabela()
+        
+        if busca is not None:
+            return busca == self.termo
+        
+        return self.processamento_visto or self._info() != self.info_inicial
+    
+    def __call__(self):
+        processando = self.driver.find_elements(By.ID, ID_PROCESSANDO_TABELA)
+        if processando and processando[0].is_displayed():
+            self.processamento_visto = True
+            self.repeticoes = 0
+            return False
+        
+        if not self.busca_aplicada:
+            self.busca_aplicada = self._verificar_busca()
+            if not self.busca_aplicada:
+                return False
+        
+        contagem = len(self.driver.find_elements(By.CSS_SELECTOR, SELETOR_LINHAS_TABELA))
+        
+        if contagem == self.ultima_contagem:
+            self.repeticoes += 1
+        else:
+            self.ultima_contagem = contagem
+            self.repeticoes = 0
+        
+        return self.repeticoes >= self.leituras
+
+def definir_busca(cliente: str):
+    """
+    Retorna o termo pesquisado no GA e qual total do relatório pertence ao cliente.
+    ALELO e ALELO-KIT saem do mesmo relatório (ELO-RE), com o filtro _KIT invertido.
+    """
+    is_alelo_kit = (cliente.upper() == "ALELO-KIT")
+    is_alelo_normal = ("ALELO" in cliente.upper() and not is_alelo_kit)
+    
+    if is_alelo_kit:
+        return "ELO-RE", 'total_kit'
+    
+    if is_alelo_normal:
+        return "ELO-RE", 'total_sem_kit'
+    
+    return cliente, 'total'
+
+class CacheRelatoriosGA:
+    """
+    Cache em disco dos totais já extraídos do GA, um arquivo por dia
+    (ga_AAAAMMDD.json) com uma entrada por termo de busca. Entradas mais
+    antigas que `ttl` segundos são ignoradas e arquivos de dias anteriores
+    são removidos ao abrir o cache. Pode ser compartilhado entre sessões.
+    Com `somente_leitura` (--simular), nada é gravado nem removido do disco.
+    """
+    
+    def __init__(self, pasta: str, ttl: int = 4 * 3600, forcar_atualizacao: bool = False,
+                 somente_leitura: bool = False):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.forcar_atualizacao = forcar_atualizacao
+        self.somente_leitura = somente_leitura
+        self.trava = threading.Lock()
+        self.arquivo = os.path.join(pasta, f"ga_{datetime.now().strftime('%Y%m%d')}.json")
+        
+        if not somente_leitura:
+            os.makedirs(pasta, exist_ok=True)
+            self._remover_dias_anteriores()
+        
+        self.entradas = self._carregar()
+    
+    def obter(self, termo_busca: str) -> dict:
+        if self.forcar_atualizacao:
+            return None
+        
+        with self.trava:
+            entrada = self.entradas.get(termo_busca)
+        
+        if entrada is None or time.time() - entrada["salvo_em"] > self.ttl:
+            return None
+        
+        return entrada["totais"]
+    
+    def salvar(self, termo_busca: str, totais: dict):
+        self.salvar_varios({termo_busca: totais})
+    
+    def salvar_varios(self, totais_por_termo: dict):
+        """
+        Grava vários termos de uma vez (ex.: exportação geral), com uma única escrita do arquivo.
+        """
+        with self.trava:
+            salvo_em = time.time()
+            for termo_busca, totais in totais_por_termo.items():
+                self.entradas[termo_busca] = {"salvo_em": salvo_em, "totais": totais}
+            
+            if self.somente_leitura:
+                return
+            
+            try:
+                temporario = self.arquivo + ".tmp"
+                with open(temporario, "w", encoding="utf-8") as f:
+                    json.dump(self.entradas, f)
+                os.replace(temporario, self.arquivo)
+            
+            except Exception as e:
+                logger.warning(f"Não foi possível salvar cache do GA: {e}")
+    
+    def _carregar(self) -> dict:
+        if not os.path.exists(self.arquivo):
+            return {}
+        
+        try:
+            with open(self.arquivo, "r", encoding="utf-8") as f:
+                return json.load(f)
+        
+        except Exception as e:
+            logger.warning(f"Cache do GA inválido, ignorando: {e}")
+            return {}
+    
+    def _remover_dias_anteriores(self):
+        atual = os.path.basename(self.arquivo)
+        
+        for nome in os.listdir(self.pasta):
+            if nome.startswith("ga_") and nome.endswith(".json") and nome != atual:
+                try:
+                    os.remove(os.path.join(self.pasta, nome))
+                    logger.info(f"🗑️ Cache antigo do GA removido: {nome}")
+                except OSError as e:
+                    logger.warning(f"Não foi possível remover cache antigo {nome}: {e}")
+
 class ExtratorGA:
     
-    def __init__(self, url: str, download_path: str, email: str = None, senha: str = None):
+    def __init__(self, url: str, download_path: str, email: str = None, senha: str = None, timeouts: dict = None,
+                 leitura_streaming: bool = True, cache: CacheRelatoriosGA = None, relatorios: dict = None):
         self.url = url
         # Se email/senha não forem passados, pega do .env
         self.email = email or os.getenv('GA_EMAIL')
         self.senha = senha or os.getenv('GA_SENHA')
-        self.download_path = download_path
+        # O Chrome exige caminho absoluto para a pasta de download
+        self.download_path = os.path.abspath(download_path)
+        self.monitor_downloads = MonitorDownloads(self.download_path)
         self.driver = None
         self.wait = None
         self.timestamp_inicio = None
         self.arquivos_processados = []
+        # Totais já calculados nesta execução, por termo pesquisado no GA
+        # (pode ser compartilhado entre as sessões de um PoolExtratoresGA)
+        self.relatorios = relatorios if relatorios is not None else {}
+        self.timeouts = {**TIMEOUTS_PADRAO, **(timeouts or {})}
+        # Tempo efetivamente gasto em cada espera
+        self.tempos_espera = []
+        # Lê só as colunas necessárias, linha a linha, em vez de carregar a planilha inteira no pandas
+        self.leitura_streaming = leitura_streaming
+        # Cache em disco compartilhado entre execuções (opcional)
+        self.cache = cache
         
         # Valida se as credenciais foram carregadas
         if not self.email or not self.senha:
@@ -59,11 +412,14 @@ class ExtratorGA:
             logger.error(f"✗ Erro ao inicializar driver: {e}")
             return False
     
+    @cronometrar("ga.login")
     def fazer_login(self) -> bool:
         try:
             logger.info("Acessando GA...")
             self.driver.get(self.url)
-            time.sleep(2)
+            
+            if not self._aguardar("pagina_login", lambda: self.driver.find_elements(By.NAME, "email")):
+                return False
             
             self.timestamp_inicio = time.time()
             
@@ -76,7 +432,9 @@ class ExtratorGA:
             login_button = self.driver.find_element(By.XPATH, '//*[@id="login"]/section/form/div[3]/button')
             login_button.click()
             
-            time.sleep(3)
+            if not self._aguardar("pos_login", lambda: self.driver.find_elements(By.CSS_SELECTOR, SELETOR_PESQUISA_TABELA)):
+                return False
+            
             logger.info("✓ Login realizado com sucesso")
             return True
         
@@ -84,154 +442,517 @@ class ExtratorGA:
             logger.error(f"✗ Erro ao fazer login: {e}")
             return False
     
+    @cronometrar("ga.extrair_relatorio_cliente")
     def extrair_relatorio_cliente(self, cliente: str) -> dict:
         try:
             logger.info(f"Extraindo relatório para: {cliente}")
             
-            # NOVO: Detecta ALELO-KIT e busca com filtro correto
-            termo_busca = cliente
-            is_alelo_kit = (cliente.upper() == "ALELO-KIT")
-            is_alelo_normal = ("ALELO" in cliente.upper() and not is_alelo_kit)
+            termo_busca, chave_total = self._definir_busca(cliente)
             
-            if is_alelo_kit:
-                termo_busca = "ELO-RE"
-                logger.info(f"🎯 ALELO-KIT detectado. Buscando por: {termo_busca} (filtro: COM _KIT)")
-            elif is_alelo_normal:
-                termo_busca = "ELO-RE"
-                logger.info(f"🎯 ALELO normal detectado. Buscando por: {termo_busca} (filtro: SEM _KIT)")
-            
-            campo_pesquisa = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[aria-controls='dataTableBuilder']"))
-            )
-            campo_pesquisa.clear()
-            campo_pesquisa.send_keys(termo_busca)
-            
-            logger.info(f"Aguardando 5 segundos...")
-            time.sleep(5)
-            
-            botao_excel = self.wait.until(
-                EC.element_to_be_clickable((By.ID, "spreadsheet"))
-            )
-            botao_excel.click()
+            if termo_busca in self.relatorios:
+                logger.info(f"♻️ Relatório de '{termo_busca}' já baixado nesta execução. Reaproveitando.")
+            elif self.cache and self.cache.obter(termo_busca) is not None:
+                logger.info(f"♻️ Relatório de '{termo_busca}' lido do cache em disco.")
+                self.relatorios[termo_busca] = self.cache.obter(termo_busca)
+            else:
+                totais = self._baixar_relatorio(termo_busca)
+                
+                if totais is None:
+                    return {'total': 0, 'erro': True}
+                
+                self.relatorios[termo_busca] = totais
+                
+                if self.cache:
+                    self.cache.salvar(termo_busca, totais)
             
-            logger.info("Download iniciado...")
-            time.sleep(7)
+            total = self.relatorios[termo_busca][chave_total]
             
-            resultado = self._processar_arquivo_excel(cliente, is_alelo_kit, is_alelo_normal)
+            if chave_total == 'total_kit':
+                logger.info(f"✅ ALELO-KIT (com _KIT): {total}")
+            elif chave_total == 'total_sem_kit':
+                logger.info(f"✅ ALELO Normal (sem _KIT): {total}")
+            else:
+                logger.info(f"Total somado da coluna E: {total}")
             
-            return resultado
+            return {'total': total}
         
         except Exception as e:
             logger.error(f"✗ Erro ao extrair relatório para {cliente}: {e}")
-            return {'total': 0}
+            return {'total': 0, 'erro': True}
+    
+    def _definir_busca(self, cliente: str):
+        termo_busca, chave_total = definir_busca(cliente)
+        
+        if chave_total == 'total_kit':
+            logger.info(f"🎯 ALELO-KIT detectado. Buscando por: {termo_busca} (filtro: COM _KIT)")
+        elif chave_total == 'total_sem_kit':
+            logger.info(f"🎯 ALELO normal detectado. Buscando por: {termo_busca} (filtro: SEM _KIT)")
+        
+        return termo_busca, chave_total
     
-    def _processar_arquivo_excel(self, cliente: str, is_alelo_kit: bool, is_alelo_normal: bool) -> dict:
+    def extrair_relatorio_geral(self, clientes: list) -> dict:
+        """
+        Baixa uma única exportação sem filtro de busca e calcula os totais de
+        todos os termos de uma vez, em vez de uma busca por cliente. Termos já
+        baixados nesta execução ou presentes no cache em disco ficam de fora;
+        os calculados vão para o cache. Retorna None se a exportação falhar.
+        """
         try:
-            arquivo = self._obter_arquivo_recente()
+            buscas = {cliente: definir_busca(cliente) for cliente in clientes}
+            pendentes = []
             
-            if not arquivo:
-                logger.warning("Nenhum arquivo foi identificado")
-                return {'total': 0}
-            
-            downloads_path = str(Path.home() / "Downloads")
-            arquivo_path = os.path.join(downloads_path, arquivo)
-            
-            if not os.path.exists(arquivo_path):
-                logger.warning(f"Arquivo não encontrado: {arquivo_path}")
-                return {'total': 0}
+            for termo_busca, _ in buscas.values():
+                if termo_busca in self.relatorios or termo_busca in pendentes:
+                    continue
+                
+                totais = self.cache.obter(termo_busca) if self.cache else None
+                if totais is not None:
+                    self.relatorios[termo_busca] = totais
+                else:
+                    pendentes.append(termo_busca)
             
-            logger.info(f"Processando arquivo: {arquivo}")
-            df = pd.read_excel(arquivo_path)
-            logger.info(f"Arquivo carregado com {len(df)} linhas e {df.shape[1]} colunas")
-            
-            if df.shape[1] >= 7:
-                coluna_c = df.iloc[:, 2]
-                coluna_d = df.iloc[:, 3]
-                coluna_e = df.iloc[:, 4]
-                coluna_g = df.iloc[:, 6]
+            if pendentes:
+                logger.info(f"Extraindo relatório geral para {len(pendentes)} termo(s) de busca")
                 
-                filtro_base = (coluna_g.astype(str).str.upper() == "ENTREGUE") & (~coluna_d.astype(str).str.contains(".SD1", case=False, na=False))
+                totais = self._baixar_relatorio("", leitor=lambda origem: totais_por_termo(pd.read_excel(origem), pendentes))
                 
-                if is_alelo_kit:
-                    # ALELO-KIT: Filtra COM _KIT
-                    filtro_kit = filtro_base & (coluna_c.astype(str).str.contains("_KIT", case=False, na=False))
-                    total = int(coluna_e[filtro_kit].sum())
-                    
-                    logger.info(f"✅ ALELO-KIT (com _KIT): {total}")
-                    self.arquivos_processados.append(arquivo)
-                    
-                    return {'total': total}
+                if totais is None:
+                    return None
                 
-                elif is_alelo_normal:
-                    # ALELO normal: Filtra SEM _KIT
-                    filtro_alelo = filtro_base & (~coluna_c.astype(str).str.contains("_KIT", case=False, na=False))
-                    total = int(coluna_e[filtro_alelo].sum())
-                    
-                    logger.info(f"✅ ALELO Normal (sem _KIT): {total}")
-                    self.arquivos_processados.append(arquivo)
-                    
-                    return {'total': total}
+                self.relatorios.update(totais)
                 
-                else:
-                    # Outros clientes: Sem filtro especial
-                    total = int(coluna_e[filtro_base].sum())
-                    
-                    logger.info(f"Total somado da coluna E: {total}")
-                    self.arquivos_processados.append(arquivo)
-                    
-                    return {'total': total}
+                if self.cache:
+                    self.cache.salvar_varios(totais)
             else:
-                logger.warning("Arquivo não possui coluna G")
-                return {'total': 0}
+                logger.info("♻️ Todos os termos já estão no cache do GA. Exportação geral dispensada.")
+            
+            resultado = {}
+            for cliente, (termo_busca, chave_total) in buscas.items():
+                resultado[cliente] = self.relatorios[termo_busca][chave_total]
+                logger.info(f"✅ {cliente}: {resultado[cliente]}")
+            
+            return resultado
+        
+        except Exception as e:
+            logger.error(f"✗ Erro ao extrair relatório geral: {e}")
+            return None
+    
+    def _baixar_relatorio(self, termo_busca: str, leitor=None) -> dict:
+        campo_pesquisa = self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, SELETOR_PESQUISA_TABELA))
+        )
+        campo_pesquisa.clear()
+        tabela_filtrada = TabelaEstavel(self.driver, termo_busca)
+        campo_pesquisa.send_keys(termo_busca)
+        
+        logger.info("Aguardando a tabela filtrar...")
+        if not self._aguardar("tabela", tabela_filtrada):
+            return None
+        
+        botao_excel = self.wait.until(
+            EC.element_to_be_clickable((By.ID, "spreadsheet"))
+        )
+        self.monitor_downloads.iniciar()
+        botao_excel.click()
+        
+        logger.info("Download iniciado...")
+        
+        inicio = time.monotonic()
+        arquivo_path = self.monitor_downloads.aguardar(self.timeouts["download"])
+        self._registrar_espera("download", time.monotonic() - inicio, arquivo_path is not None)
+        
+        if not arquivo_path:
+            logger.warning(f"Nenhum arquivo novo encontrado em {self.download_path}")
+            return None
+        
+        return self._processar_arquivo_excel(arquivo_path, leitor)
+    
+    def _aguardar(self, etapa: str, condicao):
+        """
+        Espera a condição da etapa dentro do timeout configurado e registra o tempo gasto.
+        """
+        valor, decorrido = esperar_ate(condicao, self.timeouts[etapa])
+        self._registrar_espera(etapa, decorrido, bool(valor))
+        return valor
+    
+    def _registrar_espera(self, etapa: str, decorrido: float, ok: bool):
+        self.tempos_espera.append({"etapa": etapa, "segundos": round(decorrido, 2), "ok": ok})
+        registrar_tempo(f"ga.espera.{etapa}", decorrido)
+        
+        if ok:
+            logger.info(f"⏱️ {etapa}: {decorrido:.1f}s")
+        else:
+            logger.warning(f"⏱️ Tempo esgotado aguardando '{etapa}' ({self.timeouts[etapa]}s)")
+    
+    def _processar_arquivo_excel(self, arquivo_path: str, leitor=None) -> dict:
+        """
+        Lê o relatório baixado e calcula, de uma vez, os totais entregues
+        (sem .SD1): geral, com _KIT e sem _KIT.
+        """
+        try:
+            arquivo = os.path.basename(arquivo_path)
+            
+            logger.info(f"Processando arquivo: {arquivo}")
+            contar("ga.downloads")
+            contar("ga.bytes_baixados", os.path.getsize(arquivo_path))
+            
+            with medir("ga.processar_excel"):
+                totais = (leitor or self._ler_totais)(arquivo_path)
+            
+            if totais is not None:
+                self.arquivos_processados.append(arquivo)
+            
+            return totais
         
         except Exception as e:
             logger.error(f"✗ Erro ao processar Excel: {e}")
-            return {'total': 0}
+            return None
     
-    def _obter_arquivo_recente(self):
+    def _ler_totais(self, origem) -> dict:
+        if self.leitura_streaming:
+            return somar_relatorio_streaming(origem)
+        
+        return self._calcular_totais(pd.read_excel(origem))
+    
+    def _calcular_totais(self, df) -> dict:
+        contar("ga.linhas_lidas", len(df))
+        logger.info(f"Arquivo carregado com {len(df)} linhas e {df.shape[1]} colunas")
+        
+        if df.shape[1] < 7:
+            logger.warning("Arquivo não possui coluna G")
+            return None
+        
+        coluna_c = df.iloc[:, 2]
+        coluna_d = df.iloc[:, 3]
+        coluna_e = df.iloc[:, 4]
+        coluna_g = df.iloc[:, 6]
+        
+        filtro_base = (coluna_g.astype(str).str.upper() == "ENTREGUE") & (~coluna_d.astype(str).str.contains(".SD1", case=False, na=False))
+        filtro_kit = coluna_c.astype(str).str.contains("_KIT", case=False, na=False)
+        
+        return {
+            'total': int(coluna_e[filtro_base].sum()),
+            'total_kit': int(coluna_e[filtro_base & filtro_kit].sum()),
+            'total_sem_kit': int(coluna_e[filtro_base & ~filtro_kit].sum()),
+        }
+    
+    def fechar(self):
         try:
-            downloads_path = str(Path.home() / "Downloads")
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+                logger.info("✓ Driver fechado")
+        except Exception as e:
+            logger.error(f"✗ Erro ao fechar driver: {e}")
+
+class ExtratorGAHttp(ExtratorGA):
+    """
+    Alternativa ao ExtratorGA que não usa navegador: faz login uma vez com
+    uma requests.Session e chama diretamente a exportação Excel do DataTable
+    (a mesma URL que o botão EXCEL abre, com `action=excel`), lendo a
+    resposta em memória sem gravar em disco.
+    """
+    
+    def __init__(self, url: str, download_path: str = None, url_exportacao: str = None, **opcoes):
+        super().__init__(url, download_path or ".", **opcoes)
+        self.url_exportacao = url_exportacao or url
+        self.sessao = None
+    
+    def inicializar_driver(self) -> bool:
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=2)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+        logger.info("✓ Sessão HTTP iniciada")
+        return True
+    
+    @cronometrar("ga.login")
+    def fazer_login(self) -> bool:
+        try:
+            logger.info("Acessando GA (HTTP)...")
+            inicio = time.monotonic()
             
-            time.sleep(2)
+            # Sem sessão, o GA redireciona para o formulário de login
+            pagina = self.sessao.get(self.url, timeout=self.timeouts["pagina_login"])
+            pagina.raise_for_status()
             
-            arquivos_xlsx = [f for f in os.listdir(downloads_path) if f.endswith('.xlsx') and not f.startswith('~')]
+            match_token = re.search(r'name="_token"\s+value="([^"]+)"', pagina.text)
+            match_action = re.search(r'<form[^>]*action="([^"]+)"', pagina.text)
             
-            if not arquivos_xlsx:
-                logger.warning("Nenhum arquivo .xlsx encontrado em Downloads")
-                return None
+            dados = {"email": self.email, "password": self.senha}
+            if match_token:
+                dados["_token"] = match_token.group(1)
             
-            arquivos_novos = []
-            agora = time.time()
+            url_login = requests.compat.urljoin(pagina.url, match_action.group(1)) if match_action else pagina.url
             
-            for arquivo in arquivos_xlsx:
-                caminho_completo = os.path.join(downloads_path, arquivo)
-                tempo_modificacao = os.path.getmtime(caminho_completo)
-                
-                if tempo_modificacao > self.timestamp_inicio and (agora - tempo_modificacao) < 30:
-                    arquivos_novos.append(arquivo)
-                    logger.info(f"Arquivo candidato: {arquivo} (modificado há {int(agora - tempo_modificacao)}s)")
+            resposta = self.sessao.post(url_login, data=dados, timeout=self.timeouts["pos_login"])
+            resposta.raise_for_status()
+            
+            ok = "login" not in resposta.url.rstrip("/").rsplit("/", 1)[-1].lower()
+            self._registrar_espera("pos_login", time.monotonic() - inicio, ok)
+            
+            if not ok:
+                logger.error("✗ Login HTTP recusado pelo GA")
+                return False
+            
+            self.timestamp_inicio = time.time()
+            logger.info("✓ Login realizado com sucesso")
+            return True
+        
+        except Exception as e:
+            logger.error(f"✗ Erro ao fazer login: {e}")
+            return False
+    
+    def _baixar_relatorio(self, termo_busca: str, leitor=None) -> dict:
+        inicio = time.monotonic()
+        
+        params = {
+            "action": "excel",
+            "search[value]": termo_busca,
+            "search[regex]": "false",
+        }
+        
+        with self.sessao.get(self.url_exportacao, params=params, stream=True, timeout=self.timeouts["download"]) as resposta:
+            resposta.raise_for_status()
             
-            if not arquivos_novos:
-                logger.warning("Nenhum arquivo novo encontrado em Downloads")
-                logger.info(f"Timestamp início: {self.timestamp_inicio}, Agora: {agora}")
+            if "html" in resposta.headers.get("Content-Type", "").lower():
+                self._registrar_espera("download", time.monotonic() - inicio, False)
+                logger.warning("GA respondeu HTML em vez da planilha (sessão expirada?)")
                 return None
             
-            arquivo_mais_recente = max(
-                arquivos_novos,
-                key=lambda f: os.path.getmtime(os.path.join(downloads_path, f))
+            conteudo = io.BytesIO()
+            for bloco in resposta.iter_content(chunk_size=64 * 1024):
+                conteudo.write(bloco)
+        
+        self._registrar_espera("download", time.monotonic() - inicio, True)
+        logger.info(f"Planilha recebida: {conteudo.tell()} bytes")
+        contar("ga.downloads")
+        contar("ga.bytes_baixados", conteudo.tell())
+        
+        conteudo.seek(0)
+        with medir("ga.processar_excel"):
+            return (leitor or self._ler_totais)(conteudo)
+    
+    def fechar(self):
+        if self.sessao:
+            self.sessao.close()
+            self.sessao = None
+            logger.info("✓ Sessão HTTP fechada")
+
+class PoolExtratoresGA:
+    """
+    Executa várias sessões do GA (Chrome headless) em paralelo. Cada sessão
+    tem login e pasta de download próprios; os clientes são distribuídos
+    entre as sessões agrupados pelo termo de busca, para que ALELO e
+    ALELO-KIT continuem compartilhando um único download.
+    """
+    
+    def __init__(self, url: str, download_path: str, tamanho: int = 2, classe_extrator=ExtratorGA, **opcoes):
+        self.tamanho = max(1, tamanho)
+        self.cache = opcoes.get("cache")
+        # Totais por termo de busca compartilhados pelas sessões: um termo é
+        # baixado uma vez por execução mesmo sem o cache em disco (--atualizar-ga)
+        self.relatorios = {}
+        # `opcoes` (email, senha, timeouts...) são repassadas a cada extrator
+        self.extratores = [
+            classe_extrator(
+                url=url,
+                download_path=os.path.join(download_path, f"sessao_{i + 1}"),
+                relatorios=self.relatorios,
+                **opcoes
             )
+            for i in range(self.tamanho)
+        ]
+        self.ativos = []
+        # Clientes cuja extração falhou na última chamada (total 0 no resultado)
+        self.falhas = []
+    
+    def iniciar(self) -> bool:
+        """
+        Inicia e autentica todas as sessões em paralelo. Retorna True se ao menos uma estiver pronta.
+        """
+        def iniciar_sessao(extrator):
+            if extrator.inicializar_driver() and extrator.fazer_login():
+                return True
+            extrator.fechar()
+            return False
+        
+        prontos = [False] * self.tamanho
+        
+        def executar(indice):
+            try:
+                prontos[indice] = iniciar_sessao(self.extratores[indice])
+            except Exception as e:
+                logger.error(f"✗ Erro ao iniciar sessão {indice + 1} do GA: {e}")
+        
+        threads = [threading.Thread(target=executar, args=(i,), daemon=True) for i in range(self.tamanho)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.ativos = [extrator for extrator, ok in zip(self.extratores, prontos) if ok]
+        logger.info(f"✓ {len(self.ativos)}/{self.tamanho} sessão(ões) do GA prontas")
+        
+        return bool(self.ativos)
+    
+    def extrair(self, clientes: list, ao_concluir=None) -> dict:
+        """
+        Extrai o total de cada cliente usando as sessões ativas. Falhas ficam
+        restritas ao cliente (total 0, listado em `falhas`) e não interrompem
+        as demais buscas.
+        As sessões só são iniciadas se algum cliente não estiver no cache;
+        retorna None se nenhuma sessão puder ser iniciada. `ao_concluir(cliente, total)`
+        é chamado a cada cliente extraído com sucesso.
+        """
+        resultados_ga = {}
+        grupos = {}
+        self.falhas = []
+        
+        for cliente in clientes:
+            termo_busca, chave_total = definir_busca(cliente)
+            
+            # Clientes já em cache não precisam de sessão no GA
+            totais = self.cache.obter(termo_busca) if self.cache else None
+            if totais is not None:
+                resultados_ga[cliente] = totais[chave_total]
+                if ao_concluir:
+                    ao_concluir(cliente, totais[chave_total])
+                continue
             
-            logger.info(f"Arquivo selecionado: {arquivo_mais_recente}")
-            return arquivo_mais_recente
+            grupos.setdefault(termo_busca, [])
+            if cliente not in grupos[termo_busca]:
+                grupos[termo_busca].append(cliente)
         
-        except Exception as e:
-            logger.error(f"✗ Erro ao identificar arquivo: {e}")
+        if resultados_ga:
+            logger.info(f"♻️ {len(resultados_ga)} cliente(s) atendido(s) pelo cache do GA")
+        
+        if not grupos:
+            return {cliente: resultados_ga.get(cliente, 0) for cliente in clientes}
+        
+        if not self.ativos and not self.iniciar():
             return None
+        
+        fila = queue.Queue()
+        for grupo in grupos.values():
+            fila.put(grupo)
+        
+        trava = threading.Lock()
+        
+        def trabalhar(extrator):
+            while True:
+                try:
+                    grupo = fila.get_nowait()
+                except queue.Empty:
+                    return
+                
+                for cliente in grupo:
+                    try:
+                        resultado = extrator.extrair_relatorio_cliente(cliente)
+                    except Exception as e:
+                        logger.error(f"✗ Erro ao extrair relatório para {cliente}: {e}")
+                        resultado = {'total': 0, 'erro': True}
+                    
+                    with trava:
+                        resultados_ga[cliente] = resultado.get('total', 0)
+                        if resultado.get('erro'):
+                            self.falhas.append(cliente)
+                    
+                    if ao_concluir and not resultado.get('erro'):
+                        ao_concluir(cliente, resultado.get('total', 0))
+        
+        threads = [threading.Thread(target=trabalhar, args=(extrator,), daemon=True) for extrator in self.ativos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        return {cliente: resultados_ga.get(cliente, 0) for cliente in clientes}
+    
+    def extrair_fila(self, fila: queue.Queue, ao_concluir=None) -> dict:
+        """
+        Extrai os clientes à medida que chegam na fila (até receber None),
+        permitindo que a coleta de e-mails e o GA rodem ao mesmo tempo.
+        Clientes com o mesmo termo de busca esperam o primeiro download (trava
+        por termo) e reaproveitam os totais do termo, compartilhados pelas
+        sessões. Falhas ficam em `falhas`.
+        """
+        resultados_ga = {}
+        self.falhas = []
+        trava = threading.Lock()
+        travas_termo = {}
+        
+        def trabalhar(extrator):
+            while True:
+                cliente = fila.get()
+                
+                if cliente is None:
+                    # Devolve o sinal de fim para as demais sessões
+                    fila.put(None)
+                    return
+                
+                termo_busca, _ = definir_busca(cliente)
+                
+                with trava:
+                    if cliente in resultados_ga:
+                        continue
+                    resultados_ga[cliente] = 0
+                    trava_termo = travas_termo.setdefault(termo_busca, threading.Lock())
+                
+                with trava_termo:
+                    try:
+                        resultado = extrator.extrair_relatorio_cliente(cliente)
+                    except Exception as e:
+                        logger.error(f"✗ Erro ao extrair relatório para {cliente}: {e}")
+                        resultado = {'total': 0, 'erro': True}
+                
+                with trava:
+                    resultados_ga[cliente] = resultado.get('total', 0)
+                    if resultado.get('erro'):
+                        self.falhas.append(cliente)
+                
+                if ao_concluir and not resultado.get('erro'):
+                    ao_concluir(cliente, resultado.get('total', 0))
+        
+        threads = [threading.Thread(target=trabalhar, args=(extrator,), daemon=True) for extrator in self.ativos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        return resultados_ga
+    
+    def extrair_exportacao_unica(self, clientes: list) -> dict:
+        """
+        Usa uma única exportação geral (sem busca) para todos os clientes.
+        Se todos estiverem no cache, nenhuma sessão é iniciada. Se a
+        exportação falhar, todos os clientes ficam em `falhas` (total 0).
+        """
+        clientes = list(dict.fromkeys(clientes))
+        do_cache = {}
+        self.falhas = []
+        
+        for cliente in clientes:
+            termo_busca, chave_total = definir_busca(cliente)
+            totais = self.cache.obter(termo_busca) if self.cache else None
+            if totais is not None:
+                do_cache[cliente] = totais[chave_total]
+        
+        if len(do_cache) == len(clientes):
+            logger.info(f"♻️ {len(clientes)} cliente(s) atendido(s) pelo cache do GA")
+            return do_cache
+        
+        if not self.ativos and not self.iniciar():
+            return None
+        
+        totais = self.ativos[0].extrair_relatorio_geral(clientes)
+        
+        if totais is None:
+            self.falhas = list(clientes)
+            return {cliente: 0 for cliente in clientes}
+        
+        return totais
     
     def fechar(self):
-        try:
-            if self.driver:
-                self.driver.quit()
-                logger.info("✓ Driver fechado")
-        except Exception as e:
-            logger.error(f"✗ Erro ao fechar driver: {e}")
\ No newline at end of file
+        for extrator in self.extratores:
+            extrator.fechar()
@@ -1,9 +1,12 @@
 # ======================== main.py ========================
 
+import argparse
 import logging
 from datetime import datetime
-import time
 import os
+import queue
+import threading
+import time
 from dotenv import load_dotenv
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,10 +22,16 @@ else:
     print(f"🔍 Tentando carregar do diretório atual...")
     load_dotenv()
 
-from config import ConfigEmail, ConfigGA, ConfigArquivos
+from config import ConfigEmail, ConfigGA, ConfigTeams, ConfigArquivos
+from caixa import CaixaCorreio, CaixaOutlook
+from caixa_local import CaixaMaildir
 from emails import ColetorEmails
-from ga import ExtratorGA
+from ga import PoolExtratoresGA, ExtratorGA, ExtratorGAHttp, CacheRelatoriosGA
 from planilhas import GerenciadorPlanilhas
+from teams import EnviadorTeams
+from checkpoint import Checkpoint
+from modelos import RenderizadorRespostas
+import metricas
 from respostas import RespostorEmails
 
 logging.basicConfig(
@@ -31,106 +40,383 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+def main(args=None):
+    args = args or argparse.Namespace(atualizar_ga=False, resume=False, pipeline=False, caixa_local=None, simular=False)
     
     logger.info("="*60)
     logger.info("INICIANDO PROCESSO DE VALIDAÇÃO CORREIOS")
     logger.info("="*60)
     
-    logger.info("\n[ETAPA 1] Coletando e-mails do Outlook...")
+    # Simulação: nada é enviado, movido ou gravado em checkpoints e caches
+    simular = getattr(args, "simular", False)
     
-    coletor = ColetorEmails(nome_pasta="Processamento Correios")
+    # Saída de cada etapa fica gravada para permitir retomar com --resume
+    checkpoint = Checkpoint(pasta="resultados", retomar=args.resume, somente_leitura=simular)
     
-    if not coletor.conectar():
-        logger.error("Falha ao conectar. Abortando.")
-        return
+    # Uma única sessão do Outlook para a coleta e as respostas
+    caixa = criar_caixa(args)
+    
+    inicio_execucao = time.monotonic()
+    modo_pipeline = args.pipeline and not checkpoint.concluida("emails")
+    
+    if modo_pipeline:
+        logger.info("\n[ETAPAS 1 e 2] Coletando e-mails e extraindo GA em paralelo...")
+        
+        emails, resultados_ga, falhas_ga = coletar_e_extrair_em_paralelo(args, checkpoint)
+        
+        if emails is None:
+            return
+        
+        if not emails:
+            logger.warning("Nenhum e-mail encontrado!")
+            return
+        
+        salvar_resultados_ga(checkpoint, resultados_ga, falhas_ga)
+        
+        logger.info(f"✓ {len(emails)} e-mail(s) coletado(s)")
+    
+    else:
+        logger.info("\n[ETAPA 1] Coletando e-mails do Outlook...")
+        
+        if checkpoint.concluida("emails"):
+            emails = checkpoint.obter("emails")
+            logger.info("↩️ E-mails carregados do checkpoint")
+        else:
+            coletor = ColetorEmails(nome_pasta="Processamento Correios", caixa=caixa)
+            
+            if not coletor.conectar():
+                logger.error("Falha ao conectar. Abortando.")
+                return
+            
+            emails = coletor.buscar_emails_do_dia()
+            checkpoint.salvar("emails", emails)
+        
+        if not emails:
+            logger.warning("Nenhum e-mail encontrado!")
+            return
+        
+        logger.info(f"✓ {len(emails)} e-mail(s) coletado(s)")
+        
+        # Um mesmo cliente pode ter mais de um e-mail no dia; o GA é consultado uma vez
+        clientes = list(dict.fromkeys(e["Cliente"] for e in emails))
+        logger.info(f"Clientes encontrados: {', '.join(clientes)}")
+        
+        logger.info("\n[ETAPA 2] Extraindo relatórios do GA...")
+        
+        if checkpoint.concluida("resultados_ga"):
+            resultados_ga = checkpoint.obter("resultados_ga")
+            logger.info("↩️ Resultados do GA carregados do checkpoint")
+        else:
+            # Clientes já extraídos em uma execução interrompida não são buscados de novo
+            resultados_ga = dict(checkpoint.obter("resultados_ga", {}))
+            pendentes = [c for c in clientes if c not in resultados_ga]
+            
+            if resultados_ga:
+                logger.info(f"↩️ {len(resultados_ga)} cliente(s) do GA retomado(s) do checkpoint")
+            
+            falhas_ga = []
+            
+            if pendentes:
+                extraidos, falhas_ga = extrair_ga(pendentes, args, checkpoint)
+                
+                if extraidos is None:
+                    logger.error("Falha ao iniciar sessões do GA. Abortando.")
+                    return
+                
+                resultados_ga.update(extraidos)
+            
+            salvar_resultados_ga(checkpoint, resultados_ga, falhas_ga)
+    
+    duracao = time.monotonic() - inicio_execucao
+    metricas.registrar_tempo(f"main.coleta_e_ga.{'pipeline' if modo_pipeline else 'sequencial'}", duracao)
+    logger.info(f"⏱️ Coleta + GA ({'pipeline' if modo_pipeline else 'sequencial'}): {duracao:.1f}s")
+    
+    logger.info("\n[ETAPA 3] Realizando validação cruzada...")
     
-    emails = coletor.buscar_emails_do_dia()
+    if checkpoint.concluida("dados_validacao"):
+        dados_validacao = checkpoint.obter("dados_validacao")
+        logger.info("↩️ Validação carregada do checkpoint")
+    else:
+        dados_validacao = GerenciadorPlanilhas.gerar_dados_validacao(
+            emails,
+            resultados_ga
+        )
+        checkpoint.salvar("dados_validacao", dados_validacao)
     
-    if not emails:
-        logger.warning("Nenhum e-mail encontrado!")
-        return
+    arquivos = salvar_planilhas(emails, resultados_ga, dados_validacao)
     
-    logger.info(f"✓ {len(emails)} e-mail(s) coletado(s)")
+    # O Teams é enviado em segundo plano; as respostas começam sem esperar o webhook
+    enviador_teams = None if simular else criar_enviador_teams()
+    relatorio_teams_enfileirado = False
     
-    arquivo_emails = GerenciadorPlanilhas.salvar_emails(
-        emails,
-        ConfigArquivos.OUTPUT_EMAILS
-    )
+    try:
+        if simular:
+            logger.info("🧪 Simulação: relatório não enviado ao Teams")
+        elif checkpoint.concluida("teams"):
+            logger.info("↩️ Relatório já enviado ao Teams nesta data. Ignorando.")
+        elif enviador_teams:
+            logger.info("\n📤 Enviando relatório para o Teams em segundo plano...")
+            relatorio_teams_enfileirado = GerenciadorPlanilhas.enviar_para_teams(dados_validacao, enviador_teams)
+    
+        logger.info("\n[ETAPA 4] Respondendo e-mails automaticamente...")
+    
+        responsor = RespostorEmails(
+            nome_pasta="Processamento Correios",
+            dias_enviados=ConfigEmail.DIAS_ENVIADOS,
+            arquivo_cache_enviados=ConfigEmail.CACHE_ENVIADOS,
+            caixa=caixa,
+            modelos=RenderizadorRespostas(ConfigEmail.PASTA_MODELOS, html=ConfigEmail.RESPOSTA_HTML),
+            responder_divergencias=ConfigEmail.RESPONDER_DIVERGENCIAS,
+            simular=simular
+        )
+    
+        if responsor.conectar():
+            respondidos = checkpoint.obter("respostas", {})
+        
+            responsor.responder_emails(
+                dados_validacao,
+                ja_respondidos=list(respondidos),
+                ao_responder=lambda cliente: checkpoint.atualizar("respostas", cliente, datetime.now().isoformat())
+            )
+        else:
+            logger.warning("Não foi possível responder e-mails")
+    finally:
+        if enviador_teams:
+            logger.info("Aguardando envio ao Teams...")
+            enviador_teams.encerrar(ConfigTeams.TIMEOUT_ENCERRAMENTO)
+        
+            # Entregues ou guardados nos pendentes, os cartões do dia não são enfileirados de novo
+            if relatorio_teams_enfileirado:
+                checkpoint.salvar("teams", True)
+    
+    logger.info(f"⏱️ Tempo total de execução: {time.monotonic() - inicio_execucao:.1f}s")
+    
+    logger.info("\n" + "="*60)
+    logger.info("PROCESSO FINALIZADO COM SUCESSO!")
+    logger.info("="*60)
+    for descricao, arquivo in arquivos.items():
+        logger.info(f"Arquivo de {descricao}: {arquivo}")
+    logger.info("="*60)
+
+def salvar_planilhas(emails: list, resultados_ga: dict, dados_validacao: list) -> dict:
+    # Um único arquivo com as três abas; as planilhas separadas são opcionais
+    arquivos = {
+        "Relatório": GerenciadorPlanilhas.salvar_relatorio_consolidado(
+            emails,
+            resultados_ga,
+            dados_validacao,
+            ConfigArquivos.OUTPUT_CONSOLIDADO
+        )
+    }
+    
+    if ConfigArquivos.PLANILHAS_SEPARADAS:
+        arquivos["E-mails"] = GerenciadorPlanilhas.salvar_emails(emails, ConfigArquivos.OUTPUT_EMAILS)
+        arquivos["GA"] = GerenciadorPlanilhas.salvar_relatorios_ga(resultados_ga, ConfigArquivos.OUTPUT_GA)
+        arquivos["Validação"] = GerenciadorPlanilhas.salvar_validacao(dados_validacao, ConfigArquivos.OUTPUT_VALIDACAO)
+    
+    return arquivos
+
+def criar_caixa(args) -> CaixaCorreio:
+    # Outlook por padrão; caixa local (.eml/Maildir) para rodar sem Outlook
+    pasta_local = getattr(args, "caixa_local", None) or (ConfigEmail.PASTA_CAIXA_LOCAL if ConfigEmail.CAIXA == "maildir" else None)
+    
+    if pasta_local:
+        return CaixaMaildir(pasta_local)
     
-    clientes = [e["Cliente"] for e in emails]
-    logger.info(f"Clientes encontrados: {', '.join(clientes)}")
+    return CaixaOutlook(arquivo_cache_pastas=ConfigEmail.CACHE_PASTAS, somente_leitura=getattr(args, "simular", False))
+
+def criar_enviador_teams() -> EnviadorTeams:
+    teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+    
+    if not teams_webhook_url:
+        logger.warning("TEAMS_WEBHOOK_URL não configurado no .env")
+        return None
     
-    logger.info("\n[ETAPA 2] Extraindo relatórios do GA...")
+    enviador = EnviadorTeams(
+        teams_webhook_url,
+        arquivo_pendentes=ConfigTeams.ARQUIVO_PENDENTES,
+        tamanho_fila=ConfigTeams.TAMANHO_FILA,
+        espera_fila=ConfigTeams.ESPERA_FILA,
+        tentativas=ConfigTeams.TENTATIVAS,
+        espera_inicial=ConfigTeams.ESPERA_INICIAL,
+        espera_maxima=ConfigTeams.ESPERA_MAXIMA,
+        timeout=ConfigTeams.TIMEOUT
+    )
+    enviador.iniciar()
     
+    return enviador
+
+def criar_pool_ga(qtd_clientes: int, args) -> PoolExtratoresGA:
     # ALTERAÇÃO: Agora o ExtratorGA busca email e senha automaticamente do .env
-    extrator = ExtratorGA(
-        url=ConfigGA.URL,
-        download_path=ConfigGA.DOWNLOAD_PATH
+    # Várias sessões do GA em paralelo, cada uma com sua pasta de download.
+    # No modo HTTP basta uma sessão: cada cliente é uma única requisição.
+    modo_http = (ConfigGA.MODO_EXTRACAO == "http")
+    
+    cache_ga = CacheRelatoriosGA(
+        ConfigGA.CACHE_PATH,
+        ttl=ConfigGA.CACHE_TTL,
+        forcar_atualizacao=args.atualizar_ga,
+        somente_leitura=getattr(args, "simular", False)
     )
     
-    if not extrator.inicializar_driver():
-        logger.error("Falha ao inicializar Selenium. Abortando.")
-        return
+    return PoolExtratoresGA(
+        url=ConfigGA.URL,
+        download_path=ConfigGA.DOWNLOAD_PATH,
+        tamanho=1 if modo_http or ConfigGA.EXPORTACAO_UNICA else max(1, min(ConfigGA.TAMANHO_POOL, qtd_clientes)),
+        timeouts=ConfigGA.TIMEOUTS,
+        leitura_streaming=ConfigGA.LEITURA_STREAMING,
+        cache=cache_ga,
+        classe_extrator=ExtratorGAHttp if modo_http else ExtratorGA
+    )
+
+def extrair_ga(clientes: list, args, checkpoint: Checkpoint):
+    """
+    Retorna (resultados_ga, clientes com falha); resultados_ga é None se
+    nenhuma sessão do GA puder ser iniciada.
+    """
+    pool = criar_pool_ga(len(set(clientes)), args)
     
     try:
-        if not extrator.fazer_login():
-            logger.error("Falha no login do GA. Abortando.")
-            return
+        # As sessões só são abertas se houver cliente fora do cache
+        if ConfigGA.EXPORTACAO_UNICA:
+            return pool.extrair_exportacao_unica(clientes), pool.falhas
         
-        resultados_ga = {}
+        # Cada cliente concluído vai para o checkpoint imediatamente
+        resultados_ga = pool.extrair(
+            clientes,
+            ao_concluir=lambda cliente, total: checkpoint.atualizar("resultados_ga", cliente, total)
+        )
+        return resultados_ga, pool.falhas
+    
+    finally:
+        pool.fechar()
+
+def salvar_resultados_ga(checkpoint: Checkpoint, resultados_ga: dict, falhas: list):
+    # Clientes com falha no GA ficam fora do checkpoint e a etapa segue em
+    # aberto, para que o --resume busque só esses clientes de novo
+    if falhas:
+        logger.warning(f"⚠️ {len(falhas)} cliente(s) sem resultado do GA (total 0), buscados de novo com --resume: {', '.join(falhas)}")
+    
+    extraidos = {cliente: total for cliente, total in resultados_ga.items() if cliente not in falhas}
+    checkpoint.salvar("resultados_ga", extraidos, concluida=not falhas)
+
+def coletar_e_extrair_em_paralelo(args, checkpoint: Checkpoint):
+    """
+    Modo pipeline: a varredura do Outlook roda em uma thread própria (com
+    seu apartment COM) enquanto as sessões do GA sobem e fazem login; cada
+    cliente encontrado entra na fila do GA na mesma hora.
+    Retorna (emails, resultados_ga, clientes com falha no GA) ou
+    (None, None, None) em caso de falha.
+    """
+    fila_clientes = queue.Queue()
+    emails = []
+    conectou = []
+    
+    # Clientes já extraídos em uma execução interrompida não são buscados de novo
+    retomados = dict(checkpoint.obter("resultados_ga", {}))
+    
+    if retomados:
+        logger.info(f"↩️ {len(retomados)} cliente(s) do GA retomado(s) do checkpoint")
+    
+    def coletar():
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pythoncom = None
         
-        for cliente in clientes:
-            resultado = extrator.extrair_relatorio_cliente(cliente)
+        try:
+            # Objetos COM não atravessam threads: esta thread tem sua própria sessão
+            # (as pastas saem do mesmo cache em disco)
+            coletor = ColetorEmails(nome_pasta="Processamento Correios", caixa=criar_caixa(args))
+            
+            if not coletor.conectar():
+                return
             
-            resultados_ga[cliente] = resultado.get('total', 0)
+            conectou.append(True)
             
-            time.sleep(2)
+            with metricas.medir("outlook.buscar_emails_do_dia"):
+                for email in coletor.iterar_emails_do_dia():
+                    emails.append(email)
+                    
+                    if email["Cliente"] not in retomados:
+                        fila_clientes.put(email["Cliente"])
         
-        arquivo_ga = GerenciadorPlanilhas.salvar_relatorios_ga(
-            resultados_ga,
-            ConfigArquivos.OUTPUT_GA
-        )
+        except Exception as e:
+            logger.error(f"✗ Erro ao buscar e-mails: {e}")
         
-    finally:
-        extrator.fechar()
+        finally:
+            fila_clientes.put(None)
+            if pythoncom:
+                pythoncom.CoUninitialize()
     
-    logger.info("\n[ETAPA 3] Realizando validação cruzada...")
+    coletor_thread = threading.Thread(target=coletar, name="coletor-outlook", daemon=True)
+    coletor_thread.start()
     
-    dados_validacao = GerenciadorPlanilhas.gerar_dados_validacao(
-        emails,
-        resultados_ga
-    )
+    pool = criar_pool_ga(ConfigGA.TAMANHO_POOL, args)
     
-    arquivo_validacao = GerenciadorPlanilhas.salvar_validacao(
-        dados_validacao,
-        "validacao_{data}.xlsx"
-    )
+    try:
+        if not pool.iniciar():
+            coletor_thread.join()
+            logger.error("Falha ao iniciar sessões do GA. Abortando.")
+            return None, None, None
+        
+        resultados_ga = retomados
+        resultados_ga.update(pool.extrair_fila(
+            fila_clientes,
+            ao_concluir=lambda cliente, total: checkpoint.atualizar("resultados_ga", cliente, total)
+        ))
     
-    logger.info("\n📤 Enviando relatório para o Teams...")
-    GerenciadorPlanilhas.enviar_para_teams(dados_validacao)
+    finally:
+        pool.fechar()
     
-    logger.info("\n[ETAPA 4] Respondendo e-mails automaticamente...")
+    coletor_thread.join()
     
-    responsor = RespostorEmails(nome_pasta="Processamento Correios")
+    if not conectou:
+        logger.error("Falha ao conectar. Abortando.")
+        return None, None, None
     
-    if responsor.conectar():
-        responsor.responder_emails(dados_validacao)
-    else:
-        logger.warning("Não foi possível responder e-mails")
+    logger.info(f"E-mails com VALIDAÇÃO encontrados: {len(emails)}")
+    checkpoint.salvar("emails", emails)
     
-    logger.info("\n" + "="*60)
-    logger.info("PROCESSO FINALIZADO COM SUCESSO!")
-    logger.info("="*60)
-    logger.info(f"Arquivo de E-mails: {arquivo_emails}")
-    logger.info(f"Arquivo de GA: {arquivo_ga}")
-    logger.info(f"Arquivo de Validação: {arquivo_validacao}")
-    logger.info("="*60)
+    return emails, resultados_ga, pool.falhas
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Validação Correios")
+    parser.add_argument(
+        "--atualizar-ga",
+        action="store_true",
+        help="Ignora o cache do GA e baixa todos os relatórios novamente"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a execução de hoje a partir do último checkpoint em resultados/"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Coleta e-mails e extrai o GA ao mesmo tempo, em vez de uma etapa após a outra"
+    )
+    parser.add_argument(
+        "--caixa-local",
+        metavar="PASTA",
+        help="Usa uma caixa local (.eml/Maildir) em vez do Outlook"
+    )
+    parser.add_argument(
+        "--simular",
+        action="store_true",
+        help="Monta o plano de respostas sem enviar nem mover e-mails, sem Teams e sem gravar checkpoints ou caches"
+    )
+    return parser.parse_args()
 
 if __name__ == "__main__":
     try:
-        main()
+        main(parse_args())
     except KeyboardInterrupt:
         logger.info("\n⚠ Processo interrompido pelo usuário")
     except Exception as e:
-        logger.error(f"✗ Erro não tratado: {e}", exc_info=True)
\ No newline at end of file
+        logger.error(f"✗ Erro não tratado: {e}", exc_info=True)
+    finally:
+        # Tempos e contadores da execução, ao lado das planilhas
+        metricas.salvar_relatorio("resultados")
\ No newline at end of file
@@ -0,0 +1,108 @@
+# ======================== metricas.py ========================
+
+from datetime import datetime
+from functools import wraps
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Registro global da execução (como o logging): tempos por etapa e contadores
+_trava = threading.Lock()
+_tempos = {}
+_contadores = {}
+_inicio = time.time()
+
+def registrar_tempo(nome: str, segundos: float):
+    with _trava:
+        tempo = _tempos.setdefault(nome, {"chamadas": 0, "total_s": 0.0, "max_s": 0.0})
+        tempo["chamadas"] += 1
+        tempo["total_s"] += segundos
+        tempo["max_s"] = max(tempo["max_s"], segundos)
+
+def contar(nome: str, quantidade: int = 1):
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+class medir:
+    """
+    Cronômetro para blocos de código:
+
+        with medir("ga.download"):
+            ...
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.inicio = None
+        self.segundos = None
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.segundos = time.perf_counter() - self.inicio
+        registrar_tempo(self.nome, self.segundos)
+        return False
+
+def cronometrar(nome: str):
+    """
+    Decorator que mede cada chamada da função com `medir(nome)`.
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with medir(nome):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorador
+
+def resumo() -> dict:
+    with _trava:
+        tempos = {
+            nome: {
+                "chamadas": tempo["chamadas"],
+                "total_s": round(tempo["total_s"], 3),
+                "max_s": round(tempo["max_s"], 3),
+            }
+            for nome, tempo in sorted(_tempos.items())
+        }
+        contadores = dict(sorted(_contadores.items()))
+
+    return {
+        "inicio": datetime.fromtimestamp(_inicio).isoformat(timespec="seconds"),
+        "duracao_total_s": round(time.time() - _inicio, 3),
+        "tempos": tempos,
+        "contadores": contadores,
+    }
+
+def salvar_relatorio(pasta_saida: str = "resultados") -> str:
+    """
+    Grava o relatório da execução em JSON ao lado das planilhas geradas.
+    """
+    try:
+        os.makedirs(pasta_saida, exist_ok=True)
+
+        arquivo = os.path.join(pasta_saida, f"execucao_{datetime.fromtimestamp(_inicio).strftime('%Y%m%d_%H%M%S')}.json")
+
+        with open(arquivo, "w", encoding="utf-8") as f:
+            json.dump(resumo(), f, ensure_ascii=False, indent=2)
+
+        logger.info(f"✓ Relatório de execução salvo: {arquivo}")
+        return arquivo
+
+    except Exception as e:
+        logger.error(f"✗ Erro ao salvar relatório de execução: {e}")
+        return None
+
+def reiniciar():
+    global _inicio
+
+    with _trava:
+        _tempos.clear()
+        _contadores.clear()
+        _inicio = time.time()
@@ -0,0 +1,250 @@
+# ======================== modelos.py ========================
+
+from string import Formatter
+import html
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Campos da validação disponíveis nos modelos, ex.: {Cliente}, {Total_GA}
+CAMPOS = (
+    "Cliente",
+    "Total_Soma",
+    "Total_Informado",
+    "Total_Exibicao",
+    "Total_GA",
+    "Metodo_Validacao",
+    "Status",
+    "Qtd_Emails",
+    "Origem",
+)
+
+_MODELO_OK = """Bom dia,
+
+Validação concluída com SUCESSO para o cliente {Cliente}.
+
+Detalhes:
+- Total Email: {Total_Exibicao}
+- Total GA: {Total_GA}
+- Status: ✓ OK
+
+A validação foi processada corretamente.
+
+Att."""
+
+MODELOS_PADRAO = {
+    # TOTAL estava correto
+    "ok": _MODELO_OK,
+    # TOTAL estava errado, mas SOMA validou
+    "soma": _MODELO_OK,
+    "divergencia": """Bom dia,
+
+Foi encontrada DIVERGÊNCIA na validação do cliente {Cliente}.
+
+Detalhes:
+- Total Email: {Total_Exibicao}
+- Total GA: {Total_GA}
+- Status: ✗ DIVERGÊNCIA
+
+Por favor, confira as quantidades informadas.
+
+Att.""",
+}
+
+# Valores com os tipos de uma linha da validação, usados para testar os modelos na carga
+AMOSTRA_VALIDACAO = {
+    "Cliente": "CLIENTE",
+    "Total_Soma": 0,
+    "Total_Informado": 0,
+    "Total_Exibicao": 0,
+    "Total_GA": 0,
+    "Metodo_Validacao": "TOTAL",
+    "Status": "✓ OK",
+    "Qtd_Emails": 1,
+    "Origem": "E-mail e GA",
+}
+
+_FORMATADOR = Formatter()
+
+class ModeloCompilado:
+    """
+    Modelo já dividido (uma única vez, pelo string.Formatter) em trechos
+    fixos e campos. Renderizar só busca os valores, aplica conversão e
+    spec de cada campo e junta os pedaços, com o mesmo resultado de
+    `texto.format_map(valores)`.
+    """
+
+    __slots__ = ("texto", "literais", "campos", "simples")
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        self.literais = []
+        self.campos = []
+
+        literal_atual = ""
+
+        for literal, campo, spec, conversao in _FORMATADOR.parse(texto):
+            literal_atual += literal
+
+            if campo is None:
+                continue
+
+            self.literais.append(literal_atual)
+            self.campos.append((campo, conversao, spec))
+            literal_atual = ""
+
+        self.literais.append(literal_atual)
+
+        # Campos só com nome e spec fixo: valores[campo] direto, sem get_field
+        self.simples = all(
+            conversao is None and "{" not in spec and "." not in campo and "[" not in campo
+            for campo, conversao, spec in self.campos
+        )
+
+    @staticmethod
+    def _formatar(valores: dict, campo: str, conversao: str, spec: str) -> str:
+        valor = _FORMATADOR.get_field(campo, (), valores)[0]
+        valor = _FORMATADOR.convert_field(valor, conversao)
+
+        # Spec com campos aninhados, ex.: {Total_GA:>{Largura}}
+        if "{" in spec:
+            spec = spec.format_map(valores)
+
+        return format(valor, spec)
+
+    def renderizar(self, valores: dict) -> str:
+        if self.simples:
+            formatados = [format(valores[campo], spec) for campo, _, spec in self.campos]
+        else:
+            formatados = [self._formatar(valores, *campo) for campo in self.campos]
+
+        partes = [None] * (2 * len(formatados) + 1)
+        partes[::2] = self.literais
+        partes[1::2] = formatados
+        return "".join(partes)
+
+def compilar_modelo(modelo: str, origem: str = "", formato: str = "txt") -> ModeloCompilado:
+    """
+    Compila e valida o modelo uma única vez: campos existentes, chaves
+    balanceadas e specs/conversões compatíveis com os valores (testados com
+    AMOSTRA_VALIDACAO; no formato "html", já escapados como texto).
+    """
+    try:
+        compilado = ModeloCompilado(modelo)
+    except ValueError as e:
+        raise ValueError(f"Modelo de resposta inválido {origem}: {e}")
+
+    desconhecidos = [
+        campo for campo, _, _ in compilado.campos
+        if campo.split(".")[0].split("[")[0] not in CAMPOS
+    ]
+
+    if desconhecidos:
+        raise ValueError(f"Modelo de resposta {origem} usa campos desconhecidos: {', '.join(desconhecidos)}")
+
+    amostra = AMOSTRA_VALIDACAO
+    if formato == "html":
+        amostra = {campo: html.escape(str(valor)) for campo, valor in amostra.items()}
+
+    try:
+        compilado.renderizar(amostra)
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError) as e:
+        raise ValueError(f"Modelo de resposta {origem} não formata os valores da validação: {e}")
+
+    return compilado
+
+def texto_para_html(modelo: str) -> str:
+    """
+    Versão HTML de um modelo de texto: um <p> por parágrafo e <br> entre linhas.
+    """
+    paragrafos = [html.escape(p, quote=False).replace("\n", "<br>\n") for p in modelo.split("\n\n")]
+    return "\n".join(f"<p>{p}</p>" for p in paragrafos)
+
+class RenderizadorRespostas:
+    """
+    Monta o corpo das respostas a partir da validação. Os modelos ("ok",
+    "soma" e "divergencia") são carregados e compilados uma vez; arquivos em
+    `pasta` substituem os padrões:
+
+        modelos/ok.txt              modelo geral
+        modelos/ok.html             versão HTML (senão, gerada do .txt)
+        modelos/ALELO-KIT.ok.txt    modelo só para um cliente
+    """
+
+    TIPOS = ("ok", "soma", "divergencia")
+
+    def __init__(self, pasta: str = None, html: bool = False):
+        self.html = html
+        self.modelos = {}
+
+        for tipo in self.TIPOS:
+            self.modelos[(None, tipo, "txt")] = compilar_modelo(MODELOS_PADRAO[tipo], tipo)
+
+        if pasta and os.path.isdir(pasta):
+            self._carregar_pasta(pasta)
+
+        # HTML não fornecido: gerado do texto equivalente
+        if self.html:
+            for (cliente, tipo, formato), modelo in list(self.modelos.items()):
+                if formato == "txt" and (cliente, tipo, "html") not in self.modelos:
+                    origem = f"{cliente}.{tipo}.html" if cliente else f"{tipo}.html"
+                    self.modelos[(cliente, tipo, "html")] = compilar_modelo(texto_para_html(modelo.texto), origem, "html")
+
+        # Clientes com modelo próprio: os demais nem consultam os modelos por cliente
+        self.clientes = {cliente for cliente, _, _ in self.modelos if cliente is not None}
+
+    def _carregar_pasta(self, pasta: str):
+        for nome in sorted(os.listdir(pasta)):
+            partes = nome.rsplit(".", 2)
+
+            if len(partes) == 2:
+                cliente, (tipo, formato) = None, partes
+            elif len(partes) == 3:
+                cliente, tipo, formato = partes[0].upper(), partes[1], partes[2]
+            else:
+                continue
+
+            if tipo not in self.TIPOS or formato not in ("txt", "html"):
+                continue
+
+            # Sem a variante HTML ligada, os .html não são usados
+            if formato == "html" and not self.html:
+                continue
+
+            with open(os.path.join(pasta, nome), "r", encoding="utf-8") as f:
+                self.modelos[(cliente, tipo, formato)] = compilar_modelo(f.read().strip("\n"), nome, formato)
+
+            logger.info(f"✓ Modelo de resposta carregado: {nome}")
+
+    @staticmethod
+    def tipo(validacao: dict) -> str:
+        if validacao["Status"] != "✓ OK":
+            return "divergencia"
+
+        # Monta corpo baseado no método de validação
+        return "soma" if "SOMA" in validacao["Metodo_Validacao"] else "ok"
+
+    def _modelo(self, cliente: str, tipo: str, formato: str) -> ModeloCompilado:
+        if self.clientes and cliente.upper() in self.clientes:
+            modelo = self.modelos.get((cliente.upper(), tipo, formato))
+            # Arquivo vazio do cliente: fica o modelo geral
+            if modelo and modelo.texto:
+                return modelo
+
+        return self.modelos[(None, tipo, formato)]
+
+    def renderizar(self, validacao: dict):
+        """
+        Retorna (texto, html); html é None se a variante HTML estiver desligada.
+        """
+        cliente = str(validacao["Cliente"])
+        tipo = self.tipo(validacao)
+
+        texto = self._modelo(cliente, tipo, "txt").renderizar(validacao)
+
+        if not self.html:
+            return texto, None
+
+        valores = {campo: html.escape(str(valor)) for campo, valor in validacao.items()}
+        return texto, self._modelo(cliente, tipo, "html").renderizar(valores)
@@ -1,27 +1,38 @@
 # ======================== planilhas.py ========================
 
 import pandas as pd
+from openpyxl import Workbook
 from datetime import datetime
+import json
 import logging
 import os
 from typing import List, Dict
-import requests
+from config import ConfigTeams
+from metricas import cronometrar
+from teams import EnviadorTeams
+from validacao import validar_totais, resumir_validacao
 
 logger = logging.getLogger(__name__)
 
+COLUNAS_EMAILS = ["Cliente", "Total_Soma", "Total_Informado", "Subject"]
+COLUNAS_GA = ["Cliente", "Total GA (Entregue)"]
+
 class GerenciadorPlanilhas:
     
     @staticmethod
+    def _caminho_saida(arquivo_template: str, pasta_saida: str = "resultados") -> str:
+        os.makedirs(pasta_saida, exist_ok=True)
+        data = datetime.now().strftime('%Y%m%d')
+        return os.path.join(pasta_saida, arquivo_template.format(data=data))
+    
+    @staticmethod
+    @cronometrar("planilhas.salvar_emails")
     def salvar_emails(emails_dados: List[Dict], arquivo_template: str) -> str:
         try:
-            pasta_saida = "resultados"
-            os.makedirs(pasta_saida, exist_ok=True)
-            
-            data = datetime.now().strftime('%Y%m%d')
-            arquivo = os.path.join(pasta_saida, arquivo_template.format(data=data))
+            arquivo = GerenciadorPlanilhas._caminho_saida(arquivo_template)
             
             df = pd.DataFrame(emails_dados)
-            df = df[["Cliente", "Total_Soma", "Total_Informado", "Subject"]]
+            df = df[COLUNAS_EMAILS]
             
             df.to_excel(arquivo, index=False, sheet_name="E-mails")
             logger.info(f"✓ Planilha de e-mails salva: {arquivo}")
@@ -34,17 +45,14 @@ class GerenciadorPlanilhas:
             return None
     
     @staticmethod
+    @cronometrar("planilhas.salvar_relatorios_ga")
     def salvar_relatorios_ga(resultados_ga: Dict, arquivo_template: str) -> str:
         try:
-            pasta_saida = "resultados"
-            os.makedirs(pasta_saida, exist_ok=True)
-            
-            data = datetime.now().strftime('%Y%m%d')
-            arquivo = os.path.join(pasta_saida, arquivo_template.format(data=data))
+            arquivo = GerenciadorPlanilhas._caminho_saida(arquivo_template)
             
             df = pd.DataFrame(
                 list(resultados_ga.items()),
-                columns=["Cliente", "Total GA (Entregue)"]
+                columns=COLUNAS_GA
             )
             
             df.to_excel(arquivo, index=False, sheet_name="Relatórios GA")
@@ -58,86 +66,23 @@ class GerenciadorPlanilhas:
             return None
     
     @staticmethod
+    @cronometrar("planilhas.gerar_dados_validacao")
     def gerar_dados_validacao(emails_dados: List[Dict], resultados_ga: Dict) -> List[Dict]:
         try:
-            emails_por_cliente = {}
-            for item in emails_dados:
-                cliente = item["Cliente"]
-                emails_por_cliente[cliente] = {
-                    "soma": item["Total_Soma"],
-                    "informado": item["Total_Informado"]
-                }
-            
-            dados_validacao = []
+            df = validar_totais(emails_dados, resultados_ga)
+            resumir_validacao(df)
             
-            for cliente in emails_por_cliente.keys():
-                total_soma = emails_por_cliente[cliente]["soma"]
-                total_informado = emails_por_cliente[cliente]["informado"]
-                total_ga = resultados_ga.get(cliente, 0)
-                
-                logger.info(f"🔍 Validando {cliente}:")
-                logger.info(f"   📊 SOMA: {total_soma} | INFORMADO: {total_informado} | GA: {total_ga}")
-                
-                # VALIDAÇÃO DUPLA (BACKEND): Se SOMA OU INFORMADO bater com GA = OK
-                soma_ok = (total_soma == total_ga)
-                informado_ok = (total_informado == total_ga)
-                
-                # CORREÇÃO: Define valor de exibição de forma inteligente
-                if informado_ok:
-                    # Se TOTAL informado está correto, usa ele
-                    valor_exibicao = total_informado
-                    metodo_validacao = "TOTAL"
-                    status = "✓ OK"
-                    logger.info(f"   ✅ Validado por TOTAL informado")
-                    
-                elif soma_ok:
-                    # Se TOTAL está errado mas SOMA está certa, usa SOMA
-                    valor_exibicao = total_soma
-                    metodo_validacao = "SOMA (TOTAL divergente)"
-                    status = "✓ OK"
-                    logger.info(f"   ✅ Validado por SOMA (TOTAL estava errado)")
-                    
-                else:
-                    # ⚠️ CORREÇÃO PARA DIVERGÊNCIAS:
-                    # Prioridade: SOMA > INFORMADO (se SOMA existir)
-                    # Isso garante que sempre mostre o valor real extraído do email
-                    if total_soma > 0:
-                        valor_exibicao = total_soma
-                        logger.info(f"   ⚠️ Divergência! Exibindo SOMA: {total_soma}")
-                    elif total_informado > 0:
-                        valor_exibicao = total_informado
-                        logger.info(f"   ⚠️ Divergência! Exibindo TOTAL: {total_informado}")
-                    else:
-                        valor_exibicao = 0
-                        logger.warning(f"   ❌ Divergência! Ambos são zero!")
-                    
-                    metodo_validacao = "Nenhum"
-                    status = "✗ DIVERGÊNCIA"
-                
-                dados_validacao.append({
-                    "Cliente": cliente,
-                    "Total_Soma": total_soma,  # Mantém no backend para logs
-                    "Total_Informado": total_informado,  # Mantém no backend para logs
-                    "Total_Exibicao": valor_exibicao,  # ⭐ Valor mostrado no frontend
-                    "Total_GA": total_ga,
-                    "Metodo_Validacao": metodo_validacao,
-                    "Status": status
-                })
-            
-            return dados_validacao
+            return df.to_dict("records")
         
         except Exception as e:
             logger.error(f"✗ Erro ao gerar dados de validação: {e}")
             return []
     
     @staticmethod
+    @cronometrar("planilhas.salvar_validacao")
     def salvar_validacao(dados_validacao: List[Dict], arquivo_template: str) -> str:
         try:
-            pasta_saida = "resultados"
-            os.makedirs(pasta_saida, exist_ok=True)
-            
-            data = datetime.now().strftime('%Y%m%d')
-            arquivo = os.path.join(pasta_saida, arquivo_template.format(data=data))
+            arquivo = GerenciadorPlanilhas._caminho_saida(arquivo_template)
             
             # Salva todas as colunas no Excel (incluindo backend)
             df = pd.DataFrame(dados_validacao)
@@ -159,103 +104,246 @@ class GerenciadorPlanilhas:
             return None
     
     @staticmethod
-    def enviar_para_teams(dados_validacao: List[Dict]) -> bool:
+    @cronometrar("planilhas.salvar_relatorio_consolidado")
+    def salvar_relatorio_consolidado(emails_dados: List[Dict], resultados_ga: Dict, dados_validacao: List[Dict], arquivo_template: str) -> str:
+        """
+        Grava e-mails, totais do GA e validação em um único arquivo, uma aba
+        para cada, com o openpyxl em modo write-only (linhas enviadas direto
+        para o disco, sem montar DataFrames nem a planilha inteira em memória).
+        """
         try:
-            teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+            arquivo = GerenciadorPlanilhas._caminho_saida(arquivo_template)
             
-            if not teams_webhook_url:
-                logger.warning("TEAMS_WEBHOOK_URL não configurado no .env")
-                return False
+            wb = Workbook(write_only=True)
             
-            timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-            
-            total_clientes = len(dados_validacao)
-            total_ok = sum(1 for item in dados_validacao if "OK" in item["Status"])
-            total_divergencias = sum(1 for item in dados_validacao if "DIVERGÊNCIA" in item["Status"])
+            aba_emails = wb.create_sheet("E-mails")
+            aba_emails.append(COLUNAS_EMAILS)
+            for item in emails_dados:
+                aba_emails.append([item.get(coluna) for coluna in COLUNAS_EMAILS])
             
-            facts_adaptive = []
+            aba_ga = wb.create_sheet("Relatórios GA")
+            aba_ga.append(COLUNAS_GA)
+            for cliente, total in resultados_ga.items():
+                aba_ga.append([cliente, total])
             
+            # Salva todas as colunas da validação (incluindo backend)
+            colunas_validacao = list(dados_validacao[0].keys()) if dados_validacao else []
+            aba_validacao = wb.create_sheet("Validação")
+            aba_validacao.append(colunas_validacao)
+            ok_count = 0
+            divergencia_count = 0
             for item in dados_validacao:
-                cliente = item["Cliente"]
-                total_exibicao = item["Total_Exibicao"]  # ⭐ Agora sempre pega SOMA em caso de divergência
-                total_ga = item["Total_GA"]
-                status = item["Status"]
-                metodo = item["Metodo_Validacao"]
+                aba_validacao.append([item.get(coluna) for coluna in colunas_validacao])
+                if item.get("Status") == "✓ OK":
+                    ok_count += 1
+                elif item.get("Status") == "✗ DIVERGÊNCIA":
+                    divergencia_count += 1
+            
+            wb.save(arquivo)
+            
+            logger.info(f"✓ Relatório consolidado salvo: {arquivo}")
+            logger.info(f"  E-mails: {len(emails_dados)} | GA: {len(resultados_ga)} | Validação: {len(dados_validacao)}")
+            logger.info(f"  ✓ OK: {ok_count}")
+            logger.info(f"  ✗ DIVERGÊNCIA: {divergencia_count}")
+            
+            return arquivo
+        
+        except Exception as e:
+            logger.error(f"✗ Erro ao salvar relatório consolidado: {e}")
+            return None
+    
+    @staticmethod
+    @cronometrar("planilhas.enviar_para_teams")
+    def enviar_para_teams(dados_validacao: List[Dict], enviador: EnviadorTeams = None) -> bool:
+        """
+        Com `enviador`, apenas coloca os cartões na fila de envio em segundo
+        plano e retorna; sem ele, envia na hora (com repetições) e aguarda.
+        Relatórios grandes são divididos em vários cartões, enviados em ordem
+        pela mesma conexão.
+        """
+        try:
+            payloads = GerenciadorPlanilhas.montar_payloads_teams(dados_validacao)
+            
+            if enviador is None:
+                teams_webhook_url = os.getenv('TEAMS_WEBHOOK_URL')
+                
+                if not teams_webhook_url:
+                    logger.warning("TEAMS_WEBHOOK_URL não configurado no .env")
+                    return False
                 
-                if "OK" in status:
-                    icone_status = "✅"
-                    # Mostra TOTAL ou SOMA dependendo de qual validou
-                    if "SOMA" in metodo:
-                        valor_texto = f"Email: {total_exibicao} (SOMA corrigida) | GA: {total_ga}"
-                    else:
-                        valor_texto = f"Email: {total_exibicao} | GA: {total_ga}"
-                else:
-                    icone_status = "❌"
-                    # ⭐ Em divergência, agora sempre mostra o valor correto (SOMA prioritária)
-                    valor_texto = f"Email: {total_exibicao} | GA: {total_ga} ⚠️"
+                enviador = EnviadorTeams(teams_webhook_url)
                 
-                facts_adaptive.append({
-                    "title": f"{icone_status} {cliente}",
-                    "value": valor_texto
-                })
+                try:
+                    for adaptive_payload in payloads:
+                        if not enviador.entregar(adaptive_payload):
+                            return False
+                    
+                    logger.info("✅ Relatório enviado para o Teams com sucesso!")
+                    return True
+                finally:
+                    enviador.sessao.close()
             
-            if total_divergencias > 0:
-                container_style = "attention"
-                status_geral = "⚠️ DIVERGÊNCIAS DETECTADAS"
+            return all([enviador.enviar(adaptive_payload) for adaptive_payload in payloads])
+        
+        except Exception as e:
+            logger.error(f"❌ Erro ao enviar mensagem para o Teams: {e}")
+            return False
+    
+    @staticmethod
+    def _fato_teams(item: Dict) -> Dict:
+        cliente = item["Cliente"]
+        total_exibicao = item["Total_Exibicao"]  # ⭐ Agora sempre pega SOMA em caso de divergência
+        total_ga = item["Total_GA"]
+        status = item["Status"]
+        metodo = item["Metodo_Validacao"]
+        
+        if "OK" in status:
+            icone_status = "✅"
+            # Mostra TOTAL ou SOMA dependendo de qual validou
+            if "SOMA" in metodo:
+                valor_texto = f"Email: {total_exibicao} (SOMA corrigida) | GA: {total_ga}"
             else:
-                container_style = "good"
-                status_geral = "✅ Todas Validações OK"
-            
-            adaptive_payload = {
-                "type": "message",
-                "attachments": [{
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "contentUrl": None,
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.4",
-                        "body": [
-                            {
-                                "type": "TextBlock",
-                                "weight": "Bolder",
-                                "size": "Medium",
-                                "text": f"📊 Validação Correios - {status_geral}"
-                            },
-                            {
-                                "type": "TextBlock",
-                                "isSubtle": True,
-                                "wrap": True,
-                                "spacing": "None",
-                                "text": f"**Execução:** {timestamp}"
-                            },
-                            {
-                                "type": "Container",
-                                "style": container_style,
-                                "items": [
-                                    {"type": "FactSet", "facts": facts_adaptive}
-                                ]
-                            },
-                            {
-                                "type": "TextBlock",
-                                "wrap": True,
-                                "text": f"**Total de clientes:** {total_clientes} | **✅ OK:** {total_ok} | **❌ Divergências:** {total_divergencias}"
-                            }
-                        ]
-                    }
-                }]
+                valor_texto = f"Email: {total_exibicao} | GA: {total_ga}"
+        else:
+            icone_status = "❌"
+            # ⭐ Em divergência, agora sempre mostra o valor correto (SOMA prioritária)
+            valor_texto = f"Email: {total_exibicao} | GA: {total_ga} ⚠️"
+        
+        return {
+            "title": f"{icone_status} {cliente}",
+            "value": valor_texto
+        }
+    
+    @staticmethod
+    def _tamanho_json(dados) -> int:
+        # Mesma serialização do envio (EnviadorTeams.entregar): ASCII, emoji como \uXXXX
+        return len(json.dumps(dados).encode())
+    
+    @staticmethod
+    def _cartao_teams(titulo: str, subtitulo: str, container_style: str, facts: List[Dict], rodape: List[str]) -> Dict:
+        body = [
+            {
+                "type": "TextBlock",
+                "weight": "Bolder",
+                "size": "Medium",
+                "text": titulo
+            },
+            {
+                "type": "TextBlock",
+                "isSubtle": True,
+                "wrap": True,
+                "spacing": "None",
+                "text": subtitulo
             }
+        ]
+        
+        if facts:
+            body.append({
+                "type": "Container",
+                "style": container_style,
+                "items": [
+                    {"type": "FactSet", "facts": facts}
+                ]
+            })
+        
+        for texto in rodape:
+            body.append({
+                "type": "TextBlock",
+                "wrap": True,
+                "text": texto
+            })
+        
+        return {
+            "type": "message",
+            "attachments": [{
+                "contentType": "application/vnd.microsoft.card.adaptive",
+                "contentUrl": None,
+                "content": {
+                    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+                    "type": "AdaptiveCard",
+                    "version": "1.4",
+                    "body": body
+                }
+            }]
+        }
+    
+    @staticmethod
+    def montar_payloads_teams(
+        dados_validacao: List[Dict],
+        tamanho_maximo: int = ConfigTeams.TAMANHO_MAXIMO_CARTAO,
+        limite_ok: int = ConfigTeams.LIMITE_OK_DETALHADOS,
+    ) -> List[Dict]:
+        """
+        Monta os cartões do relatório, cada um com no máximo `tamanho_maximo`
+        bytes de JSON. Divergências vêm primeiro; acima de `limite_ok`
+        clientes OK, eles aparecem apenas como contagem.
+        """
+        timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        
+        divergentes = [item for item in dados_validacao if "OK" not in item["Status"]]
+        ok = [item for item in dados_validacao if "OK" in item["Status"]]
+        
+        total_clientes = len(dados_validacao)
+        total_ok = len(ok)
+        total_divergencias = sum(1 for item in divergentes if "DIVERGÊNCIA" in item["Status"])
+        
+        detalhados = divergentes + (ok if len(ok) <= limite_ok else [])
+        
+        rodape = [f"**Total de clientes:** {total_clientes} | **✅ OK:** {total_ok} | **❌ Divergências:** {total_divergencias}"]
+        
+        if len(ok) > limite_ok:
+            por_soma = sum(1 for item in ok if "SOMA" in item["Metodo_Validacao"])
+            rodape.insert(0, f"✅ **{total_ok} clientes OK** (não listados; {por_soma} validado(s) por SOMA corrigida)")
+        
+        if total_divergencias > 0:
+            container_style = "attention"
+            status_geral = "⚠️ DIVERGÊNCIAS DETECTADAS"
+        else:
+            container_style = "good"
+            status_geral = "✅ Todas Validações OK"
+        
+        titulo = f"📊 Validação Correios - {status_geral}"
+        subtitulo = f"**Execução:** {timestamp}"
+        
+        # Espaço ocupado pelo cartão sem fatos (com folga para o "parte X/Y" do título)
+        base = GerenciadorPlanilhas._tamanho_json(
+            GerenciadorPlanilhas._cartao_teams(titulo + " (parte 999/999)", subtitulo, container_style, [{}], rodape)
+        )
+        
+        partes = []
+        atual = []
+        tamanho_atual = base
+        
+        for item in detalhados:
+            fato = GerenciadorPlanilhas._fato_teams(item)
+            tamanho_fato = GerenciadorPlanilhas._tamanho_json(fato) + len(", ")
             
-            response = requests.post(teams_webhook_url, json=adaptive_payload, timeout=15)
+            if atual and tamanho_atual + tamanho_fato > tamanho_maximo:
+                partes.append(atual)
+                atual = []
+                tamanho_atual = base
             
-            if response.status_code == 202:
-                logger.info("✅ Relatório enviado para o Teams com sucesso!")
-                return True
-            else:
-                logger.error(f"❌ Erro ao enviar para o Teams: {response.status_code}")
-                logger.error(f"Resposta: {response.text}")
-                return False
+            atual.append(fato)
+            tamanho_atual += tamanho_fato
         
-        except Exception as e:
-            logger.error(f"❌ Erro ao enviar mensagem para o Teams: {e}")
-            return False
\ No newline at end of file
+        partes.append(atual)
+        
+        payloads = []
+        
+        for numero, facts in enumerate(partes, start=1):
+            titulo_parte = titulo if len(partes) == 1 else f"{titulo} (parte {numero}/{len(partes)})"
+            
+            # O resumo geral vai apenas no último cartão
+            rodape_parte = rodape if numero == len(partes) else []
+            
+            payloads.append(
+                GerenciadorPlanilhas._cartao_teams(titulo_parte, subtitulo, container_style, facts, rodape_parte)
+            )
+        
+        tamanhos = [GerenciadorPlanilhas._tamanho_json(payload) for payload in payloads]
+        logger.info(f"📦 Teams: {len(payloads)} cartão(ões), maior com {max(tamanhos)} bytes (limite {tamanho_maximo})")
+        
+        if max(tamanhos) > tamanho_maximo:
+            logger.warning("⚠️ Cartão do Teams acima do limite configurado")
+        
+        return payloads
@@ -1,70 +1,21 @@
 # ======================== respostas.py (atualizado) ========================
 
-import win32com.client
 import logging
-from datetime import datetime
-import unicodedata
-import re
+from datetime import datetime, timedelta
+import itertools
+import json
+import os
+import time
+from caixa import CaixaCorreio, CaixaOutlook
+from emails import extrair_codigos_cliente
+from modelos import RenderizadorRespostas
+from texto import normalizar_texto, contem_validacao, contem_kit
+from metricas import cronometrar, contar
 
 logger = logging.getLogger(__name__)
 
 # ============= FUNÇÕES AUXILIARES =============
 
-def normalizar_texto(texto: str) -> str:
-    nfd = unicodedata.normalize('NFD', texto)
-    sem_acentos = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-    return sem_acentos.upper()
-
-def contem_validacao(texto: str) -> bool:
-    """
-    Verifica se o texto contém variações de "VALIDAÇÃO" mesmo com erros de digitação.
-    Aceita: VALIDAÇÃO, VALIDACAO, VALDAÇÃO, VADAÇÃO, VALIDAÇAO, etc.
-    """
-    texto_normalizado = normalizar_texto(texto)
-    
-    # Lista de variações comuns de erro
-    variacoes = [
-        "VALIDACAO",    # Correto sem acento
-        "VALIDAÇÃO",    # Correto com acento (normalizado vira VALIDACAO)
-        "VALDACAO",     # Faltando I
-        "VALDAÇÃO",     # Faltando I com acento
-        "VADACAO",      # Faltando LI
-        "VADAÇÃO",      # Faltando LI com acento
-        "VALIDACÃO",    # Ã no lugar errado
-        "VALIDAÇAO",    # Ç sem til
-        "VALI DACAO",   # Com espaço
-        "VALIDA CAO",   # Com espaço
-    ]
-    
-    # Verifica se alguma variação está no texto
-    for variacao in variacoes:
-        variacao_norm = normalizar_texto(variacao)
-        if variacao_norm in texto_normalizado:
-            return True
-    
-    # Busca mais genérica: palavras que começam com VAL e terminam com CAO
-    import re
-    if re.search(r'VAL[DI]*[DA]*C[AÃ]*O', texto_normalizado):
-        return True
-    
-    return False
-
-def contem_kit(texto: str) -> bool:
-    """
-    Verifica se o texto contém "KIT" com variações de separadores.
-    Aceita: KIT, _KIT, -KIT, KIT_, -KIT-, _KIT_, etc.
-    """
-    texto_normalizado = normalizar_texto(texto)
-    
-    # Remove espaços e caracteres especiais ao redor de KIT
-    # Procura por KIT com qualquer separador antes/depois ou sozinho
-    padrao = r'[_\-\s]*KIT[_\-\s]*'
-    
-    if re.search(padrao, texto_normalizado):
-        return True
-    
-    return False
-
 def identificar_tipo_alelo(subject: str, corpo: str = "") -> str:
     """
     Identifica se é ALELO-KIT, ALELO normal ou outro cliente.
@@ -91,201 +42,324 @@ def identificar_tipo_alelo(subject: str, corpo: str = "") -> str:
 
 class RespostorEmails:
     
-    def __init__(self, nome_pasta: str = "Processamento Correios", nome_pasta_processados: str = "Correios Processados"):
-        self.outlook = None
+    def __init__(self, nome_pasta: str = "Processamento Correios", nome_pasta_processados: str = "Correios Processados",
+                 dias_enviados: int = 7, arquivo_cache_enviados: str = None, caixa: CaixaCorreio = None,
+                 modelos: RenderizadorRespostas = None, responder_divergencias: bool = False,
+                 simular: bool = False):
+        # Outlook (padrão) ou qualquer outra CaixaCorreio, como a caixa local em Maildir
+        self.caixa = caixa
         self.inbox = None
         self.pasta_processados = None
         self.nome_pasta = nome_pasta
         self.nome_pasta_processados = nome_pasta_processados
+        self.dias_enviados = dias_enviados
+        self.arquivo_cache_enviados = arquivo_cache_enviados
+        self.enviados = None  # ConversationID -> último SentOn
+        # Corpos das respostas (OK, SOMA, divergência), montados a partir de modelos pré-carregados
+        self.modelos = modelos or RenderizadorRespostas()
+        self.responder_divergencias = responder_divergencias
+        # Simulação: nada muda na caixa nem no disco (pasta de processados e cache de enviados)
+        self.simular = simular
     
     def conectar(self) -> bool:
         try:
-            self.outlook = win32com.client.Dispatch("Outlook.Application")
-            namespace = self.outlook.GetNamespace("MAPI")
+            if self.caixa is None:
+                self.caixa = CaixaOutlook()
             
-            self.inbox = self._obter_pasta(namespace, self.nome_pasta)
+            self.caixa.conectar()
+            
+            self.inbox = self.caixa.obter_pasta(self.nome_pasta)
             
             if self.inbox is None:
                 logger.error(f"Pasta '{self.nome_pasta}' não encontrada. Usando Inbox padrão.")
-                self.inbox = namespace.GetDefaultFolder(6)
+                self.inbox = self.caixa.pasta_padrao()
             
-            self.pasta_processados = self._obter_ou_criar_pasta(namespace, self.nome_pasta_processados)
+            if self.simular:
+                self.pasta_processados = self.caixa.obter_pasta(self.nome_pasta_processados)
+            else:
+                self.pasta_processados = self.caixa.obter_ou_criar_pasta(self.nome_pasta_processados)
             
-            if self.pasta_processados is None:
+            if self.pasta_processados is None and self.simular:
+                logger.info(f"🧪 Simulação: pasta '{self.nome_pasta_processados}' não existe e não será criada.")
+            elif self.pasta_processados is None:
                 logger.warning(f"Não foi possível criar pasta '{self.nome_pasta_processados}'. E-mails não serão movidos.")
             
-            logger.info(f"✓ Conectado ao Outlook na pasta: {self.nome_pasta}")
+            logger.info(f"✓ Conectado ao {self.caixa.nome} na pasta: {self.nome_pasta}")
             return True
         except Exception as e:
-            logger.error(f"✗ Erro ao conectar ao Outlook: {e}")
+            logger.error(f"✗ Erro ao conectar ao {self.caixa.nome}: {e}")
             return False
     
-    def _obter_pasta(self, namespace, nome_pasta: str):
+    @cronometrar("respostas.responder_emails")
+    def responder_emails(self, dados_validacao: list, ja_respondidos: list = None, ao_responder=None,
+                         simular: bool = False) -> list:
+        """
+        Responde e move os e-mails das validações OK, em duas fases: primeiro
+        monta o plano (e-mail, corpo e destino de cada resposta) a partir de
+        um retrato da pasta; depois envia todas as respostas e só então move
+        os e-mails respondidos. Com `simular` (ou o `simular` do respostor),
+        apenas monta e registra o plano.
+
+        Clientes em `ja_respondidos` (ex.: vindos de um checkpoint) são pulados;
+        `ao_responder(cliente)` é chamado após cada resposta enviada.
+        Retorna o plano, com o resultado de cada ação.
+        """
         try:
-            inbox_padrao = namespace.GetDefaultFolder(6)
+            agora = datetime.now()
+            
+            # Uma única passada pela pasta; cada validação vira uma consulta em memória
+            indice = self._indexar_emails(agora)
             
-            for pasta in inbox_padrao.Folders:
-                if pasta.Name.lower() == nome_pasta.lower():
-                    logger.info(f"✓ Pasta '{nome_pasta}' encontrada!")
-                    return pasta
+            plano = self.planejar_respostas(dados_validacao, indice, ja_respondidos)
             
-            for conta in namespace.Folders:
-                for pasta in conta.Folders:
-                    if pasta.Name.lower() == nome_pasta.lower():
-                        logger.info(f"✓ Pasta '{nome_pasta}' encontrada na raiz!")
-                        return pasta
+            if simular or self.simular:
+                self._registrar_plano(plano)
+                return plano
             
-            return None
+            self.executar_plano(plano, ao_responder)
+            return plano
         
         except Exception as e:
-            logger.error(f"✗ Erro ao buscar pasta: {e}")
-            return None
+            logger.error(f"✗ Erro ao responder e-mails: {e}")
+            return []
     
-    def _obter_ou_criar_pasta(self, namespace, nome_pasta: str):
-        try:
-            pasta = self._obter_pasta(namespace, nome_pasta)
+    def planejar_respostas(self, dados_validacao: list, indice: dict, ja_respondidos: list = None) -> list:
+        plano = []
+        emails_ignorados = 0
+        nao_encontrados = 0
+        
+        for validacao in dados_validacao:
+            cliente = validacao["Cliente"]
+            status = validacao["Status"]
             
-            if pasta:
-                return pasta
+            # NOVA LÓGICA: Só processa e-mails com status OK (ou avisa a divergência, se configurado)
+            if status != "✓ OK" and not self.responder_divergencias:
+                logger.info(f"⚠️ Cliente {cliente} com DIVERGÊNCIA - e-mail NÃO será respondido")
+                emails_ignorados += 1
+                continue
             
-            inbox_padrao = namespace.GetDefaultFolder(6)
-            nova_pasta = inbox_padrao.Folders.Add(nome_pasta)
-            logger.info(f"✓ Pasta '{nome_pasta}' criada com sucesso!")
-            return nova_pasta
+            if ja_respondidos and cliente in ja_respondidos:
+                logger.info(f"↩️ Cliente {cliente} já respondido em execução anterior. Ignorando.")
+                continue
+            
+            # Vários e-mails do cliente no dia viram uma linha (totais somados): todos são respondidos
+            quantidade = max(1, int(validacao.get("Qtd_Emails") or 1))
+            entradas = self._localizar_emails(indice, cliente, quantidade)
+            
+            if not entradas:
+                logger.warning(f"⚠️ E-mail não encontrado para cliente: {cliente}")
+                nao_encontrados += 1
+                continue
+            
+            if len(entradas) < quantidade:
+                logger.warning(f"⚠️ {len(entradas)} de {quantidade} e-mail(s) encontrado(s) para cliente: {cliente}")
+            else:
+                logger.info(f"📧 {len(entradas)} e-mail(s) encontrado(s) para cliente: {cliente}")
+            
+            corpo, corpo_html = self.modelos.renderizar(validacao)
+            ok = (status == "✓ OK")
+            
+            for entrada in entradas:
+                plano.append({
+                    "cliente": cliente,
+                    "registro": entrada["item"],
+                    "subject": entrada["item"].subject,
+                    "tipo": self.modelos.tipo(validacao),
+                    "corpo": corpo,
+                    "corpo_html": corpo_html,
+                    # E-mails com divergência continuam na pasta para correção
+                    "destino": self.nome_pasta_processados if ok and (self.pasta_processados is not None or self.simular) else None,
+                    "resposta": None,
+                    "movido": None,
+                    "erro": None,
+                })
         
-        except Exception as e:
-            logger.error(f"✗ Erro ao criar pasta: {e}")
-            return None
+        logger.info(f"📋 Plano: {len(plano)} resposta(s) | {emails_ignorados} divergência(s) não respondida(s) | {nao_encontrados} sem e-mail")
+        return plano
     
-    def responder_emails(self, dados_validacao: list):
-        try:
-            emails_respondidos = 0
-            emails_ignorados = 0
-            agora = datetime.now()
+    @cronometrar("respostas.executar_plano")
+    def executar_plano(self, plano: list, ao_responder=None) -> dict:
+        """
+        Envia todas as respostas do plano e, depois, move os e-mails cujas
+        respostas foram enviadas. O resultado fica em cada ação
+        ("resposta", "movido" e "erro"). `ao_responder(cliente)` é chamado
+        quando todos os e-mails do cliente foram respondidos.
+        """
+        inicio = time.perf_counter()
+        
+        pendentes_cliente = {}
+        for acao in plano:
+            pendentes_cliente[acao["cliente"]] = pendentes_cliente.get(acao["cliente"], 0) + 1
+        
+        for acao in plano:
+            cliente = acao["cliente"]
+            
+            try:
+                self.caixa.responder_todos(acao["registro"], acao["corpo"], acao["corpo_html"])
+                acao["resposta"] = "enviada"
+                contar("com.respostas.enviadas")
+                logger.info(f"✓ Resposta ({acao['tipo']}) enviada para {cliente}")
+            
+            except Exception as e:
+                acao["resposta"] = "erro"
+                acao["erro"] = str(e)
+                logger.error(f"✗ Erro ao enviar resposta ({acao['tipo']}) para {cliente}: {e}")
+                continue
             
-            for validacao in dados_validacao:
-                cliente = validacao["Cliente"]
-                status = validacao["Status"]
+            pendentes_cliente[cliente] -= 1
+            
+            if ao_responder and pendentes_cliente[cliente] == 0:
+                ao_responder(cliente)
+        
+        duracao_envios = time.perf_counter() - inicio
+        
+        # Os e-mails só saem da pasta depois de todos os envios
+        for acao in plano:
+            if acao["resposta"] == "enviada" and acao["destino"]:
+                acao["movido"] = self._mover_email(acao["registro"], acao["cliente"])
+        
+        enviadas = sum(1 for acao in plano if acao["resposta"] == "enviada")
+        movidas = sum(1 for acao in plano if acao["movido"])
+        erros = len(plano) - enviadas
+        taxa = enviadas / duracao_envios if duracao_envios > 0 else 0.0
+        
+        logger.info(f"✓ {enviadas} e-mail(s) respondido(s) com sucesso | {movidas} movido(s) | {erros} erro(s)")
+        logger.info(f"⏱️ Respostas: {duracao_envios:.1f}s ({taxa:.1f} respostas/s)")
+        
+        return {"enviadas": enviadas, "movidas": movidas, "erros": erros, "respostas_por_segundo": round(taxa, 2)}
+    
+    def _registrar_plano(self, plano: list):
+        logger.info(f"🧪 Simulação: {len(plano)} resposta(s) seriam enviadas (nada foi enviado ou movido)")
+        
+        for acao in plano:
+            destino = f"mover para '{acao['destino']}'" if acao["destino"] else "manter na pasta"
+            logger.info(f"   {acao['cliente']}: responder ({acao['tipo']}) '{acao['subject']}' e {destino}")
+    
+    @cronometrar("respostas.indexar_emails")
+    def _indexar_emails(self, agora) -> dict:
+        """
+        Percorre a pasta uma única vez e indexa os e-mails de VALIDAÇÃO do dia
+        ainda não respondidos. Chaves: "ALELO-KIT", "ALELO" e os códigos de
+        cliente encontrados no corpo.
+        """
+        indice = {"por_chave": {}, "entradas": []}
+        
+        leitor = self.caixa.leitor(self.inbox)
+        
+        for registro in leitor.emails_do_dia(agora.date()):
+            contar("com.respostas.itens")
+            
+            try:
+                subject = registro.subject
+                
+                # Usa a nova função que aceita variações de VALIDAÇÃO
+                if not contem_validacao(subject):
+                    continue
                 
-                # NOVA LÓGICA: Só processa e-mails com status OK
-                if status != "✓ OK":
-                    logger.info(f"⚠️ Cliente {cliente} com DIVERGÊNCIA - e-mail NÃO será respondido")
-                    emails_ignorados += 1
+                if self._ja_foi_respondido(registro):
+                    logger.info(f"E-mail já foi respondido. Ignorando: {subject}")
                     continue
                 
-                email_encontrado = False
+                corpo = registro.body
+                contar("com.respostas.corpos")
                 
-                for item in self.inbox.Items:
-                    try:
-                        if not hasattr(item, 'Subject'):
-                            continue
-                        
-                        subject = item.Subject
-                        
-                        # Usa a nova função que aceita variações de VALIDAÇÃO
-                        if not contem_validacao(subject):
-                            continue
-                        
-                        try:
-                            received_time = item.ReceivedTime
-                            if received_time.date() != agora.date():
-                                continue
-                        except:
-                            continue
-                        
-                        if self._ja_foi_respondido(item):
-                            logger.info(f"E-mail do cliente {cliente} já foi respondido. Ignorando.")
-                            continue
-                        
-                        # NOVA LÓGICA: Verifica se o e-mail corresponde ao cliente
-                        corpo = item.Body if hasattr(item, 'Body') else ""
-                        
-                        # Identifica o tipo de ALELO do e-mail
-                        tipo_alelo_email = identificar_tipo_alelo(subject, corpo)
-                        
-                        # Verifica se o cliente da validação é ALELO
-                        cliente_upper = cliente.upper()
-                        
-                        # Match para ALELO-KIT
-                        if cliente_upper == "ALELO-KIT":
-                            if tipo_alelo_email == "ALELO-KIT":
-                                logger.info(f"✓ E-mail ALELO-KIT encontrado para validação: {cliente}")
-                            else:
-                                continue
-                        
-                        # Match para ALELO normal
-                        elif "ALELO" in cliente_upper and "KIT" not in cliente_upper:
-                            if tipo_alelo_email == "ALELO":
-                                logger.info(f"✓ E-mail ALELO normal encontrado para validação: {cliente}")
-                            else:
-                                continue
-                        
-                        # Match para outros clientes
-                        else:
-                            if cliente_upper not in subject.upper() and cliente_upper not in corpo.upper():
-                                continue
-                        
-                        logger.info(f"📧 E-mail encontrado para cliente: {cliente}")
-                        
-                        # Só envia resposta se for OK (sempre será neste ponto)
-                        self._enviar_resposta_ok(item, validacao)
-                        
-                        self._mover_email(item, cliente)
-                        
-                        emails_respondidos += 1
-                        email_encontrado = True
-                        break
-                    
-                    except Exception as e:
-                        logger.warning(f"Erro ao processar e-mail para {cliente}: {e}")
-                        continue
+                entrada = {
+                    "item": registro,
+                    "subject_upper": subject.upper(),
+                    "corpo_upper": corpo.upper(),
+                    "usado": False,
+                }
+                indice["entradas"].append(entrada)
                 
-                if not email_encontrado:
-                    logger.warning(f"⚠️ E-mail não encontrado para cliente: {cliente}")
+                # Identifica o tipo de ALELO do e-mail
+                tipo_alelo_email = identificar_tipo_alelo(subject, corpo)
+                
+                chaves = set(extrair_codigos_cliente(corpo))
+                if tipo_alelo_email:
+                    chaves.add(tipo_alelo_email)
+                
+                for chave in chaves:
+                    indice["por_chave"].setdefault(chave, []).append(entrada)
             
-            logger.info(f"✓ {emails_respondidos} e-mail(s) respondido(s) com sucesso")
-            logger.info(f"⚠️ {emails_ignorados} e-mail(s) com divergência (não respondidos)")
+            except Exception as e:
+                logger.warning(f"Erro ao indexar e-mail: {e}")
+                continue
         
-        except Exception as e:
-            logger.error(f"✗ Erro ao responder e-mails: {e}")
+        logger.info(f"✓ {len(indice['entradas'])} e-mail(s) de validação indexado(s)")
+        return indice
+    
+    def _localizar_emails(self, indice: dict, cliente: str, quantidade: int = 1) -> list:
+        """
+        Retorna até `quantidade` e-mails do índice ainda não usados para o cliente.
+        """
+        cliente_upper = cliente.upper()
+        
+        # Match para ALELO-KIT / ALELO normal: apenas pelo tipo identificado
+        if cliente_upper == "ALELO-KIT":
+            chave = "ALELO-KIT"
+        elif "ALELO" in cliente_upper and "KIT" not in cliente_upper:
+            chave = "ALELO"
+        else:
+            chave = None
+        
+        if chave:
+            candidatas = indice["por_chave"].get(chave, [])
+        else:
+            # Código extraído do corpo; depois, cliente citado em qualquer ponto do assunto ou corpo
+            candidatas = itertools.chain(
+                indice["por_chave"].get(cliente_upper, []),
+                (entrada for entrada in indice["entradas"]
+                 if cliente_upper in entrada["subject_upper"] or cliente_upper in entrada["corpo_upper"]),
+            )
+        
+        encontradas = []
+        
+        for entrada in candidatas:
+            if entrada["usado"]:
+                continue
+            
+            entrada["usado"] = True
+            encontradas.append(entrada)
+            
+            if len(encontradas) == quantidade:
+                break
+        
+        if chave and encontradas:
+            logger.info(f"✓ E-mail {chave} encontrado para validação: {cliente}")
+        
+        return encontradas
     
-    def _mover_email(self, item, cliente: str):
+    def _mover_email(self, item, cliente: str) -> bool:
         try:
             if self.pasta_processados is None:
                 logger.warning(f"Pasta de processados não disponível. E-mail de {cliente} não foi movido.")
-                return
+                return False
             
-            item.Move(self.pasta_processados)
+            self.caixa.mover(item, self.pasta_processados)
+            contar("com.respostas.movidos")
             logger.info(f"✓ E-mail de {cliente} movido para '{self.nome_pasta_processados}'")
+            return True
         
         except Exception as e:
             logger.error(f"✗ Erro ao mover e-mail de {cliente}: {e}")
+            return False
     
-    def _ja_foi_respondido(self, item) -> bool:
+    def _ja_foi_respondido(self, registro) -> bool:
         try:
-            try:
-                if hasattr(item, 'Replied') and item.Replied:
-                    logger.info("E-mail já tem flag de respondido")
-                    return True
-            except:
-                pass
+            if registro.respondido:
+                logger.info("E-mail já tem flag de respondido")
+                return True
             
             try:
-                namespace = self.outlook.GetNamespace("MAPI")
-                sent_items = namespace.GetDefaultFolder(5)
+                if self.enviados is None:
+                    self.enviados = self._indexar_enviados()
                 
-                conversation_id = item.ConversationID if hasattr(item, 'ConversationID') else None
+                conversation_id = registro.conversation_id
                 
-                if conversation_id:
-                    for sent_item in sent_items.Items:
-                        try:
-                            if hasattr(sent_item, 'ConversationID') and sent_item.ConversationID == conversation_id:
-                                if hasattr(sent_item, 'SentOn') and hasattr(item, 'ReceivedTime'):
-                                    if sent_item.SentOn > item.ReceivedTime:
-                                        logger.info(f"Encontrada resposta anterior na conversa")
-                                        return True
-                        except:
-                            continue
+                if conversation_id and conversation_id in self.enviados:
+                    if self.enviados[conversation_id] > registro.received_time:
+                        logger.info(f"Encontrada resposta anterior na conversa")
+                        return True
             except Exception as e:
                 logger.warning(f"Erro ao verificar Sent Items: {e}")
             
@@ -295,49 +369,76 @@ class RespostorEmails:
             logger.warning(f"Erro ao verificar se já foi respondido: {e}")
             return False
     
-    def _enviar_resposta_ok(self, item_original, resultado):
+    @cronometrar("respostas.indexar_enviados")
+    def _indexar_enviados(self) -> dict:
+        """
+        Monta o índice ConversationID -> último SentOn dos Itens Enviados
+        dentro da janela de `dias_enviados`. Se houver cache em disco, lê só
+        o que foi enviado desde a última atualização.
+        """
+        agora = datetime.now()
+        inicio_janela = agora - timedelta(days=self.dias_enviados)
+        
+        enviados, atualizado_em = self._carregar_cache_enviados(inicio_janela)
+        
+        # Margem de segurança para itens sincronizados com atraso
+        inicio_busca = max(inicio_janela, atualizado_em - timedelta(hours=1)) if atualizado_em else inicio_janela
+        
+        novos = 0
+        for conversation_id, sent_on in self.caixa.enviados_desde(inicio_busca):
+            contar("com.enviados.itens")
+            
+            if conversation_id not in enviados or sent_on > enviados[conversation_id]:
+                enviados[conversation_id] = sent_on
+                novos += 1
+        
+        # Descarta conversas fora da janela
+        enviados = {conv: sent_on for conv, sent_on in enviados.items() if sent_on >= inicio_janela}
+        
+        logger.info(f"✓ Itens Enviados indexados: {len(enviados)} conversa(s) ({novos} atualizada(s))")
+        
+        if not self.simular:
+            self._salvar_cache_enviados(enviados, agora)
+        return enviados
+    
+    def _carregar_cache_enviados(self, inicio_janela: datetime):
+        if not self.arquivo_cache_enviados or not os.path.exists(self.arquivo_cache_enviados):
+            return {}, None
+        
         try:
-            reply = item_original.ReplyAll()
+            with open(self.arquivo_cache_enviados, "r", encoding="utf-8") as f:
+                cache = json.load(f)
             
-            cliente = resultado["Cliente"]
-            total_exibicao = resultado["Total_Exibicao"]  # Frontend usa este valor
-            total_ga = resultado["Total_GA"]
-            metodo = resultado["Metodo_Validacao"]
+            atualizado_em = datetime.fromisoformat(cache["atualizado_em"])
             
-            # Monta corpo baseado no método de validação
-            if "SOMA" in metodo:
-                # TOTAL estava errado, mas SOMA validou
-                corpo = f"""Bom dia,
-
-Validação concluída com SUCESSO para o cliente {cliente}.
-
-Detalhes:
-- Total Email: {total_exibicao}
-- Total GA: {total_ga}
-- Status: ✓ OK
-
-A validação foi processada corretamente.
-
-Att."""
-            else:
-                # TOTAL estava correto
-                corpo = f"""Bom dia,
-
-Validação concluída com SUCESSO para o cliente {cliente}.
-
-Detalhes:
-- Total Email: {total_exibicao}
-- Total GA: {total_ga}
-- Status: ✓ OK
-
-A validação foi processada corretamente.
-
-Att."""
+            if atualizado_em < inicio_janela:
+                return {}, None
+            
+            enviados = {conv: datetime.fromisoformat(sent_on) for conv, sent_on in cache["conversas"].items()}
+            return enviados, atualizado_em
+        
+        except Exception as e:
+            logger.warning(f"Cache de Itens Enviados inválido, recriando: {e}")
+            return {}, None
+    
+    def _salvar_cache_enviados(self, enviados: dict, atualizado_em: datetime):
+        if not self.arquivo_cache_enviados:
+            return
+        
+        try:
+            pasta_cache = os.path.dirname(self.arquivo_cache_enviados)
+            if pasta_cache:
+                os.makedirs(pasta_cache, exist_ok=True)
             
-            reply.Body = corpo
-            reply.Send()
+            cache = {
+                "atualizado_em": atualizado_em.isoformat(),
+                "conversas": {conv: sent_on.isoformat() for conv, sent_on in enviados.items()},
+            }
             
-            logger.info(f"✓ Resposta OK enviada para {cliente}")
+            temporario = self.arquivo_cache_enviados + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(temporario, self.arquivo_cache_enviados)
         
         except Exception as e:
-            logger.error(f"✗ Erro ao enviar resposta OK: {e}")
\ No newline at end of file
+            logger.warning(f"Não foi possível salvar cache de Itens Enviados: {e}")
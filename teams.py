@@ -0,0 +1,222 @@
+# ======================== teams.py ========================
+
+from datetime import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import requests
+
+import metricas
+
+logger = logging.getLogger(__name__)
+
+class EnviadorTeams:
+    """
+    Envia mensagens ao webhook do Teams em uma thread própria, para que o
+    processo siga para as respostas sem esperar o Teams.
+
+    As mensagens passam por uma fila limitada; com ela cheia, quem enfileira
+    espera até `espera_fila` segundos por espaço. Respostas 429 e 5xx (e
+    falhas de conexão) são repetidas com espera exponencial. O que ainda
+    não foi entregue ao encerrar vai para um arquivo de pendentes, que é
+    reenviado na próxima execução.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        arquivo_pendentes: str = "resultados/teams_pendentes.json",
+        tamanho_fila: int = 10,
+        espera_fila: float = 120.0,
+        tentativas: int = 5,
+        espera_inicial: float = 1.0,
+        espera_maxima: float = 30.0,
+        timeout: float = 15,
+        ao_concluir=None,
+    ):
+        self.url = url
+        self.arquivo_pendentes = arquivo_pendentes
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.timeout = timeout
+        self.espera_fila = espera_fila
+        self.ao_concluir = ao_concluir
+
+        self.fila = queue.Queue(maxsize=tamanho_fila)
+        self.sessao = requests.Session()
+        self.falhas = []
+        self.entregues = 0
+        self.trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        """
+        Inicia a thread de envio, já com os pendentes de execuções anteriores na fila.
+        """
+        pendentes = self._carregar_pendentes()
+
+        if pendentes:
+            logger.info(f"📤 Reenviando {len(pendentes)} mensagem(ns) pendente(s) do Teams")
+            self._gravar_pendentes([])
+
+        self._thread = threading.Thread(target=self._trabalhar, name="teams", daemon=True)
+        self._thread.start()
+
+        for mensagem in pendentes:
+            self._enfileirar(mensagem)
+
+    def enviar(self, payload: dict) -> bool:
+        """
+        Coloca o payload na fila e retorna; só espera se a fila estiver cheia.
+        """
+        return self._enfileirar({"payload": payload, "criada": datetime.now().isoformat(timespec="seconds")})
+
+    def encerrar(self, timeout: float = 60) -> int:
+        """
+        Aguarda a fila esvaziar (até `timeout` segundos), grava o que não foi
+        entregue no arquivo de pendentes e retorna quantas mensagens ficaram.
+        """
+        if self._thread is not None:
+            try:
+                self.fila.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+
+            self._thread.join(timeout)
+
+            # Passou do tempo: interrompe as esperas entre tentativas
+            if self._thread.is_alive():
+                self._parar.set()
+                self._thread.join(self.timeout + 1)
+
+        restantes = list(self.falhas)
+
+        while True:
+            try:
+                mensagem = self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if mensagem is not None:
+                restantes.append(mensagem)
+
+        if restantes:
+            self._gravar_pendentes(self._carregar_pendentes() + restantes)
+            logger.warning(f"⚠️ {len(restantes)} mensagem(ns) do Teams não entregue(s), salva(s) em {self.arquivo_pendentes}")
+
+            for mensagem in restantes:
+                self._concluir(mensagem, entregue=False)
+
+        self.sessao.close()
+        return len(restantes)
+
+    def entregar(self, payload: dict) -> bool:
+        """
+        Envia um payload com as repetições configuradas, bloqueando até o fim.
+        """
+        # Serializado uma vez, exatamente como _tamanho_json mede o cartão
+        corpo = json.dumps(payload).encode()
+
+        for tentativa in range(1, self.tentativas + 1):
+            espera = min(self.espera_inicial * 2 ** (tentativa - 1), self.espera_maxima)
+
+            try:
+                with metricas.medir("teams.envio"):
+                    response = self.sessao.post(
+                        self.url,
+                        data=corpo,
+                        headers={"Content-Type": "application/json"},
+                        timeout=self.timeout,
+                    )
+
+                if response.status_code in (200, 202):
+                    return True
+
+                if response.status_code != 429 and response.status_code < 500:
+                    logger.error(f"❌ Erro ao enviar para o Teams: {response.status_code}")
+                    logger.error(f"Resposta: {response.text}")
+                    return False
+
+                # 429: o Teams pode indicar quanto tempo esperar
+                espera = self._retry_after(response, espera)
+                logger.warning(f"⚠️ Teams respondeu {response.status_code} (tentativa {tentativa}/{self.tentativas})")
+
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ Falha de conexão com o Teams (tentativa {tentativa}/{self.tentativas}): {e}")
+
+            metricas.contar("teams.repeticoes")
+
+            if tentativa < self.tentativas and self._parar.wait(espera):
+                break
+
+        return False
+
+    def _enfileirar(self, mensagem: dict) -> bool:
+        try:
+            self.fila.put(mensagem, timeout=self.espera_fila)
+            return True
+        except queue.Full:
+            logger.warning(f"⚠️ Fila do Teams cheia por {self.espera_fila}s. Mensagem salva nos pendentes.")
+            with self.trava:
+                self.falhas.append(mensagem)
+            return False
+
+    def _trabalhar(self):
+        while True:
+            mensagem = self.fila.get()
+
+            if mensagem is None:
+                break
+
+            if self.entregar(mensagem["payload"]):
+                self.entregues += 1
+                metricas.contar("teams.entregues")
+                logger.info("✅ Relatório enviado para o Teams com sucesso!")
+                self._concluir(mensagem, entregue=True)
+            else:
+                metricas.contar("teams.falhas")
+                with self.trava:
+                    self.falhas.append(mensagem)
+
+    def _concluir(self, mensagem: dict, entregue: bool):
+        if self.ao_concluir:
+            try:
+                self.ao_concluir(mensagem, entregue)
+            except Exception as e:
+                logger.warning(f"Erro no retorno do envio ao Teams: {e}")
+
+    def _retry_after(self, response, padrao: float) -> float:
+        # Um Retry-After muito longo não pode segurar o encerramento
+        try:
+            return min(float(response.headers.get("Retry-After", padrao)), self.espera_maxima)
+        except (TypeError, ValueError):
+            return padrao
+
+    def _carregar_pendentes(self) -> list:
+        if not os.path.exists(self.arquivo_pendentes):
+            return []
+
+        try:
+            with open(self.arquivo_pendentes, "r", encoding="utf-8") as f:
+                return json.load(f)
+
+        except Exception as e:
+            logger.warning(f"Arquivo de pendentes do Teams inválido, ignorando: {e}")
+            return []
+
+    def _gravar_pendentes(self, mensagens: list):
+        try:
+            pasta = os.path.dirname(self.arquivo_pendentes)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+
+            temporario = self.arquivo_pendentes + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(mensagens, f, ensure_ascii=False)
+            os.replace(temporario, self.arquivo_pendentes)
+
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar pendentes do Teams: {e}")
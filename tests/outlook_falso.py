@@ -0,0 +1,159 @@
+# ======================== tests/outlook_falso.py ========================
+"""
+Pasta falsa com a interface do Outlook usada pelos testes e pelos
+benchmarks: Items (Restrict, Sort e iteração) e, em PastaTabelaFalsa,
+GetTable (Columns, Sort, EndOfTable e GetArray), Session.GetItemFromID e
+StoreID.
+
+Toda leitura de atributo público (propriedade ou método), a abertura e
+cada avanço das iterações contam como uma ida ao COM no ContadorCOM da
+pasta, que pode simular a latência do Outlook.
+"""
+
+import time
+from datetime import datetime, timezone
+
+class ContadorCOM:
+    def __init__(self, latencia_us: float = 0):
+        self.chamadas = 0
+        self.latencia = latencia_us / 1e6
+
+    def chamar(self):
+        self.chamadas += 1
+        if self.latencia:
+            fim = time.perf_counter() + self.latencia
+            while time.perf_counter() < fim:
+                pass
+
+# Formato de data curto do Windows da pasta falsa (pt-BR, como na produção)
+FORMATO_REGIONAL = "%d/%m/%Y"
+
+def data_do_filtro(filtro: str) -> datetime:
+    """
+    Lê a data de um filtro de Restrict/GetTable como o Outlook: em filtros
+    DASL (@SQL), data ISO em UTC; em filtros Jet, o formato curto regional.
+    """
+    valor = filtro.split("'")[1]
+
+    if filtro.startswith("@SQL="):
+        inicio_utc = datetime.strptime(valor, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+        return inicio_utc.astimezone().replace(tzinfo=None)
+
+    return datetime.strptime(valor.split()[0], FORMATO_REGIONAL)
+
+def filtrar(itens: list, filtro: str) -> list:
+    """
+    Aplica o filtro de data de Restrict/GetTable aos itens.
+    """
+    inicio = data_do_filtro(filtro)
+    return [item for item in itens if item._recebido() >= inicio]
+
+class ObjetoCOM:
+    def __init__(self, contador: ContadorCOM):
+        self._contador = contador
+
+    def __getattribute__(self, nome):
+        if not nome.startswith("_"):
+            object.__getattribute__(self, "_contador").chamar()
+        return object.__getattribute__(self, nome)
+
+class ItemFalso(ObjetoCOM):
+    def __init__(self, contador: ContadorCOM, indice: int, subject: str, recebido: datetime, corpo: str):
+        super().__init__(contador)
+        self.EntryID = f"ID{indice}"
+        self.Subject = subject
+        self.ReceivedTime = recebido
+        self.ConversationID = f"CONV{indice}"
+        self.Replied = False
+        self.Body = corpo
+
+    # Leituras internas da pasta falsa, sem contar
+    def _valor(self, nome: str):
+        return object.__getattribute__(self, nome)
+
+    def _recebido(self) -> datetime:
+        return self._valor("ReceivedTime")
+
+class IteradorFalso:
+    def __init__(self, contador: ContadorCOM, itens: list):
+        self._contador = contador
+        self._itens = iter(itens)
+
+    def __next__(self):
+        self._contador.chamar()
+        return next(self._itens)
+
+class ItensFalsos(ObjetoCOM):
+    def __init__(self, contador: ContadorCOM, itens: list):
+        super().__init__(contador)
+        self._itens = itens
+
+    def Restrict(self, filtro: str):
+        return ItensFalsos(self._contador, filtrar(self._itens, filtro))
+
+    def Sort(self, campo: str, decrescente: bool = False):
+        self._itens.sort(key=lambda item: item._recebido(), reverse=decrescente)
+
+    def __iter__(self):
+        self._contador.chamar()
+        return IteradorFalso(self._contador, self._itens)
+
+class ColunasFalsas(ObjetoCOM):
+    def RemoveAll(self):
+        pass
+
+    def Add(self, coluna: str):
+        pass
+
+class TabelaFalsa(ObjetoCOM):
+    def __init__(self, contador: ContadorCOM, itens: list):
+        super().__init__(contador)
+        self._itens = itens
+        self._posicao = 0
+        self.Columns = ColunasFalsas(contador)
+
+    def Sort(self, campo: str, decrescente: bool = False):
+        self._itens.sort(key=lambda item: item._recebido(), reverse=decrescente)
+
+    @property
+    def EndOfTable(self):
+        return self._posicao >= len(self._itens)
+
+    def GetArray(self, quantidade: int):
+        lote = self._itens[self._posicao:self._posicao + quantidade]
+        self._posicao += len(lote)
+        return [
+            (item._valor("EntryID"), item._valor("Subject"), item._recebido(), item._valor("ConversationID"), None)
+            for item in lote
+        ]
+
+class NamespaceFalso(ObjetoCOM):
+    def __init__(self, contador: ContadorCOM, itens: list):
+        super().__init__(contador)
+        self._por_id = {item._valor("EntryID"): item for item in itens}
+
+    def GetItemFromID(self, entry_id: str, store_id: str = None):
+        return self._por_id[entry_id]
+
+class PastaFalsa(ObjetoCOM):
+    """
+    Pasta só com a coleção Items (sem GetTable), lida item a item.
+    """
+
+    def __init__(self, contador: ContadorCOM, itens: list):
+        super().__init__(contador)
+        self._itens = itens
+        self.StoreID = "STORE"
+        self.Session = NamespaceFalso(contador, itens)
+
+    @property
+    def Items(self):
+        return ItensFalsos(self._contador, list(self._itens))
+
+class PastaTabelaFalsa(PastaFalsa):
+    """
+    A mesma pasta, com GetTable: a coleta passa a usar LeitorTabelaOutlook.
+    """
+
+    def GetTable(self, filtro: str, tipo: int = 0):
+        return TabelaFalsa(self._contador, filtrar(self._itens, filtro))
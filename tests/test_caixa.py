@@ -0,0 +1,83 @@
+# ======================== tests/test_caixa.py ========================
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import metricas
+from caixa import CaixaCorreio, LeitorItens, LeitorTabelaOutlook, criar_leitor
+from outlook_falso import ContadorCOM, ItemFalso, PastaFalsa, PastaTabelaFalsa
+
+HOJE = datetime(2026, 3, 10, 18, 0)
+
+def item(contador: ContadorCOM, indice: int, recebido: datetime) -> ItemFalso:
+    if indice % 5 == 0:
+        return ItemFalso(contador, indice, f"VALIDAÇÃO CORREIOS - CLI-{indice}", recebido, "TOTAL: 1")
+    return ItemFalso(contador, indice, f"Assunto {indice}", recebido, "Texto")
+
+def gerar_itens(contador: ContadorCOM, hoje: int = 200, anteriores: int = 300) -> list:
+    itens = [item(contador, indice, HOJE - timedelta(minutes=indice)) for indice in range(hoje)]
+    itens += [item(contador, hoje + indice, HOJE - timedelta(days=1 + indice % 20)) for indice in range(anteriores)]
+    return itens
+
+def ler(pasta, contador: ContadorCOM) -> tuple:
+    """
+    Coleta os e-mails do dia e o corpo dos de VALIDAÇÃO; retorna os
+    registros, as idas ao COM da pasta falsa e as contadas em metricas.
+    """
+    metricas.reiniciar()
+    contador.chamadas = 0
+
+    leitor = criar_leitor(pasta)
+    registros = list(leitor.emails_do_dia(HOJE.date()))
+    corpos = [registro.body for registro in registros if registro.subject.startswith("VALIDAÇÃO")]
+
+    contadas = metricas.resumo()["contadores"].get("com.leitura.chamadas", 0)
+    return leitor, registros, corpos, contador.chamadas, contadas
+
+def test_contador_igual_as_idas_ao_com():
+    contador = ContadorCOM()
+    itens = gerar_itens(contador)
+
+    leitor_itens, registros_itens, corpos_itens, chamadas_itens, contadas_itens = ler(PastaFalsa(contador, itens), contador)
+    leitor_tabela, registros_tabela, corpos_tabela, chamadas_tabela, contadas_tabela = ler(
+        PastaTabelaFalsa(contador, itens), contador
+    )
+
+    assert isinstance(leitor_itens, LeitorItens)
+    assert isinstance(leitor_tabela, LeitorTabelaOutlook)
+
+    assert contadas_itens == chamadas_itens
+    assert contadas_tabela == chamadas_tabela
+
+    # Mesmos e-mails nos dois leitores, com bem menos idas ao COM pela Table
+    assert [registro.entry_id for registro in registros_itens] == [registro.entry_id for registro in registros_tabela]
+    assert len(registros_itens) == 200
+    assert corpos_itens == corpos_tabela == ["TOTAL: 1"] * 40
+    assert chamadas_tabela * 5 < chamadas_itens
+
+@pytest.mark.parametrize("hoje", [datetime(2026, 3, 5, 18, 0), datetime(2026, 3, 20, 18, 0)])
+@pytest.mark.parametrize("classe_pasta", [PastaFalsa, PastaTabelaFalsa])
+def test_filtro_de_data_independe_do_formato_regional(hoje, classe_pasta):
+    # Dia 5/3: num filtro Jet em pt-BR viraria 3/5 e nenhum e-mail do dia seria lido
+    contador = ContadorCOM()
+    itens = [item(contador, indice, hoje - timedelta(minutes=indice)) for indice in range(50)]
+    itens += [item(contador, 50 + indice, hoje - timedelta(days=1 + indice)) for indice in range(40)]
+
+    registros = list(criar_leitor(classe_pasta(contador, itens)).emails_do_dia(hoje.date()))
+
+    assert len(registros) == 50
+    assert {registro.received_time.date() for registro in registros} == {hoje.date()}
+
+def test_interfaces_abstratas():
+    with pytest.raises(TypeError):
+        CaixaCorreio()
+
+    class CaixaIncompleta(CaixaCorreio):
+        nome = "Incompleta"
+
+        def pasta_padrao(self):
+            return None
+
+    with pytest.raises(TypeError):
+        CaixaIncompleta()
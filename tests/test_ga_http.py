@@ -0,0 +1,183 @@
+# ======================== tests/test_ga_http.py ========================
+
+import io
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from openpyxl import Workbook
+
+from ga import CacheRelatoriosGA, ExtratorGAHttp
+
+EMAIL = "rpa@empresa.com"
+SENHA = "segredo"
+
+# Colunas A a G do relatório "Arquivos Processados"
+LINHAS_RELATORIO = [
+    (1, "x", "ELO-RE_KIT_01.txt", "a.txt", 5, "f", "ENTREGUE"),
+    (2, "x", "ELO-RE_02.txt", "b.txt", 7, "f", "entregue"),
+    (3, "x", "ELO-RE_03.txt", "c.SD1", 11, "f", "ENTREGUE"),
+    (4, "x", "ELO-RE_04.txt", "d.txt", 13, "f", "PENDENTE"),
+    (5, "x", "CLI-A_05.txt", "e.txt", 17, "f", "ENTREGUE"),
+]
+
+def planilha(termo: str) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list("ABCDEFG"))
+    for linha in LINHAS_RELATORIO:
+        if termo.upper() in linha[2].upper():
+            ws.append(linha)
+    conteudo = io.BytesIO()
+    wb.save(conteudo)
+    return conteudo.getvalue()
+
+class GAFalso(BaseHTTPRequestHandler):
+    """
+    Imita o GA (Laravel + Yajra DataTables): sem sessão autenticada, tudo
+    redireciona para /login, cujo formulário traz o _token da sessão; a
+    exportação é a própria página com action=excel.
+    """
+
+    sessoes = {}  # id da sessão -> {"token": ..., "autenticada": bool}
+    exportacoes = []
+
+    def _sessao(self):
+        match = re.search(r"sessao=(\w+)", self.headers.get("Cookie", ""))
+        if match and match.group(1) in self.sessoes:
+            return match.group(1), self.sessoes[match.group(1)]
+
+        id_sessao = secrets.token_hex(8)
+        self.sessoes[id_sessao] = {"token": secrets.token_hex(8), "autenticada": False}
+        return id_sessao, self.sessoes[id_sessao]
+
+    def _responder(self, status: int, id_sessao: str, corpo: bytes = b"", tipo: str = "text/html", local: str = None):
+        self.send_response(status)
+        self.send_header("Set-Cookie", f"sessao={id_sessao}; Path=/")
+        if local:
+            self.send_header("Location", local)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        id_sessao, sessao = self._sessao()
+        url = urlsplit(self.path)
+
+        if url.path == "/login":
+            formulario = (
+                '<html><body><section id="login"><form method="POST" action="/login">'
+                f'<input type="hidden" name="_token" value="{sessao["token"]}">'
+                '<input name="email"><input name="password" type="password"><button>Entrar</button>'
+                "</form></section></body></html>"
+            )
+            return self._responder(200, id_sessao, formulario.encode())
+
+        if not sessao["autenticada"]:
+            return self._responder(302, id_sessao, local="/login")
+
+        parametros = parse_qs(url.query)
+        if parametros.get("action") == ["excel"]:
+            termo = parametros.get("search[value]", [""])[0]
+            self.exportacoes.append(termo)
+            tipo = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            return self._responder(200, id_sessao, planilha(termo), tipo)
+
+        self._responder(200, id_sessao, b"<html><body><table id='dataTableBuilder'></table></body></html>")
+
+    def do_POST(self):
+        id_sessao, sessao = self._sessao()
+        tamanho = int(self.headers.get("Content-Length", 0))
+        dados = {chave: valor[0] for chave, valor in parse_qs(self.rfile.read(tamanho).decode()).items()}
+
+        if self.path != "/login" or dados.get("_token") != sessao["token"]:
+            # Laravel: token CSRF inválido
+            return self._responder(419, id_sessao, b"Page Expired")
+
+        if dados.get("email") == EMAIL and dados.get("password") == SENHA:
+            sessao["autenticada"] = True
+            return self._responder(302, id_sessao, local="/")
+
+        self._responder(302, id_sessao, local="/login")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def servidor():
+    GAFalso.sessoes.clear()
+    GAFalso.exportacoes.clear()
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), GAFalso)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{srv.server_port}/"
+
+    srv.shutdown()
+    srv.server_close()
+
+def criar_extrator(url: str, pasta, senha: str = SENHA, cache: CacheRelatoriosGA = None) -> ExtratorGAHttp:
+    extrator = ExtratorGAHttp(url, str(pasta), email=EMAIL, senha=senha, cache=cache)
+    extrator.inicializar_driver()
+    return extrator
+
+def test_login_e_exportacao(servidor, tmp_path):
+    extrator = criar_extrator(servidor, tmp_path)
+
+    assert extrator.fazer_login()
+
+    # ENTREGUE, sem .SD1: ELO-RE_KIT_01 (5) e ELO-RE_02 (7)
+    assert extrator._baixar_relatorio("ELO-RE") == {"total": 12, "total_kit": 5, "total_sem_kit": 7}
+    assert GAFalso.exportacoes == ["ELO-RE"]
+
+    # Nada é gravado na pasta de download
+    assert list(tmp_path.iterdir()) == []
+    extrator.fechar()
+
+def test_extrair_relatorio_cliente_reaproveita_o_download(servidor, tmp_path):
+    extrator = criar_extrator(servidor, tmp_path)
+    assert extrator.fazer_login()
+
+    assert extrator.extrair_relatorio_cliente("ALELO-KIT") == {"total": 5}
+    assert extrator.extrair_relatorio_cliente("ALELO") == {"total": 7}
+    assert extrator.extrair_relatorio_cliente("CLI-A") == {"total": 17}
+    assert GAFalso.exportacoes == ["ELO-RE", "CLI-A"]
+    extrator.fechar()
+
+def test_senha_errada(servidor, tmp_path):
+    extrator = criar_extrator(servidor, tmp_path, senha="errada")
+
+    assert not extrator.fazer_login()
+    extrator.fechar()
+
+def test_sessao_expirada(servidor, tmp_path):
+    extrator = criar_extrator(servidor, tmp_path)
+    assert extrator.fazer_login()
+
+    GAFalso.sessoes.clear()
+
+    # Redirecionado ao formulário de login (HTML) em vez da planilha
+    assert extrator._baixar_relatorio("ELO-RE") is None
+    extrator.fechar()
+
+def test_exportacao_unica_usa_o_cache(servidor, tmp_path):
+    clientes = ["ALELO", "ALELO-KIT", "CLI-A"]
+    esperado = {"ALELO": 7, "ALELO-KIT": 5, "CLI-A": 17}
+
+    extrator = criar_extrator(servidor, tmp_path, cache=CacheRelatoriosGA(str(tmp_path / "cache")))
+    assert extrator.fazer_login()
+    assert extrator.extrair_relatorio_geral(clientes) == esperado
+    assert GAFalso.exportacoes == [""]
+    extrator.fechar()
+
+    # Próxima execução: todos os termos vêm do cache em disco, sem exportação
+    extrator = criar_extrator(servidor, tmp_path, cache=CacheRelatoriosGA(str(tmp_path / "cache")))
+    assert extrator.fazer_login()
+    assert extrator.extrair_relatorio_geral(clientes) == esperado
+    assert extrator.extrair_relatorio_cliente("CLI-A") == {"total": 17}
+    assert GAFalso.exportacoes == [""]
+    extrator.fechar()
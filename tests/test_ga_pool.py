@@ -0,0 +1,124 @@
+# ======================== tests/test_ga_pool.py ========================
+
+import queue
+import threading
+import time
+
+import pytest
+
+from caixa_local import CaixaMaildir
+from checkpoint import Checkpoint
+from ga import CacheRelatoriosGA, ExtratorGA, PoolExtratoresGA
+import main
+from test_respostas import gravar_email
+
+TOTAIS = {
+    "ELO-RE": {"total": 12, "total_kit": 5, "total_sem_kit": 7},
+    "CLI-A": {"total": 17, "total_kit": 0, "total_sem_kit": 17},
+}
+
+class ExtratorFalso(ExtratorGA):
+    """
+    ExtratorGA sem navegador: o "download" de cada termo é registrado e
+    termos fora de TOTAIS falham.
+    """
+
+    downloads = []
+    trava = threading.Lock()
+
+    def inicializar_driver(self) -> bool:
+        return True
+
+    def fazer_login(self) -> bool:
+        return True
+
+    def _baixar_relatorio(self, termo_busca: str, leitor=None) -> dict:
+        with self.trava:
+            self.downloads.append(termo_busca)
+        time.sleep(0.05)
+        return TOTAIS.get(termo_busca)
+
+    def fechar(self):
+        pass
+
+@pytest.fixture
+def pool(tmp_path):
+    ExtratorFalso.downloads = []
+    return PoolExtratoresGA(
+        "http://ga", str(tmp_path), tamanho=2, classe_extrator=ExtratorFalso, email="rpa", senha="x"
+    )
+
+def test_extrair_lista_as_falhas(pool):
+    concluidos = {}
+    resultados = pool.extrair(["CLI-A", "CLI-B", "ALELO"], ao_concluir=concluidos.__setitem__)
+
+    assert resultados == {"CLI-A": 17, "CLI-B": 0, "ALELO": 7}
+    assert pool.falhas == ["CLI-B"]
+    assert concluidos == {"CLI-A": 17, "ALELO": 7}
+
+def test_extrair_fila_lista_as_falhas(pool):
+    fila = queue.Queue()
+    for cliente in ("CLI-B", "CLI-A", None):
+        fila.put(cliente)
+
+    assert pool.iniciar()
+    assert pool.extrair_fila(fila) == {"CLI-B": 0, "CLI-A": 17}
+    assert pool.falhas == ["CLI-B"]
+
+def test_termo_baixado_uma_vez_com_atualizar_ga(tmp_path):
+    ExtratorFalso.downloads = []
+    cache = CacheRelatoriosGA(str(tmp_path / "cache"), forcar_atualizacao=True)
+    pool = PoolExtratoresGA(
+        "http://ga", str(tmp_path), tamanho=2, classe_extrator=ExtratorFalso, email="rpa", senha="x", cache=cache
+    )
+
+    # Cada sessão pega um dos clientes; ambos dependem do relatório ELO-RE
+    fila = queue.Queue()
+    for cliente in ("ALELO", "ALELO-KIT", None):
+        fila.put(cliente)
+
+    assert pool.iniciar()
+    assert pool.extrair_fila(fila) == {"ALELO": 7, "ALELO-KIT": 5}
+    assert ExtratorFalso.downloads == ["ELO-RE"]
+
+def test_falhas_ficam_fora_do_checkpoint(tmp_path):
+    checkpoint = Checkpoint(pasta=str(tmp_path))
+    main.salvar_resultados_ga(checkpoint, {"CLI-A": 17, "CLI-B": 0}, ["CLI-B"])
+
+    # O --resume busca de novo apenas quem falhou
+    retomado = Checkpoint(pasta=str(tmp_path), retomar=True)
+    assert not retomado.concluida("resultados_ga")
+    assert retomado.obter("resultados_ga") == {"CLI-A": 17}
+
+    main.salvar_resultados_ga(retomado, {"CLI-A": 17, "CLI-B": 3}, [])
+    assert Checkpoint(pasta=str(tmp_path), retomar=True).concluida("resultados_ga")
+
+def test_pipeline_retoma_clientes_do_checkpoint(tmp_path, monkeypatch):
+    ExtratorFalso.downloads = []
+    raiz = tmp_path / "caixa"
+    gravar_email(raiz, "1", "VALIDAÇÃO CORREIOS - CLI-A", "12345678 CONTRATO CLI-A 17\nTOTAL: 17")
+    gravar_email(raiz, "2", "VALIDAÇÃO CORREIOS - CLI-B", "87654321 CONTRATO CLI-B 9\nTOTAL: 9")
+
+    # Execução interrompida: CLI-B já extraído, e-mails ainda não gravados
+    Checkpoint(pasta=str(tmp_path)).atualizar("resultados_ga", "CLI-B", 9)
+    checkpoint = Checkpoint(pasta=str(tmp_path), retomar=True)
+
+    monkeypatch.setattr(main, "criar_caixa", lambda args: CaixaMaildir(str(raiz)))
+    monkeypatch.setattr(main, "criar_pool_ga", lambda qtd_clientes, args: PoolExtratoresGA(
+        "http://ga", str(tmp_path), tamanho=2, classe_extrator=ExtratorFalso, email="rpa", senha="x"
+    ))
+
+    emails, resultados_ga, falhas = main.coletar_e_extrair_em_paralelo(None, checkpoint)
+
+    assert sorted(email["Cliente"] for email in emails) == ["CLI-A", "CLI-B"]
+    assert resultados_ga == {"CLI-A": 17, "CLI-B": 9}
+    assert falhas == []
+    assert ExtratorFalso.downloads == ["CLI-A"]
+
+def test_cache_somente_leitura_na_simulacao(tmp_path):
+    cache = CacheRelatoriosGA(str(tmp_path / "cache"), somente_leitura=True)
+    cache.salvar("CLI-A", TOTAIS["CLI-A"])
+
+    # Disponível na execução, mas nada gravado em disco
+    assert cache.obter("CLI-A") == TOTAIS["CLI-A"]
+    assert not (tmp_path / "cache").exists()
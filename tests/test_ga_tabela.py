@@ -0,0 +1,128 @@
+# ======================== tests/test_ga_tabela.py ========================
+
+import pathlib
+import time
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from ga import (
+    ID_INFO_TABELA,
+    ID_PROCESSANDO_TABELA,
+    SELETOR_LINHAS_TABELA,
+    SELETOR_PESQUISA_TABELA,
+    TabelaEstavel,
+    esperar_ate,
+)
+
+PAGINA = pathlib.Path(__file__).parent / "paginas" / "tabela_ga.html"
+
+class ElementoFalso:
+    def __init__(self, texto: str = "", visivel: bool = True):
+        self.text = texto
+        self.visivel = visivel
+
+    def is_displayed(self):
+        return self.visivel
+
+class DriverFalso:
+    """
+    Mesma linha do tempo de paginas/tabela_ga.html: a busca dispara
+    `atraso` segundos após a digitação, o processamento dura `processo`
+    segundos e a página mostra no máximo 10 linhas.
+    """
+
+    def __init__(self, atraso: float = 0.4, processo: float = 0.3, api: bool = False):
+        self.atraso = atraso
+        self.processo = processo
+        self.api = api
+        self.digitado_em = None
+        self.termo = ""
+        self.registros = [["ELO-RE_", "CLI-A_", "OUTRO_"][i % 3] + f"{i}.xlsx" for i in range(60)]
+
+    def digitar(self, termo: str):
+        self.termo = termo
+        self.digitado_em = time.monotonic()
+
+    def _fase(self) -> str:
+        if self.digitado_em is None:
+            return "inicial"
+        decorrido = time.monotonic() - self.digitado_em
+        if decorrido < self.atraso:
+            return "inicial"
+        if decorrido < self.atraso + self.processo:
+            return "processando"
+        return "filtrada"
+
+    def _filtrados(self) -> list:
+        termo = self.termo if self._fase() == "filtrada" else ""
+        return [r for r in self.registros if termo.upper() in r.upper()]
+
+    def find_elements(self, por, seletor):
+        if (por, seletor) == (By.ID, ID_PROCESSANDO_TABELA):
+            return [ElementoFalso(visivel=self._fase() == "processando")]
+        if (por, seletor) == (By.ID, ID_INFO_TABELA):
+            filtrados = self._filtrados()
+            return [ElementoFalso(f"Mostrando 1 a {min(10, len(filtrados))} de {len(filtrados)} registros")]
+        if (por, seletor) == (By.CSS_SELECTOR, SELETOR_LINHAS_TABELA):
+            return [ElementoFalso(r) for r in self._filtrados()[:10]]
+        return []
+
+    def execute_script(self, script):
+        if not self.api:
+            return None
+        return self.termo if self._fase() != "inicial" else ""
+
+@pytest.mark.parametrize("api", [False, True])
+def test_espera_a_busca_mesmo_com_a_pagina_cheia(api):
+    driver = DriverFalso(api=api)
+    condicao = TabelaEstavel(driver, "ELO-RE")
+    driver.digitar("ELO-RE")
+
+    valor, decorrido = esperar_ate(condicao, timeout=5, intervalo=0.05)
+
+    # 10 linhas antes e depois da busca: só a evidência da busca impede o retorno antecipado
+    assert valor
+    assert decorrido >= driver.atraso + driver.processo
+    assert all("ELO-RE" in linha.text for linha in driver.find_elements(By.CSS_SELECTOR, SELETOR_LINHAS_TABELA))
+
+def test_sem_evidencia_da_busca_nao_conclui():
+    driver = DriverFalso()
+    condicao = TabelaEstavel(driver, "ELO-RE")
+
+    # O termo nunca chega à tabela: linhas estáveis não bastam
+    valor, _ = esperar_ate(condicao, timeout=0.5, intervalo=0.05)
+
+    assert valor is None
+
+@pytest.fixture(scope="module")
+def navegador():
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        opcoes = Options()
+        opcoes.add_argument("--headless")
+        opcoes.add_argument("--no-sandbox")
+        driver = webdriver.Chrome(options=opcoes)
+    except Exception as e:
+        pytest.skip(f"Chrome indisponível: {e}")
+
+    yield driver
+    driver.quit()
+
+@pytest.mark.parametrize("api", [False, True])
+def test_pagina_do_ga(navegador, api):
+    navegador.get(PAGINA.as_uri() + ("?api=1" if api else ""))
+
+    campo = navegador.find_element(By.CSS_SELECTOR, SELETOR_PESQUISA_TABELA)
+    condicao = TabelaEstavel(navegador, "ELO-RE")
+    campo.send_keys("ELO-RE")
+
+    valor, decorrido = esperar_ate(condicao, timeout=10, intervalo=0.05)
+
+    assert valor
+    assert decorrido >= 0.4
+    linhas = navegador.find_elements(By.CSS_SELECTOR, SELETOR_LINHAS_TABELA)
+    assert linhas and all("ELO-RE" in linha.text for linha in linhas)
+    assert "filtrado" in navegador.find_element(By.ID, ID_INFO_TABELA).text
@@ -0,0 +1,55 @@
+# ======================== tests/test_modelos.py ========================
+
+import pytest
+
+from modelos import AMOSTRA_VALIDACAO, RenderizadorRespostas, compilar_modelo
+
+VALIDACAO = dict(AMOSTRA_VALIDACAO, Cliente="ABC-1 <&>", Total_Exibicao=16, Total_GA=16, Qtd_Emails=2)
+
+def gravar_modelo(pasta, nome: str, texto: str):
+    (pasta / nome).write_text(texto, encoding="utf-8")
+
+@pytest.mark.parametrize("modelo", [
+    "Bom dia,\n\n{Cliente}: {Total_Exibicao} e-mail(s) x {Total_GA} no GA.\n\nAtt.",
+    "{{literal}} {Cliente!r} {Cliente!s:>12} {Total_GA:05d} {Total_GA:,} {Cliente[0]} {Status!a}",
+    "{Total_GA:>{Qtd_Emails}}|{Cliente.lower}",
+    "",
+    "sem campos",
+])
+def test_mesmo_texto_que_format_map(modelo):
+    assert compilar_modelo(modelo).renderizar(VALIDACAO) == modelo.format_map(VALIDACAO)
+
+def test_spec_invalido_falha_na_carga(tmp_path):
+    gravar_modelo(tmp_path, "ok.txt", "Total: {Total_GA:zz}")
+
+    with pytest.raises(ValueError, match="ok.txt"):
+        RenderizadorRespostas(str(tmp_path))
+
+def test_spec_numerico_falha_na_carga_com_html(tmp_path):
+    # Na variante HTML os valores chegam escapados como texto: ':d' só serve ao .txt
+    gravar_modelo(tmp_path, "ok.txt", "Total: {Total_GA:d}")
+
+    texto, corpo_html = RenderizadorRespostas(str(tmp_path)).renderizar(VALIDACAO)
+    assert texto == "Total: 16"
+    assert corpo_html is None
+
+    with pytest.raises(ValueError, match="ok.html"):
+        RenderizadorRespostas(str(tmp_path), html=True)
+
+def test_campo_desconhecido_falha_na_carga(tmp_path):
+    gravar_modelo(tmp_path, "ABC-1.ok.txt", "Total: {Total}")
+
+    with pytest.raises(ValueError, match="campos desconhecidos: Total"):
+        RenderizadorRespostas(str(tmp_path))
+
+def test_modelo_por_cliente_e_html(tmp_path):
+    gravar_modelo(tmp_path, "ABC-1.ok.txt", "Cliente {Cliente}\n\n{Qtd_Emails} e-mail(s) <{Origem}>")
+
+    renderizador = RenderizadorRespostas(str(tmp_path), html=True)
+    validacao = dict(VALIDACAO, Cliente="abc-1", Origem="E-mail & GA")
+
+    assert renderizador.renderizar(validacao) == (
+        "Cliente abc-1\n\n2 e-mail(s) <E-mail & GA>",
+        "<p>Cliente abc-1</p>\n<p>2 e-mail(s) &lt;E-mail &amp; GA&gt;</p>",
+    )
+    assert renderizador.renderizar(VALIDACAO)[0].startswith("Bom dia,")
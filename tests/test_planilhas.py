@@ -0,0 +1,27 @@
+# ======================== tests/test_planilhas.py ========================
+
+import json
+
+from planilhas import GerenciadorPlanilhas
+
+def validacao(indice: int) -> dict:
+    divergente = indice % 2 == 0
+    return {
+        "Cliente": f"CLIENTE-ÇÃO-{indice:05d}",
+        "Total_Exibicao": 1000 + indice,
+        "Total_GA": 999 + indice if divergente else 1000 + indice,
+        "Status": "✗ DIVERGÊNCIA" if divergente else "✓ OK",
+        "Metodo_Validacao": "SOMA" if indice % 3 == 0 else "TOTAL",
+    }
+
+def test_cartoes_dentro_do_limite():
+    dados_validacao = [validacao(indice) for indice in range(3000)]
+
+    payloads = GerenciadorPlanilhas.montar_payloads_teams(dados_validacao, tamanho_maximo=24000, limite_ok=3000)
+
+    # Tamanho medido sobre o corpo exatamente como é enviado ao webhook
+    assert len(payloads) > 1
+    assert all(len(json.dumps(payload).encode()) <= 24000 for payload in payloads)
+
+    fatos = [fato for payload in payloads for fato in payload["attachments"][0]["content"]["body"][2]["items"][0]["facts"]]
+    assert len(fatos) == 3000
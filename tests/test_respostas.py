@@ -0,0 +1,106 @@
+# ======================== tests/test_respostas.py ========================
+
+import argparse
+import os
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+
+import pytest
+
+from caixa_local import CaixaMaildir, PastaLocal
+from checkpoint import Checkpoint
+from emails import ColetorEmails
+from planilhas import GerenciadorPlanilhas
+from respostas import RespostorEmails
+
+PASTA = "Processamento Correios"
+PROCESSADOS = "Correios Processados"
+
+def gravar_email(raiz, nome: str, subject: str, corpo: str):
+    mensagem = EmailMessage()
+    mensagem["From"] = "cliente@exemplo.com"
+    mensagem["To"] = "rpa@empresa.com"
+    mensagem["Subject"] = subject
+    mensagem["Date"] = format_datetime(datetime.now().astimezone())
+    mensagem["Message-ID"] = make_msgid()
+    mensagem.set_content(corpo)
+
+    caminho = os.path.join(raiz, PASTA, "cur", f"{nome}.eml:2,")
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "wb") as f:
+        f.write(mensagem.as_bytes())
+
+def processar(raiz, resultados_ga: dict):
+    coletor = ColetorEmails(PASTA, caixa=CaixaMaildir(raiz))
+    assert coletor.conectar()
+    emails = coletor.buscar_emails_do_dia()
+    dados_validacao = GerenciadorPlanilhas.gerar_dados_validacao(emails, resultados_ga)
+
+    respostor = RespostorEmails(PASTA, PROCESSADOS, caixa=CaixaMaildir(raiz))
+    assert respostor.conectar()
+
+    respondidos = []
+    plano = respostor.responder_emails(dados_validacao, ao_responder=respondidos.append)
+    return plano, respondidos
+
+@pytest.fixture
+def raiz(tmp_path):
+    gravar_email(tmp_path, "1", "VALIDAÇÃO CORREIOS - ABC-1", "12345678 CONTRATO ABC-1 15\nTOTAL: 15")
+    gravar_email(tmp_path, "2", "VALIDAÇÃO CORREIOS - ABC-1", "87654321 CONTRATO ABC-1 1\nTOTAL: 1")
+    gravar_email(tmp_path, "3", "VALIDAÇÃO CORREIOS - XYZ-2", "11223344 CONTRATO XYZ-2 4\nTOTAL: 4")
+    return str(tmp_path)
+
+def test_responde_e_move_todos_os_emails_somados(raiz):
+    # ABC-1: dois e-mails (15 + 1) validados juntos contra o GA (16)
+    plano, respondidos = processar(raiz, {"ABC-1": 16, "XYZ-2": 4})
+
+    assert sorted(acao["cliente"] for acao in plano) == ["ABC-1", "ABC-1", "XYZ-2"]
+    assert all(acao["resposta"] == "enviada" and acao["movido"] for acao in plano)
+    assert sorted(respondidos) == ["ABC-1", "XYZ-2"]
+
+    assert PastaLocal(os.path.join(raiz, PASTA)).arquivos() == []
+    assert len(PastaLocal(os.path.join(raiz, PROCESSADOS)).arquivos()) == 3
+    assert len(PastaLocal(os.path.join(raiz, "Itens Enviados")).arquivos()) == 3
+
+def test_divergencia_nao_responde(raiz):
+    plano, respondidos = processar(raiz, {"ABC-1": 15, "XYZ-2": 4})
+
+    assert [acao["cliente"] for acao in plano] == ["XYZ-2"]
+    assert respondidos == ["XYZ-2"]
+    assert len(PastaLocal(os.path.join(raiz, PASTA)).arquivos()) == 2
+
+def test_simulacao_sem_efeitos(raiz, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "criar_enviador_teams", lambda: pytest.fail("Teams criado na simulação"))
+
+    # Execução anterior interrompida depois do GA
+    Checkpoint(pasta="resultados").salvar("resultados_ga", {"ABC-1": 16, "XYZ-2": 4})
+    arquivo_checkpoint = tmp_path / "resultados" / os.path.basename(Checkpoint(pasta="resultados").arquivo)
+    conteudo_checkpoint = arquivo_checkpoint.read_bytes()
+
+    main.main(argparse.Namespace(atualizar_ga=False, resume=True, pipeline=False, caixa_local=raiz, simular=True))
+
+    # Nada enviado, movido ou criado na caixa; checkpoint e caches intocados
+    assert len(PastaLocal(os.path.join(raiz, PASTA)).arquivos()) == 3
+    assert not os.path.exists(os.path.join(raiz, PROCESSADOS))
+    assert not os.path.exists(os.path.join(raiz, "Itens Enviados"))
+    assert arquivo_checkpoint.read_bytes() == conteudo_checkpoint
+    assert not (tmp_path / "cache").exists()
+    assert not (tmp_path / "resultados" / "teams_pendentes.json").exists()
+
+def test_plano_simulado_nao_cria_pasta(raiz):
+    respostor = RespostorEmails(PASTA, PROCESSADOS, caixa=CaixaMaildir(raiz), simular=True)
+    assert respostor.conectar()
+
+    coletor = ColetorEmails(PASTA, caixa=CaixaMaildir(raiz))
+    assert coletor.conectar()
+    dados_validacao = GerenciadorPlanilhas.gerar_dados_validacao(coletor.buscar_emails_do_dia(), {"ABC-1": 16, "XYZ-2": 4})
+
+    plano = respostor.responder_emails(dados_validacao)
+
+    assert sorted(acao["cliente"] for acao in plano) == ["ABC-1", "ABC-1", "XYZ-2"]
+    assert all(acao["destino"] == PROCESSADOS and acao["resposta"] is None for acao in plano)
+    assert not os.path.exists(os.path.join(raiz, PROCESSADOS))
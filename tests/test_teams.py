@@ -0,0 +1,115 @@
+# ======================== tests/test_teams.py ========================
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from teams import EnviadorTeams
+
+class WebhookFalso(BaseHTTPRequestHandler):
+    """
+    Imita o webhook do Teams: responde na ordem os códigos de `roteiro`
+    (202 quando acaba) e guarda os corpos recebidos.
+    """
+
+    roteiro = []
+    retry_after = "0.1"
+    atraso = 0
+    recebidos = []
+
+    def do_POST(self):
+        corpo = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.atraso)
+        status = self.roteiro.pop(0) if self.roteiro else 202
+        self.recebidos.append((status, json.loads(corpo)))
+
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", self.retry_after)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def webhook():
+    WebhookFalso.roteiro = []
+    WebhookFalso.retry_after = "0.1"
+    WebhookFalso.atraso = 0
+    WebhookFalso.recebidos = []
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), WebhookFalso)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{srv.server_port}/"
+
+    srv.shutdown()
+    srv.server_close()
+
+def criar_enviador(url: str, pasta, **kwargs) -> EnviadorTeams:
+    kwargs.setdefault("espera_inicial", 0.05)
+    return EnviadorTeams(url, str(pasta / "pendentes.json"), **kwargs)
+
+def test_repete_429_e_5xx(webhook, tmp_path):
+    WebhookFalso.roteiro = [429, 503, 500]
+    concluidas = []
+
+    enviador = criar_enviador(webhook, tmp_path, ao_concluir=lambda mensagem, entregue: concluidas.append(entregue))
+    enviador.iniciar()
+
+    inicio = time.perf_counter()
+    assert enviador.enviar({"texto": "a"})
+    assert time.perf_counter() - inicio < 0.05
+
+    assert enviador.encerrar(5) == 0
+    assert [status for status, _ in WebhookFalso.recebidos] == [429, 503, 500, 202]
+    assert concluidas == [True]
+    assert not (tmp_path / "pendentes.json").exists()
+
+def test_pendentes_reenviados_na_proxima_execucao(webhook, tmp_path):
+    WebhookFalso.roteiro = [500] * 3
+
+    enviador = criar_enviador(webhook, tmp_path, tentativas=3)
+    enviador.iniciar()
+    enviador.enviar({"texto": "b"})
+    assert enviador.encerrar(5) == 1
+
+    pendentes = json.loads((tmp_path / "pendentes.json").read_text(encoding="utf-8"))
+    assert [mensagem["payload"] for mensagem in pendentes] == [{"texto": "b"}]
+
+    WebhookFalso.recebidos.clear()
+    enviador = criar_enviador(webhook, tmp_path)
+    enviador.iniciar()
+    assert enviador.encerrar(5) == 0
+
+    assert WebhookFalso.recebidos == [(202, {"texto": "b"})]
+    assert json.loads((tmp_path / "pendentes.json").read_text(encoding="utf-8")) == []
+
+def test_retry_after_limitado_pela_espera_maxima(webhook, tmp_path):
+    WebhookFalso.roteiro = [429]
+    WebhookFalso.retry_after = "3600"
+
+    enviador = criar_enviador(webhook, tmp_path, espera_maxima=0.2)
+    enviador.iniciar()
+    enviador.enviar({"texto": "c"})
+
+    inicio = time.perf_counter()
+    assert enviador.encerrar(5) == 0
+    assert time.perf_counter() - inicio < 2
+    assert [status for status, _ in WebhookFalso.recebidos] == [429, 202]
+
+def test_fila_cheia_espera_em_vez_de_descartar(webhook, tmp_path):
+    # Relatório em mais cartões que a fila comporta, com o webhook lento
+    WebhookFalso.atraso = 0.02
+
+    enviador = criar_enviador(webhook, tmp_path, tamanho_fila=2)
+    enviador.iniciar()
+
+    assert all([enviador.enviar({"parte": parte}) for parte in range(8)])
+    assert enviador.encerrar(5) == 0
+    assert [corpo for _, corpo in WebhookFalso.recebidos] == [{"parte": parte} for parte in range(8)]
+    assert not (tmp_path / "pendentes.json").exists()
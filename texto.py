@@ -0,0 +1,89 @@
+# ======================== texto.py ========================
+
+from functools import lru_cache
+import re
+import unicodedata
+
+def _montar_tabela_acentos() -> dict:
+    """
+    Tabela para str.translate que remove acentos dos caracteres latinos
+    mais comuns (Latin-1 e Latin Extended-A) e descarta marcas combinantes.
+    """
+    tabela = {}
+
+    for codigo in range(0x00C0, 0x0180):
+        char = chr(codigo)
+        base = ''.join(c for c in unicodedata.normalize('NFD', char) if unicodedata.category(c) != 'Mn')
+        if base != char:
+            tabela[codigo] = base
+
+    for codigo in range(0x0300, 0x0370):
+        tabela[codigo] = None
+
+    return tabela
+
+_TABELA_ACENTOS = _montar_tabela_acentos()
+
+def normalizar_texto(texto: str) -> str:
+    sem_acentos = texto.translate(_TABELA_ACENTOS)
+
+    # Caracteres fora da tabela: cai no caminho completo via NFD
+    if not sem_acentos.isascii():
+        nfd = unicodedata.normalize('NFD', sem_acentos)
+        sem_acentos = ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+
+    return sem_acentos.upper()
+
+class ClassificadorAssunto:
+    """
+    Classifica assuntos de e-mail. As variações de "VALIDAÇÃO" são
+    normalizadas uma única vez e compiladas em uma só expressão, e os
+    resultados ficam em cache pelo assunto original.
+    """
+
+    # Lista de variações comuns de erro
+    VARIACOES = [
+        "VALIDACAO",    # Correto sem acento
+        "VALIDAÇÃO",    # Correto com acento (normalizado vira VALIDACAO)
+        "VALDACAO",     # Faltando I
+        "VALDAÇÃO",     # Faltando I com acento
+        "VADACAO",      # Faltando LI
+        "VADAÇÃO",      # Faltando LI com acento
+        "VALIDACÃO",    # Ã no lugar errado
+        "VALIDAÇAO",    # Ç sem til
+        "VALI DACAO",   # Com espaço
+        "VALIDA CAO",   # Com espaço
+    ]
+
+    # Busca mais genérica: palavras que começam com VAL e terminam com CAO
+    PADRAO_GENERICO = r'VAL[DI]*[DA]*C[AÃ]*O'
+
+    def __init__(self, variacoes: list = None, tamanho_cache: int = 4096):
+        variacoes_norm = dict.fromkeys(normalizar_texto(v) for v in (variacoes or self.VARIACOES))
+        alternativas = [re.escape(v) for v in variacoes_norm] + [self.PADRAO_GENERICO]
+        self.padrao_validacao = re.compile('|'.join(alternativas))
+
+        self.contem_validacao = lru_cache(maxsize=tamanho_cache)(self._contem_validacao)
+        self.contem_kit = lru_cache(maxsize=tamanho_cache)(self._contem_kit)
+
+    def _contem_validacao(self, texto: str) -> bool:
+        return self.padrao_validacao.search(normalizar_texto(texto)) is not None
+
+    def _contem_kit(self, texto: str) -> bool:
+        return "KIT" in normalizar_texto(texto)
+
+_CLASSIFICADOR = ClassificadorAssunto()
+
+def contem_validacao(texto: str) -> bool:
+    """
+    Verifica se o texto contém variações de "VALIDAÇÃO" mesmo com erros de digitação.
+    Aceita: VALIDAÇÃO, VALIDACAO, VALDAÇÃO, VADAÇÃO, VALIDAÇAO, etc.
+    """
+    return _CLASSIFICADOR.contem_validacao(texto)
+
+def contem_kit(texto: str) -> bool:
+    """
+    Verifica se o texto contém "KIT" com variações de separadores.
+    Aceita: KIT, _KIT, -KIT, KIT_, -KIT-, _KIT_, " KIT", "KIT ", etc.
+    """
+    return _CLASSIFICADOR.contem_kit(texto)
@@ -0,0 +1,131 @@
+# ======================== validacao.py ========================
+
+import numpy as np
+import pandas as pd
+import logging
+from typing import List, Dict
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "✓ OK"
+STATUS_DIVERGENCIA = "✗ DIVERGÊNCIA"
+
+ORIGEM_AMBOS = "E-mail e GA"
+ORIGEM_SOMENTE_EMAIL = "Somente e-mail"
+ORIGEM_SOMENTE_GA = "Somente GA"
+
+# Quantos nomes de clientes aparecem em cada linha do resumo do log
+LIMITE_NOMES_LOG = 20
+
+def agrupar_emails(emails_dados: List[Dict]) -> pd.DataFrame:
+    """
+    Agrupa os e-mails por cliente. Vários e-mails do mesmo cliente no dia
+    têm os totais somados (em vez de um sobrescrever o outro) e a
+    quantidade fica em Qtd_Emails.
+    """
+    emails = pd.DataFrame(emails_dados, columns=["Cliente", "Total_Soma", "Total_Informado"])
+
+    return emails.groupby("Cliente", sort=False).agg(
+        Total_Soma=("Total_Soma", "sum"),
+        Total_Informado=("Total_Informado", "sum"),
+        Qtd_Emails=("Cliente", "size"),
+    )
+
+def validar_totais(emails_dados: List[Dict], resultados_ga: Dict) -> pd.DataFrame:
+    """
+    Cruza os totais dos e-mails com os do GA em uma única operação vetorizada.
+
+    Regras (as mesmas da validação cliente a cliente):
+    - TOTAL informado igual ao GA: OK por TOTAL
+    - senão, SOMA dos contratos igual ao GA: OK por SOMA
+    - senão, DIVERGÊNCIA, exibindo a SOMA (ou o TOTAL, se não houver SOMA)
+
+    Clientes presentes em apenas um dos lados (sem retorno do GA ou sem
+    e-mail) são sempre DIVERGÊNCIA e identificados na coluna Origem.
+    """
+    emails = agrupar_emails(emails_dados)
+    ga = pd.Series(resultados_ga, dtype="float64", name="Total_GA")
+
+    # E-mails na ordem de chegada, depois os clientes que só existem no GA
+    df = emails.join(ga, how="left")
+    somente_ga = ga[~ga.index.isin(emails.index)]
+    if len(somente_ga):
+        df = pd.concat([df, somente_ga.to_frame()])
+    df.index.name = "Cliente"
+
+    tem_email = df["Qtd_Emails"].notna()
+    tem_ga = df["Total_GA"].notna()
+
+    df = df.fillna({"Total_Soma": 0, "Total_Informado": 0, "Qtd_Emails": 0, "Total_GA": 0})
+    df = df.astype({"Total_Soma": "int64", "Total_Informado": "int64", "Qtd_Emails": "int64", "Total_GA": "int64"})
+
+    soma = df["Total_Soma"].to_numpy()
+    informado = df["Total_Informado"].to_numpy()
+    total_ga = df["Total_GA"].to_numpy()
+    ambos = (tem_email & tem_ga).to_numpy()
+
+    # VALIDAÇÃO DUPLA: se INFORMADO ou SOMA bater com o GA = OK
+    informado_ok = ambos & (informado == total_ga)
+    soma_ok = ambos & ~informado_ok & (soma == total_ga)
+
+    df["Total_Exibicao"] = np.select(
+        [informado_ok, soma_ok, soma > 0, informado > 0],
+        [informado, soma, soma, informado],
+        0,
+    )
+    df["Metodo_Validacao"] = np.select([informado_ok, soma_ok], ["TOTAL", "SOMA (TOTAL divergente)"], "Nenhum")
+    df["Status"] = np.where(informado_ok | soma_ok, STATUS_OK, STATUS_DIVERGENCIA)
+    df["Origem"] = np.select([ambos, tem_email.to_numpy()], [ORIGEM_AMBOS, ORIGEM_SOMENTE_EMAIL], ORIGEM_SOMENTE_GA)
+
+    return df.reset_index()[[
+        "Cliente",
+        "Total_Soma",
+        "Total_Informado",
+        "Total_Exibicao",
+        "Total_GA",
+        "Metodo_Validacao",
+        "Status",
+        "Qtd_Emails",
+        "Origem",
+    ]]
+
+def _nomes(clientes, limite: int = LIMITE_NOMES_LOG) -> str:
+    clientes = list(clientes)
+    texto = ", ".join(map(str, clientes[:limite]))
+
+    if len(clientes) > limite:
+        texto += f" (+{len(clientes) - limite})"
+
+    return texto
+
+def resumir_validacao(df: pd.DataFrame):
+    """
+    Loga o resultado da validação em poucas linhas, independente da
+    quantidade de clientes.
+    """
+    ok = df["Status"] == STATUS_OK
+    por_soma = df["Metodo_Validacao"] == "SOMA (TOTAL divergente)"
+    divergentes = df[~ok]
+    duplicados = df[df["Qtd_Emails"] > 1]
+
+    logger.info(f"🔍 {len(df)} cliente(s) validado(s) | ✅ OK: {ok.sum()} (por SOMA: {por_soma.sum()}) | ⚠️ Divergências: {len(divergentes)}")
+
+    if len(duplicados):
+        logger.info(f"   📨 Clientes com mais de um e-mail (totais somados): {_nomes(duplicados['Cliente'])}")
+
+    if por_soma.any():
+        logger.info(f"   ✅ Validados por SOMA (TOTAL estava errado): {_nomes(df.loc[por_soma, 'Cliente'])}")
+
+    for origem in (ORIGEM_SOMENTE_EMAIL, ORIGEM_SOMENTE_GA):
+        clientes = df.loc[df["Origem"] == origem, "Cliente"]
+        if len(clientes):
+            logger.warning(f"   ❌ {origem}: {_nomes(clientes)}")
+
+    divergentes = divergentes[divergentes["Origem"] == ORIGEM_AMBOS]
+    if len(divergentes):
+        logger.warning(f"   ⚠️ Divergências: {_nomes(divergentes['Cliente'])}")
+
+        # Detalhe por cliente apenas em DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            for linha in divergentes.itertuples(index=False):
+                logger.debug(f"   {linha.Cliente}: SOMA: {linha.Total_Soma} | INFORMADO: {linha.Total_Informado} | GA: {linha.Total_GA}")